@@ -46,6 +46,7 @@ CONTAINER_PORT=${CONTAINER_PORT:=80}
 WSGI_WORKERS=${WSGI_WORKERS:=4}
 WSGI_WORKER_TIMEOUT=${WSGI_WORKER_TIMEOUT:=6000}
 WSGI_WORKER_CLASS=${WSGI_WORKER_CLASS:=gevent}
+WSGI_PRELOAD=${WSGI_PRELOAD:=false}
 
 # What to invoke: default is to run gunicorn server
 entry_cmd=${1:-run}
@@ -92,8 +93,13 @@ case ${entry_cmd} in
 		# SCRIPT_NAME should not have value '/'
 		[[ "${SCRIPT_NAME}" = '/' ]] && export SCRIPT_NAME="" && echo "make SCRIPT_NAME empty from /"
 
+		# load the app (and preloaded provider data) once in the master process,
+		# shared copy-on-write by the workers
+		WSGI_PRELOAD_ARG=""
+		[[ "${WSGI_PRELOAD}" = "true" ]] && WSGI_PRELOAD_ARG="--preload"
+
 		echo "Start gunicorn name=${CONTAINER_NAME} on ${CONTAINER_HOST}:${CONTAINER_PORT} with ${WSGI_WORKERS} workers and SCRIPT_NAME=${SCRIPT_NAME}"
-		gunicorn --workers ${WSGI_WORKERS} \
+		gunicorn --workers ${WSGI_WORKERS} ${WSGI_PRELOAD_ARG} \
 				--worker-class=${WSGI_WORKER_CLASS} \
 				--timeout ${WSGI_WORKER_TIMEOUT} \
 				--name=${CONTAINER_NAME} \
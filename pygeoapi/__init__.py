@@ -31,6 +31,7 @@ __version__ = '0.9.dev0'
 
 import click
 from pygeoapi.openapi import generate_openapi_document
+from pygeoapi.plugin import warmup_providers
 
 
 cli = click.Group()
@@ -57,3 +58,4 @@ def serve(ctx, server):
 
 
 cli.add_command(generate_openapi_document)
+cli.add_command(warmup_providers)
@@ -30,7 +30,11 @@
 Returns content from plugins and sets reponses
 """
 
+import asyncio
 from datetime import datetime
+import functools
+import gc
+import inspect
 import json
 import logging
 import os
@@ -44,7 +48,7 @@ from pygeoapi import __version__
 from pygeoapi.linked_data import (geojson2geojsonld, jsonldify,
                                   jsonldify_collection)
 from pygeoapi.log import setup_logger
-from pygeoapi.plugin import load_plugin, PLUGINS
+from pygeoapi.plugin import load_plugin, PLUGINS, ProviderRegistry
 from pygeoapi.provider.base import (
     ProviderGenericError, ProviderConnectionError, ProviderNotFoundError,
     ProviderInvalidQueryError, ProviderQueryError, ProviderItemNotFoundError,
@@ -53,7 +57,7 @@ from pygeoapi.cql_exception import CQLException
 from pygeoapi.util import (dategetter, filter_dict_by_key_value,
                            get_provider_by_type, get_provider_default,
                            get_typed_value, render_j2_template,
-                           TEMPLATES, to_json)
+                           RawJSONList, TEMPLATES, to_json, to_json_stream)
 
 LOGGER = logging.getLogger(__name__)
 
@@ -102,6 +106,62 @@ def pre_process(func):
     return inner
 
 
+def run_steps(steps):
+    """
+    Run the steps of a request, calling provider methods directly
+
+    :param steps: generator yielding `tuple` of provider method and
+                  `dict` of keyword arguments, receiving the method
+                  result (or exception), and returning the response
+
+    :returns: response of `steps`
+    """
+
+    try:
+        method, kwargs = next(steps)
+        while True:
+            try:
+                result = method(**kwargs)
+            except Exception as err:
+                method, kwargs = steps.throw(err)
+            else:
+                method, kwargs = steps.send(result)
+    except StopIteration as stop:
+        return stop.value
+
+
+async def run_steps_async(steps):
+    """
+    Run the steps of a request (see `run_steps`) without blocking the
+    event loop: awaiting the asynchronous version of provider methods
+    (``<method>_async``) when there is one, running the method in a
+    worker thread otherwise
+
+    :param steps: generator of provider method calls (see `run_steps`)
+
+    :returns: response of `steps`
+    """
+
+    loop = asyncio.get_event_loop()
+    try:
+        method, kwargs = next(steps)
+        while True:
+            method_async = getattr(method.__self__, '{}_async'.format(
+                method.__name__), None)
+            try:
+                if method_async is not None:
+                    result = await method_async(**kwargs)
+                else:
+                    result = await loop.run_in_executor(
+                        None, functools.partial(method, **kwargs))
+            except Exception as err:
+                method, kwargs = steps.throw(err)
+            else:
+                method, kwargs = steps.send(result)
+    except StopIteration as stop:
+        return stop.value
+
+
 class API:
     """API object"""
 
@@ -125,8 +185,43 @@ class API:
 
         self.pretty_print = self.config['server']['pretty_print']
 
+        self.providers = ProviderRegistry(self.config['resources'])
+
         setup_logger(self.config['logging'])
 
+    def warmup(self):
+        """
+        Initialize all the configured providers concurrently when
+        enabled (``server.warmup``), instead of on first request
+
+        ``server.warmup`` is either a boolean or a dict of options
+        (``max_workers``, ``fail_fast``, ``preload``).  With ``preload``,
+        provider data is loaded in memory and then excluded from garbage
+        collection, so that it stays shared between worker processes
+        forked afterwards (e.g. ``gunicorn --preload``)
+
+        :returns: `dict` of (dataset, provider type) and load time
+                  (seconds) of the loaded providers
+        """
+
+        warmup = self.config['server'].get('warmup', False)
+        if not warmup:
+            return {}
+
+        options = warmup if isinstance(warmup, dict) else {}
+        timings = self.providers.warmup(
+            max_workers=options.get('max_workers'),
+            fail_fast=options.get('fail_fast', False),
+            preload=options.get('preload', False))
+
+        if options.get('preload', False):
+            # avoid collector passes touching (and copying) shared pages
+            gc.collect()
+            if hasattr(gc, 'freeze'):  # Python 3.7+
+                gc.freeze()
+
+        return timings
+
     @pre_process
     @jsonldify
     def landing_page(self, headers_, format_):
@@ -503,9 +598,7 @@ class API:
                     })
                 if dataset is not None:
                     LOGGER.debug('Creating extended coverage metadata')
-                    p = load_plugin('provider', get_provider_by_type(
-                        self.config['resources'][dataset]['providers'],
-                        'coverage'))
+                    p = self.providers.get(dataset, 'coverage')
 
                     collection['crs'] = [p.crs]
                     collection['domainset'] = p.get_coverage_domainset()
@@ -605,8 +698,7 @@ class API:
         LOGGER.debug('Creating collection queryables')
         LOGGER.debug('Loading provider')
         try:
-            p = load_plugin('provider', get_provider_by_type(
-                self.config['resources'][dataset]['providers'], 'feature'))
+            p = self.providers.get(dataset, 'feature')
         except ProviderConnectionError:
             exception = {
                 'code': 'NoApplicableCode',
@@ -662,12 +754,47 @@ class API:
         :returns: tuple of headers, status code, content
         """
 
+        return run_steps(self._get_collection_items_steps(
+            headers, args, dataset, pathinfo))
+
+    async def get_collection_items_async(self, headers, args, dataset,
+                                         pathinfo=None):
+        """
+        Queries collection without blocking the event loop (see
+        `get_collection_items`)
+
+        :param headers: dict of HTTP headers
+        :param args: dict of HTTP request parameters
+        :param dataset: dataset name
+        :param pathinfo: path location
+
+        :returns: tuple of headers, status code, content
+        """
+
+        return await run_steps_async(self._get_collection_items_steps(
+            headers, args, dataset, pathinfo))
+
+    def _get_collection_items_steps(self, headers, args, dataset,
+                                    pathinfo=None):
+        """
+        Steps of a collection query (see `run_steps`)
+
+        :param headers: dict of HTTP headers
+        :param args: dict of HTTP request parameters
+        :param dataset: dataset name
+        :param pathinfo: path location
+
+        :returns: generator of provider method calls, returning tuple
+                  of headers, status code, content
+        """
+
         headers_ = HEADERS.copy()
 
         properties = []
         reserved_fieldnames = ['bbox', 'f', 'limit', 'startindex',
                                'resulttype', 'datetime', 'sortby',
-                               'filter', 'filter-lang']
+                               'filter', 'filter-lang', 'cursor',
+                               'properties', 'simplify', 'precision']
         formats = FORMATS
         formats.extend(f.lower() for f in PLUGINS['formatter'].keys())
 
@@ -850,8 +977,7 @@ class API:
 
         LOGGER.debug('Loading provider')
         try:
-            p = load_plugin('provider', get_provider_by_type(
-                collections[dataset]['providers'], 'feature'))
+            p = self.providers.get(dataset, 'feature')
         except ProviderTypeError:
             exception = {
                 'code': 'NoApplicableCode',
@@ -918,19 +1044,91 @@ class API:
         else:
             sortby = []
 
+        LOGGER.debug('Processing properties parameter')
+        val = args.get('properties')
+
+        select_properties = []
+        if val is not None:
+            select_properties = [s for s in val.split(',') if s]
+            published = p.properties or p.fields.keys()
+            if not select_properties or any(
+                    s not in published for s in select_properties):
+                exception = {
+                    'code': 'InvalidParameterValue',
+                    'description': 'unknown properties specified'
+                }
+                LOGGER.error(exception)
+                return headers_, 400, to_json(exception, self.pretty_print)
+
+        query_args = {}
+
+        # providers supporting it only read the selected properties,
+        # the properties of the others are selected once returned
+        query_parameters = inspect.signature(p.query).parameters
+        select_in_provider = 'select_properties' in query_parameters
+        if select_properties and select_in_provider:
+            query_args['select_properties'] = select_properties
+
+        LOGGER.debug('Processing simplify and precision parameters')
+        for name, type_ in [('simplify', float), ('precision', int)]:
+            val = args.get(name)
+            if val is None:
+                continue
+            if name not in query_parameters:
+                exception = {
+                    'code': 'InvalidParameterValue',
+                    'description': '{} not supported for this '
+                                   'collection'.format(name)
+                }
+                LOGGER.error(exception)
+                return headers_, 400, to_json(exception, self.pretty_print)
+            try:
+                val = type_(val)
+                if not 0 <= val < float('inf'):
+                    raise ValueError(val)
+            except ValueError as err:
+                LOGGER.warning(err)
+                exception = {
+                    'code': 'InvalidParameterValue',
+                    'description': '{} value should be a positive or zero '
+                                   '{}'.format(name, 'integer' if type_ is int
+                                               else 'number')
+                }
+                LOGGER.error(exception)
+                return headers_, 400, to_json(exception, self.pretty_print)
+            query_args[name] = val
+
+        LOGGER.debug('Processing cursor parameter')
+        cursor = args.get('cursor')
+        if cursor is not None:
+            if getattr(p, 'pagination', None) != 'keyset':
+                exception = {
+                    'code': 'InvalidParameterValue',
+                    'description': 'cursor not supported for this collection'
+                }
+                LOGGER.error(exception)
+                return headers_, 400, to_json(exception, self.pretty_print)
+            query_args['cursor'] = cursor
+
         LOGGER.debug('Querying provider')
         LOGGER.debug('startindex: {}'.format(startindex))
         LOGGER.debug('limit: {}'.format(limit))
         LOGGER.debug('resulttype: {}'.format(resulttype))
         LOGGER.debug('sortby: {}'.format(sortby))
         LOGGER.debug('filter: {}'.format(cql_expression))
+        LOGGER.debug('cursor: {}'.format(cursor))
+        LOGGER.debug('properties: {}'.format(select_properties))
+        LOGGER.debug('simplify: {}'.format(query_args.get('simplify')))
+        LOGGER.debug('precision: {}'.format(query_args.get('precision')))
 
         try:
-            content = p.query(startindex=startindex, limit=limit,
-                              resulttype=resulttype, bbox=bbox,
-                              datetime=datetime_, properties=properties,
-                              sortby=sortby,
-                              cql_expression=cql_expression)
+            content = yield p.query, dict(startindex=startindex, limit=limit,
+                                          resulttype=resulttype, bbox=bbox,
+                                          datetime=datetime_,
+                                          properties=properties,
+                                          sortby=sortby,
+                                          cql_expression=cql_expression,
+                                          **query_args)
 
         except ProviderConnectionError as err:
             exception = {
@@ -939,6 +1137,13 @@ class API:
             }
             LOGGER.error(err)
             return headers_, 500, to_json(exception, self.pretty_print)
+        except ProviderInvalidQueryError as err:
+            exception = {
+                'code': 'InvalidParameterValue',
+                'description': 'query error: {}'.format(err)
+            }
+            LOGGER.error(err)
+            return headers_, 400, to_json(exception, self.pretty_print)
         except ProviderQueryError as err:
             exception = {
                 'code': 'NoApplicableCode',
@@ -959,11 +1164,25 @@ class API:
                 'description': 'Invalid CQL filter expression'
             }
             LOGGER.error(err)
-            return headers_, 400, json.dumps(exception, self.pretty_print)
+            return headers_, 400, to_json(exception, self.pretty_print)
+
+        next_cursor = content.pop('next_cursor', None)
+
+        if select_properties and not select_in_provider:
+            for feature in content['features']:
+                feature['properties'] = {
+                    k: v for k, v in feature['properties'].items()
+                    if k in select_properties}
+
+        if isinstance(content['features'], RawJSONList) and \
+                format_ not in [None, 'json']:
+            # features serialized by the provider are only passed
+            # through as is in GeoJSON
+            content['features'] = content['features'].decode()
 
         serialized_query_params = ''
         for k, v in args.items():
-            if k not in ('f', 'startindex'):
+            if k not in ('f', 'startindex', 'cursor'):
                 serialized_query_params += '&'
                 serialized_query_params += urllib.parse.quote(k, safe='')
                 serialized_query_params += '='
@@ -1002,7 +1221,19 @@ class API:
                             serialized_query_params)
                 })
 
-        if len(content['features']) == limit:
+        if next_cursor is not None:
+            content['links'].append(
+                {
+                    'type': 'application/geo+json',
+                    'rel': 'next',
+                    'title': 'items (next)',
+                    'href': '{}/collections/{}/items?cursor={}{}'
+                    .format(
+                        self.config['server']['url'], dataset,
+                        urllib.parse.quote(next_cursor, safe=''),
+                        serialized_query_params)
+                })
+        elif len(content['features']) == limit:
             next_ = startindex + limit
             content['links'].append(
                 {
@@ -1072,20 +1303,57 @@ class API:
             content = geojson2geojsonld(self.config, content, dataset)
             return headers_, 200, content
 
+        if isinstance(content['features'], RawJSONList):
+            return headers_, 200, to_json_stream(content, self.pretty_print)
+
         return headers_, 200, to_json(content, self.pretty_print)
 
-    @pre_process
-    def get_collection_item(self, headers_, format_, dataset, identifier):
+    def get_collection_item(self, headers, args, dataset, identifier):
         """
         Get a single collection item
 
+        :param headers: dict of HTTP headers
+        :param args: dict of HTTP request parameters
+        :param dataset: dataset name
+        :param identifier: item identifier
+
+        :returns: tuple of headers, status code, content
+        """
+
+        return run_steps(self._get_collection_item_steps(
+            headers, args, dataset, identifier))
+
+    async def get_collection_item_async(self, headers, args, dataset,
+                                        identifier):
+        """
+        Get a single collection item without blocking the event loop
+        (see `get_collection_item`)
+
+        :param headers: dict of HTTP headers
+        :param args: dict of HTTP request parameters
+        :param dataset: dataset name
+        :param identifier: item identifier
+
+        :returns: tuple of headers, status code, content
+        """
+
+        return await run_steps_async(self._get_collection_item_steps(
+            headers, args, dataset, identifier))
+
+    @pre_process
+    def _get_collection_item_steps(self, headers_, format_, dataset,
+                                   identifier):
+        """
+        Steps of getting a single collection item (see `run_steps`)
+
         :param headers_: copy of HEADERS object
         :param format_: format of requests,
                         pre checked by pre_process decorator
         :param dataset: dataset name
         :param identifier: item identifier
 
-        :returns: tuple of headers, status code, content
+        :returns: generator of provider method calls, returning tuple
+                  of headers, status code, content
         """
 
         if format_ is not None and format_ not in FORMATS:
@@ -1111,8 +1379,7 @@ class API:
 
         LOGGER.debug('Loading provider')
         try:
-            p = load_plugin('provider', get_provider_by_type(
-                collections[dataset]['providers'], 'feature'))
+            p = self.providers.get(dataset, 'feature')
         except ProviderTypeError:
             exception = {
                 'code': 'NoApplicableCode',
@@ -1122,7 +1389,7 @@ class API:
             return headers_, 400, to_json(exception, self.pretty_print)
         try:
             LOGGER.debug('Fetching id {}'.format(identifier))
-            content = p.get(identifier)
+            content = yield p.get, {'identifier': identifier}
         except ProviderConnectionError as err:
             exception = {
                 'code': 'NoApplicableCode',
@@ -1188,12 +1455,14 @@ class API:
             'rel': 'prev',
             'type': 'application/geo+json',
             'href': '{}/collections/{}/items/{}'.format(
-                self.config['server']['url'], dataset, identifier)
+                self.config['server']['url'], dataset,
+                content.get('prev', identifier))
             }, {
             'rel': 'next',
             'type': 'application/geo+json',
             'href': '{}/collections/{}/items/{}'.format(
-                self.config['server']['url'], dataset, identifier)
+                self.config['server']['url'], dataset,
+                content.get('next', identifier))
             }
         ]
 
@@ -1239,7 +1508,7 @@ class API:
             collection_def = get_provider_by_type(
                 self.config['resources'][dataset]['providers'], 'coverage')
 
-            p = load_plugin('provider', collection_def)
+            p = self.providers.get(dataset, 'coverage')
         except ProviderTypeError:
             exception = {
                 'code': 'NoApplicableCode',
@@ -1358,10 +1627,7 @@ class API:
 
         LOGGER.debug('Loading provider')
         try:
-            collection_def = get_provider_by_type(
-                self.config['resources'][dataset]['providers'], 'coverage')
-
-            p = load_plugin('provider', collection_def)
+            p = self.providers.get(dataset, 'coverage')
 
             data = p.get_coverage_domainset()
         except ProviderTypeError:
@@ -1418,10 +1684,7 @@ class API:
 
         LOGGER.debug('Loading provider')
         try:
-            collection_def = get_provider_by_type(
-                self.config['resources'][dataset]['providers'], 'coverage')
-
-            p = load_plugin('provider', collection_def)
+            p = self.providers.get(dataset, 'coverage')
 
             data = p.get_coverage_rangetype()
         except ProviderTypeError:
@@ -1672,8 +1935,7 @@ class API:
 
         LOGGER.debug('Loading provider')
         try:
-            p = load_plugin('provider', get_provider_by_type(
-                stac_collections[dataset]['providers'], 'stac'))
+            p = self.providers.get(dataset, 'stac')
         except ProviderConnectionError as err:
             LOGGER.error(err)
             exception = {
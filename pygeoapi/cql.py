@@ -35,6 +35,7 @@ class CQLHandler:
         self.cql_expression = cql_def.get('cql_expression', None)
         self.feature_list = cql_def.get('feature_list', None)
         self.field_list = cql_def.get('field_list', None)
+        self.spatial_index = cql_def.get('spatial_index', None)
 
     def cql_filter(self):
         """
@@ -46,6 +47,16 @@ class CQLHandler:
         feature_list = self.CQLFilter.get_cql_filtered_list(self)
         return feature_list
 
+    def cql_mask(self):
+        """
+        Perform CQL Filter on a columnar table (`feature_list`)
+
+        :returns: boolean mask of the matching rows
+        """
+
+        mask = self.CQLFilter.get_cql_mask(self)
+        return mask
+
     def sqlite_where_clause(self):
         """
         Perform CQL Filter on the feature list
@@ -101,21 +112,30 @@ class CQLHandler:
     class CQLEvaluator:
         """ CQL Filter Evaluator """
 
-        def __init__(self, field_list, feature_list, provider):
+        def __init__(self, field_list, feature_list, provider,
+                     spatial_index=None):
             """
             Initialize object
 
             :param field_list: attribute list
             :param feature_list: feature list to filter
+            :param spatial_index: R-tree index of the geometries (SQLite)
             """
 
             self.field_list = field_list
             self.feature_list = feature_list
             self.provider = provider
+            self.spatial_options = {}
+            if spatial_index:
+                self.spatial_options['spatial_index'] = spatial_index
             if self.provider == "SQLite":
                 self.method = sqlite_where_clauses
             elif self.provider == "PostGreSQL":
                 self.method = postgres_where_clauses
+            elif self.provider == "Columnar":
+                # requires numpy, only imported when needed
+                import pygeoapi.cql_masks as cql_masks
+                self.method = cql_masks
             else:
                 self.method = cql_filters
 
@@ -208,7 +228,8 @@ class CQLHandler:
                     node.op,
                     to_filter(node.pattern),
                     to_filter(node.distance),
-                    to_filter(node.units)
+                    to_filter(node.units),
+                    **self.spatial_options
                 )
 
             # evaluation for BBox Predicate Node
@@ -222,6 +243,7 @@ class CQLHandler:
                     to_filter(node.maxx),
                     to_filter(node.maxy),
                     to_filter(node.crs),
+                    **self.spatial_options
                 )
 
             # evaluation for Attribute Expression Node
@@ -287,7 +309,8 @@ class CQLHandler:
                 field_list = self.CQLFilter.get_field_list(self)
                 cql_evaluator = self.CQLEvaluator(field_list,
                                                   self.feature_list,
-                                                  provider)
+                                                  provider,
+                                                  self.spatial_index)
                 result = cql_evaluator.to_filter(cql_ast)
                 return result
 
@@ -305,6 +328,16 @@ class CQLHandler:
                 get_cql_evaluation(self, ['CSV', 'GeoJSON'])
             return filtered_feature_list
 
+        def get_cql_mask(self):
+            """
+            Helper function to perform CQL Filter on a columnar table
+
+            :returns: boolean mask of the matching rows
+            """
+
+            mask = self.CQLFilter.get_cql_evaluation(self, 'Columnar')
+            return mask
+
         def get_sqlite_where_clause(self):
             """
             Helper function to get where clause for provider
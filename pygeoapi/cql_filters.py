@@ -523,6 +523,16 @@ def spatial(feature_list, field_list, lhs, rhs, op,
         rhs = shapely.wkt.loads(rhs.value)
         filtered_feature_list = []
 
+        # only test the features whose envelope can match
+        candidates = feature_list
+        if op not in ['RELATE', 'DISJOINT', 'BEYOND']:
+            bounds = rhs.bounds
+            if op == 'DWITHIN' and bounds and distance is not None:
+                d = distance / 1000 if units == 'meters' else distance
+                bounds = (bounds[0] - d, bounds[1] - d,
+                          bounds[2] + d, bounds[3] + d)
+            candidates = get_candidates(feature_list, bounds)
+
         # perform spatial comparison
         filtered_feature_list = list(
             filter(
@@ -530,9 +540,10 @@ def spatial(feature_list, field_list, lhs, rhs, op,
                 spatial_filter(record[lhs],
                                op, rhs, pattern,
                                distance, units),
-                feature_list
+                candidates
             )
         )
+
         return filtered_feature_list
 
     except KeyError:
@@ -588,7 +599,7 @@ def bbox(feature_list, field_list, lhs, minx, miny, maxx, maxy,
                 lambda record, lhs=lhs:
                 spatial_filter(record[lhs],
                                'INTERSECTS', bbox),
-                feature_list
+                get_candidates(feature_list, bbox.bounds)
             )
         )
         return filtered_feature_list
@@ -602,6 +613,27 @@ def bbox(feature_list, field_list, lhs, minx, miny, maxx, maxy,
         raise CQLExceptionBBox()
 
 
+def get_candidates(feature_list, bounds):
+    """
+    Helper function to get the features whose envelope may intersect
+    a bbox, using the spatial index of the feature list if any
+
+    :param feature_list: a list of feature dict
+    :type feature_list: list
+    :param bounds: minx, miny, maxx, maxy
+    :type bounds: tuple
+
+    :return: candidate features
+    :rtype: list
+    """
+
+    spatial_index = getattr(feature_list, 'spatial_index', None)
+    if spatial_index is None or not bounds:
+        return feature_list
+
+    return [feature_list[i] for i in spatial_index.search(bounds)]
+
+
 def spatial_filter(record, op, rhs, pattern=None, distance=None, units=None):
     """
     Helper function to perform spatial filters on feature set
@@ -0,0 +1,462 @@
+"""
+For evaluating CQL filter queries from Abstract Syntax Tree
+as vectorized boolean masks over a columnar table
+"""
+
+import logging
+import re
+
+import numpy as np
+import shapely
+import shapely.wkt
+
+from pygeoapi.cql_exception import (CQLExceptionCombination,
+                                    CQLExceptionComparison,
+                                    CQLExceptionBetween, CQLExceptionNull,
+                                    CQLExceptionIn, CQLExceptionLike,
+                                    CQLExceptionSpatial,
+                                    CQLExceptionUnits,
+                                    CQLExceptionPattern, CQLExceptionTemporal,
+                                    CQLExceptionBBox, CQLExceptionNegation,
+                                    CQLExceptionSpatialOperator
+                                    )
+from pygeoapi.cql_filters import generate_regex, temporal_filter
+# field names are looked up the same way as for feature lists
+from pygeoapi.cql_filters import attribute  # noqa
+
+LOGGER = logging.getLogger(__name__)
+
+
+def combine(sub_filters, combination):
+    """
+    Combine filters using a logical combinator
+
+    :param sub_filters: the filters to combine
+    :type sub_filters: tuple of multiple sub-filter masks
+    :param combination: "AND" / "OR"
+    :type combination: str
+
+    :return: a combined expression result
+    :rtype: numpy.ndarray
+    """
+
+    try:
+        if combination == "AND":
+            return np.logical_and(sub_filters[0], sub_filters[1])
+        return np.logical_or(sub_filters[0], sub_filters[1])
+
+    except Exception as err:
+        LOGGER.error("Invalid combination operation: {}".format(err))
+        raise CQLExceptionCombination()
+
+
+def negate(table, mask):
+    """
+    Negate a filter, opposing its meaning.
+
+    :param table: the columnar table to filter
+    :type table: pygeoapi.provider.columnar.ColumnarTable
+    :param mask: the filter to negate
+    :type mask: numpy.ndarray
+
+    :return: the negated mask
+    :rtype: numpy.ndarray
+    """
+
+    try:
+        return np.logical_not(mask)
+
+    except Exception as err:
+        LOGGER.error("Invalid negation operation: {}".format(err))
+        raise CQLExceptionNegation()
+
+
+# Comparison operation dictionary
+Comparisons = {
+    "<": np.less,
+    "<=": np.less_equal,
+    ">": np.greater,
+    ">=": np.greater_equal,
+    "<>": np.not_equal,
+    "=": np.equal,
+}
+
+
+def compare(table, lhs, rhs, op):
+    """
+    Compare a filter with an expression using a comparison operation
+
+    :param table: the columnar table to filter
+    :type table: pygeoapi.provider.columnar.ColumnarTable
+    :param lhs: the field to compare
+    :type lhs: str
+    :param rhs: the filter expression
+    :type rhs: literal
+    :param op: a string denoting the operation. one of ``"<"``, ``"<="``,
+                ``">"``, ``">="``, ``"<>"``, ``"="``
+    :type op: str
+
+    :return: a comparison expression result
+    :rtype: numpy.ndarray
+    """
+
+    try:
+        if isinstance(rhs, str):
+            if op == "=":
+                return like(table, lhs, rhs, case=True)
+            raise CQLExceptionComparison("Invalid parameter {}".format(rhs))
+
+        return Comparisons[op](table.numeric(lhs), float(rhs))
+
+    except Exception as err:
+        LOGGER.error("Invalid comparison operation: {}".format(err))
+        raise CQLExceptionComparison()
+
+
+def between(table, lhs, low, high, not_=False):
+    """
+    Create a filter to match elements that have a value within a certain
+    range.
+
+    :param table: the columnar table to filter
+    :type table: pygeoapi.provider.columnar.ColumnarTable
+    :param lhs: the field to compare
+    :type lhs: str
+    :param low: the lower value of the range
+    :type low: literal
+    :param high: the upper value of the range
+    :type high: literal
+    :param not_: whether the range shall be inclusive (the default) or
+                    exclusive
+    :type not_: bool
+
+    :return: a comparison expression result
+    :rtype: numpy.ndarray
+    """
+
+    try:
+        values = table.numeric(lhs)
+        mask = (values >= low) & (values <= high)
+
+        if not_:
+            mask = negate(table, mask)
+
+        return mask
+
+    except Exception as err:
+        LOGGER.error("Invalid 'between' operation: {}".format(err))
+        raise CQLExceptionBetween()
+
+
+def like(table, lhs, rhs, case=False, not_=False):
+    """
+    Create a filter to filter elements according to a string attribute
+    using wildcard expressions.
+
+    :param table: the columnar table to filter
+    :type table: pygeoapi.provider.columnar.ColumnarTable
+    :param lhs: the field to compare
+    :type lhs: str
+    :param rhs: the wildcard pattern: a string containing any number of '%'
+                characters as wildcards.
+    :type rhs: str
+    :param case: whether the lookup shall be done case sensitively or not
+    :type case: bool
+    :param not_: whether the range shall be inclusive (the default) or
+                    exclusive
+    :type not_: bool
+
+    :return: a comparison expression result
+    :rtype: numpy.ndarray
+    """
+
+    try:
+        matcher = re.compile(generate_regex(rhs, case))
+
+        if case:
+            mask = table.map(lhs, matcher.search)
+        else:
+            mask = table.map(lhs, lambda value: matcher.search(value.lower()))
+
+        if not_:
+            mask = negate(table, mask)
+
+        return mask
+
+    except Exception as err:
+        LOGGER.error("Invalid 'like' operation: {}".format(err))
+        raise CQLExceptionLike()
+
+
+def contains(table, lhs, items, not_=False):
+    """
+    Create a filter to match elements attribute to be in a list of choices.
+
+    :param table: the columnar table to filter
+    :type table: pygeoapi.provider.columnar.ColumnarTable
+    :param lhs: the field to compare
+    :type lhs: str
+    :param items: a list of choices
+    :type items: list
+    :param not_: whether the range shall be inclusive (the default) or
+                    exclusive
+    :type not_: bool
+
+    :return: a comparison expression result
+    :rtype: numpy.ndarray
+    """
+
+    try:
+        mask = table.map(lhs, lambda value: value in items)
+
+        if not_:
+            mask = negate(table, mask)
+
+        return mask
+
+    except Exception as err:
+        LOGGER.error("Invalid 'in' operation: {}".format(err))
+        raise CQLExceptionIn()
+
+
+def is_null(table, lhs, not_=False):
+    """
+    Create a filter to match elements whose attribute is (not) null
+
+    :param table: the columnar table to filter
+    :type table: pygeoapi.provider.columnar.ColumnarTable
+    :param lhs: the field to compare
+    :type lhs: string
+    :param not_: whether the range shall be inclusive (the default) or
+                    exclusive
+    :type not_: bool
+
+    :return: a comparison expression result
+    :rtype: numpy.ndarray
+    """
+
+    try:
+        mask = table.map(lhs, lambda value: value is None or value == 'null')
+
+        if not_:
+            mask = negate(table, mask)
+
+        return mask
+
+    except Exception as err:
+        LOGGER.error("Invalid 'null' operation: {}".format(err))
+        raise CQLExceptionNull()
+
+
+def temporal(table, field_list, lhs, time_or_period, op):
+    """
+    Create a temporal filter for the given temporal attribute.
+
+    :param table: the columnar table to filter
+    :type table: pygeoapi.provider.columnar.ColumnarTable
+    :param field_list: the dictionary to use as a lookup for field names
+    :type field_list: dict
+    :param lhs: the field to compare
+    :type lhs: str
+    :param time_or_period: the time instant or time span to use as a filter
+    :type time_or_period: :class:`datetime.datetime` or a tuple of two
+                            datetimes or a tuple of one datetime and one
+                            :class:`datetime.timedelta`
+    :param op: the comparison operation. one of ``"BEFORE"``,
+                ``"BEFORE OR DURING"``, ``"DURING"``, ``"DURING OR AFTER"``,
+                ``"AFTER"``.
+    :type op: str
+
+    :return: a comparison expression result
+    :rtype: numpy.ndarray
+    """
+
+    try:
+        if lhs not in field_list.keys():
+            raise CQLExceptionSpatial("Invalid field name: {}".format(lhs))
+
+        return table.map(
+            field_list[lhs],
+            lambda value: temporal_filter(value, time_or_period, op))
+
+    except KeyError:
+        LOGGER.error("Invalid field name: {}".format(lhs))
+        raise CQLExceptionTemporal()
+
+    except Exception as err:
+        LOGGER.error("Invalid 'temporal' operation: {}".format(err))
+        raise CQLExceptionTemporal()
+
+
+def spatial(table, field_list, lhs, rhs, op,
+            pattern=None, distance=None, units=None):
+    """
+    Create a spatial filter for the given spatial attribute.
+
+    :param table: the columnar table to filter
+    :type table: pygeoapi.provider.columnar.ColumnarTable
+    :param field_list: the dictionary to use as a lookup for field names
+    :type field_list: dict
+    :param lhs: the field to compare
+    :type lhs: str
+    :param rhs: spatial expression
+    :type rhs: geometry
+    :param op: the comparison operation. one of ``"INTERSECTS"``,
+                ``"DISJOINT"``, `"CONTAINS"``, ``"WITHIN"``,
+                ``"TOUCHES"``, ``"CROSSES"``, ``"OVERLAPS"``,
+                ``"EQUALS"``, ``"RELATE"``, ``"DWITHIN"``, ``"BEYOND"``
+    :type op: str
+    :param pattern: the spatial relation pattern
+    :type pattern: str
+    :param distance: the distance value for distance based lookups:
+                        ``"DWITHIN"`` and ``"BEYOND"``
+    :type distance: float
+    :param units: the units the distance is expressed in
+    :type units: str
+
+    :return: a comparison expression result
+    :rtype: numpy.ndarray
+    """
+
+    try:
+        if lhs not in field_list.keys() or field_list[lhs] != 'geometry':
+            raise CQLExceptionSpatial("Invalid field name: {}".format(lhs))
+
+        rhs = shapely.wkt.loads(rhs.value)
+
+        if op in ['RELATE', 'DISJOINT', 'BEYOND']:
+            return spatial_filter(table.points(), op, rhs, pattern,
+                                  distance, units)
+
+        # only test the rows within the envelope of the geometry
+        bounds = rhs.bounds
+        if op == 'DWITHIN' and distance is not None:
+            d = distance / 1000 if units == 'meters' else distance
+            bounds = (bounds[0] - d, bounds[1] - d,
+                      bounds[2] + d, bounds[3] + d)
+        candidates = np.flatnonzero(table.search(bounds))
+
+        mask = np.zeros(len(table), dtype=bool)
+        mask[candidates] = spatial_filter(table.points()[candidates], op,
+                                          rhs, pattern, distance, units)
+        return mask
+
+    except KeyError:
+        LOGGER.error("Invalid field name: {}".format(lhs))
+        raise CQLExceptionSpatial()
+
+    except Exception as err:
+        LOGGER.error("Invalid 'spatial' operation: {}".format(err))
+        raise CQLExceptionSpatial()
+
+
+def bbox(table, field_list, lhs, minx, miny, maxx, maxy,
+         crs=None, bboverlaps=True):
+    """
+    Create a bounding box filter for the given spatial attribute.
+
+    :param table: the columnar table to filter
+    :type table: pygeoapi.provider.columnar.ColumnarTable
+    :param field_list: the dictionary to use as a lookup for field names
+    :type field_list: dict
+    :param lhs: the field to compare
+    :type lhs: str
+    :param minx: the lower x part of the bbox
+    :type minx: float
+    :param miny: the lower y part of the bbox
+    :type miny: float
+    :param maxx: the upper x part of the bbox
+    :type maxx: float
+    :param maxy: the upper y part of the bbox
+    :type maxy: float
+    :param crs: the CRS the bbox is expressed in
+    :type crs: str
+    :param bboverlaps: to specify overlapping
+    :type bboverlaps: bool
+
+    :return: a comparison expression result
+    :rtype: numpy.ndarray
+    """
+
+    try:
+        if lhs not in field_list.keys() or field_list[lhs] != 'geometry':
+            raise CQLExceptionSpatial("Invalid field name: {}".format(lhs))
+
+        return table.search((minx, miny, maxx, maxy))
+
+    except KeyError:
+        LOGGER.error("Invalid field name: {}".format(lhs))
+        raise CQLExceptionBBox()
+
+    except Exception as err:
+        LOGGER.error("Invalid 'spatial' operation: {}".format(err))
+        raise CQLExceptionBBox()
+
+
+def spatial_filter(points, op, rhs, pattern=None, distance=None, units=None):
+    """
+    Helper function to perform spatial filters on all the points at once
+
+    :param points: point geometries
+    :type points: numpy.ndarray
+    :param rhs: spatial expression
+    :type rhs: geometry
+    :param op: the comparison operation
+    :type op: str
+    :param pattern: the spatial relation pattern
+    :type pattern: str
+    :param distance: the distance value
+    :type distance: float
+    :param units: the units the distance is expressed in
+    :type units: str
+
+    :return: a comparison expression result
+    :rtype: numpy.ndarray
+    """
+
+    if op == 'RELATE':
+        if pattern is None:
+            raise CQLExceptionPattern("Invalid relate pattern")
+        return _predicate(points, 'relate_pattern', rhs, pattern)
+
+    elif op in ['DWITHIN', 'BEYOND']:
+        if units is None or units not in ['meters', 'kilometers']:
+            raise CQLExceptionUnits("Invalid distance units: {}".format(units))
+        if units == 'meters':
+            distance = distance / 1000
+
+        distances = _predicate(points, 'distance', rhs, dtype=np.float64)
+        if op == 'DWITHIN':
+            return distances <= distance
+        else:
+            return distances > distance
+
+    elif op in ['INTERSECTS', 'DISJOINT', 'CONTAINS', 'WITHIN',
+                'TOUCHES', 'CROSSES', 'OVERLAPS', 'EQUALS']:
+        return _predicate(points, op.lower(), rhs)
+
+    else:
+        raise CQLExceptionSpatialOperator(
+            "Invalid spatial operator: {}".format(op))
+
+
+def _predicate(points, name, *args, dtype=bool):
+    """
+    Helper function to evaluate a shapely predicate on all the points,
+    vectorized when supported by shapely (2.0+)
+
+    :param points: point geometries
+    :type points: numpy.ndarray
+    :param name: shapely predicate (or measurement) name
+    :type name: str
+    :param args: other arguments of the predicate
+
+    :return: predicate results
+    :rtype: numpy.ndarray
+    """
+
+    if hasattr(shapely, name):
+        return np.asarray(getattr(shapely, name)(points, *args), dtype=dtype)
+
+    return np.fromiter((getattr(point, name)(*args) for point in points),
+                       dtype=dtype, count=len(points))
@@ -59,6 +59,7 @@ APP.config['JSONIFY_PRETTYPRINT_REGULAR'] = CONFIG['server'].get(
     'pretty_print', True)
 
 api_ = API(CONFIG)
+api_.warmup()
 
 OGC_SCHEMAS_LOCATION = CONFIG['server'].get('ogc_schemas_location', None)
 
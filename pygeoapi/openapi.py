@@ -28,13 +28,14 @@
 # =================================================================
 
 from copy import deepcopy
+import inspect
 import logging
 import os
 
 import click
 import yaml
 
-from pygeoapi.plugin import load_plugin
+from pygeoapi.plugin import load_plugin, ProviderRegistry
 from pygeoapi.util import (filter_dict_by_key_value,
                            get_provider_by_type,
                            get_extension_by_type,
@@ -122,6 +123,10 @@ def get_oas_30(cfg):
 
     paths = {}
 
+    # providers are initialized concurrently up front
+    registry = ProviderRegistry(cfg['resources'])
+    registry.warmup()
+
     osl = get_ogc_schemas_location(cfg['server'])
     OPENAPI_YAML['oapif'] = os.path.join(osl, 'ogcapi/features/part1/1.0/openapi/ogcapi-features-1.yaml')  # noqa
 
@@ -279,6 +284,20 @@ def get_oas_30(cfg):
                 'style': 'form',
                 'explode': False
             },
+            'properties': {
+                'name': 'properties',
+                'in': 'query',
+                'description': 'The optional properties parameter lists the properties (comma-separated) to be returned in the features of the response document.',  # noqa
+                'required': False,
+                'schema': {
+                    'type': 'array',
+                    'items': {
+                        'type': 'string'
+                    }
+                },
+                'style': 'form',
+                'explode': False
+            },
             'startindex': {
                 'name': 'startindex',
                 'in': 'query',
@@ -291,6 +310,41 @@ def get_oas_30(cfg):
                 },
                 'style': 'form',
                 'explode': False
+            },
+            'simplify': {
+                'name': 'simplify',
+                'in': 'query',
+                'description': 'The optional simplify parameter indicates the tolerance (in the units of the coordinates) with which the server shall simplify the geometries of the features in the response document.',  # noqa
+                'required': False,
+                'schema': {
+                    'type': 'number',
+                    'minimum': 0
+                },
+                'style': 'form',
+                'explode': False
+            },
+            'precision': {
+                'name': 'precision',
+                'in': 'query',
+                'description': 'The optional precision parameter indicates the maximum number of decimal digits of the coordinates of the features in the response document.',  # noqa
+                'required': False,
+                'schema': {
+                    'type': 'integer',
+                    'minimum': 0
+                },
+                'style': 'form',
+                'explode': False
+            },
+            'cursor': {
+                'name': 'cursor',
+                'in': 'query',
+                'description': 'The optional cursor parameter indicates the position (returned in the `next` link of the previous page) after which the server shall begin presenting results in the response document.',  # noqa
+                'required': False,
+                'schema': {
+                    'type': 'string'
+                },
+                'style': 'form',
+                'explode': False
             }
         },
         'schemas': {
@@ -401,6 +455,7 @@ def get_oas_30(cfg):
                     items_f,
                     {'$ref': '{}#/components/parameters/bbox'.format(OPENAPI_YAML['oapif'])},  # noqa
                     {'$ref': '{}#/components/parameters/limit'.format(OPENAPI_YAML['oapif'])},  # noqa
+                    {'$ref': '#/components/parameters/properties'},
                     {'$ref': '#/components/parameters/sortby'},
                     {'$ref': '#/components/parameters/startindex'}
                 ],
@@ -415,9 +470,19 @@ def get_oas_30(cfg):
 
         providers = get_provider_by_type(collections[k]['providers'],
                                          'feature')
-        p = load_plugin('provider', providers)
+        p = registry.get(k, 'feature')
         cql_filter_exists = False
 
+        if getattr(p, 'pagination', None) == 'keyset':
+            paths[items_path]['get']['parameters'].append(
+                {'$ref': '#/components/parameters/cursor'})
+
+        query_parameters = inspect.signature(p.query).parameters
+        for name in ['simplify', 'precision']:
+            if name in query_parameters:
+                paths[items_path]['get']['parameters'].append(
+                    {'$ref': '#/components/parameters/{}'.format(name)})
+
         # get CQL extension of the collection provider
         cql_extension = get_extension_by_type(providers, 'CQL')
 
@@ -449,8 +514,7 @@ def get_oas_30(cfg):
 
         LOGGER.debug('setting up feature endpoints')
         try:
-            p = load_plugin('provider', get_provider_by_type(
-                            collections[k]['providers'], 'feature'))
+            p = registry.get(k, 'feature')
             if p.fields:
                 queryables_path = '{}/queryables'.format(collection_name_path)
 
@@ -536,8 +600,7 @@ def get_oas_30(cfg):
 
         LOGGER.debug('setting up coverage endpoints')
         try:
-            load_plugin('provider', get_provider_by_type(
-                        collections[k]['providers'], 'coverage'))
+            registry.get(k, 'coverage')
 
             coverage_path = '{}/coverage'.format(collection_name_path)
 
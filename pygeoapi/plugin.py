@@ -28,8 +28,16 @@
 # =================================================================
 """Plugin loader"""
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from copy import deepcopy
 import importlib
 import logging
+import threading
+import time
+
+import click
+
+from pygeoapi.util import get_provider_by_type, yaml_load
 
 LOGGER = logging.getLogger(__name__)
 
@@ -100,6 +108,224 @@ def load_plugin(plugin_type, plugin_def):
     return plugin
 
 
+class ProviderRegistry:
+    """
+    Per-process registry of provider instances
+
+    Providers are loaded once per collection and provider type (lazily,
+    on first access) and then shared across requests, avoiding module
+    imports, file/connection setup and field introspection on every call
+    """
+
+    def __init__(self, resources):
+        """
+        Initialize object
+
+        :param resources: `dict` of resources (``resources`` section of
+                          the pygeoapi configuration)
+
+        :returns: `pygeoapi.plugin.ProviderRegistry`
+        """
+
+        self.resources = resources
+        self.timings = {}
+        self.errors = {}
+        self._providers = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def get(self, dataset, provider_type):
+        """
+        Get (loading if required) the provider of a collection
+
+        A cached provider is reloaded when its provider definition
+        has changed since it was loaded
+
+        :param dataset: dataset name
+        :param provider_type: type of provider (feature, coverage, stac)
+
+        :returns: provider object
+        """
+
+        key = (dataset, provider_type)
+        provider_def = get_provider_by_type(
+            self.resources[dataset]['providers'], provider_type)
+
+        cached = self._providers.get(key)
+        if cached is not None and cached[1] == provider_def:
+            return cached[0]
+
+        with self._lock:
+            lock = self._locks.setdefault(key, threading.Lock())
+
+        # per-key lock so that a slow provider does not block the others
+        with lock:
+            cached = self._providers.get(key)
+            if cached is None or cached[1] != provider_def:
+                LOGGER.debug('Loading {} provider for {}'.format(
+                    provider_type, dataset))
+                start = time.monotonic()
+                provider = load_plugin('provider', provider_def)
+                self.timings[key] = time.monotonic() - start
+                self.errors.pop(key, None)
+                cached = (provider, deepcopy(provider_def))
+                self._providers[key] = cached
+
+        return cached[0]
+
+    def keys(self):
+        """
+        Get the collections and provider types of all the configured
+        providers
+
+        :returns: `list` of `tuple` of dataset name and provider type
+        """
+
+        keys = []
+        for dataset, resource in self.resources.items():
+            for provider_def in resource.get('providers', []):
+                key = (dataset, provider_def['type'])
+                if key not in keys:
+                    keys.append(key)
+        return keys
+
+    def warmup(self, max_workers=None, fail_fast=False, preload=False):
+        """
+        Load all the configured providers concurrently (in a thread
+        pool), e.g. at server startup, so that provider initialization
+        does not happen on first request
+
+        Providers failing to load are logged and skipped (they will be
+        loaded again on first access), unless `fail_fast` is set
+
+        :param max_workers: maximum number of threads (default is the
+                            `concurrent.futures.ThreadPoolExecutor`
+                            default)
+        :param fail_fast: raise the first provider error
+        :param preload: also load provider data in memory (see
+                        `BaseProvider.preload`)
+
+        :returns: `dict` of (dataset, provider type) and load time
+                  (seconds) of the loaded providers
+        """
+
+        keys = self.keys()
+        LOGGER.debug('Warming up {} providers'.format(len(keys)))
+        start = time.monotonic()
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(self._warmup, key, preload): key
+                       for key in keys}
+            for future in as_completed(futures):
+                key = futures[future]
+                try:
+                    future.result()
+                except Exception as err:
+                    LOGGER.error('Cannot load {} provider of {}: {}'.format(
+                        key[1], key[0], err))
+                    self.errors[key] = err
+                    if fail_fast:
+                        for other in futures:
+                            other.cancel()
+                        raise
+                else:
+                    LOGGER.debug('Loaded {} provider of {} in {:.3f}s'.format(
+                        key[1], key[0], self.timings.get(key, 0)))
+
+        LOGGER.info('Warmed up {} of {} providers in {:.3f}s'.format(
+            len(keys) - len(self.errors), len(keys),
+            time.monotonic() - start))
+
+        return {key: self.timings[key] for key in keys
+                if key in self._providers and key in self.timings}
+
+    def _warmup(self, key, preload=False):
+        """
+        Load a provider (and its data)
+
+        :param key: `tuple` of dataset name and provider type
+        :param preload: also load provider data in memory
+
+        :returns: provider object
+        """
+
+        provider = self.get(*key)
+        if preload:
+            start = time.monotonic()
+            provider.preload()
+            self.timings[key] = self.timings.get(key, 0) + \
+                time.monotonic() - start
+        return provider
+
+    def invalidate(self, dataset=None):
+        """
+        Drop cached providers, forcing them to be reloaded on next access
+
+        :param dataset: dataset name (default drops all datasets)
+
+        :returns: void
+        """
+
+        with self._lock:
+            for key in list(self._providers.keys()):
+                if dataset is None or key[0] == dataset:
+                    LOGGER.debug('Invalidating provider {}'.format(key))
+                    self._providers.pop(key, None)
+
+    def reload(self, resources):
+        """
+        Replace the registry resources (e.g. on configuration reload)
+        and drop all cached providers
+
+        :param resources: `dict` of resources
+
+        :returns: void
+        """
+
+        with self._lock:
+            self.resources = resources
+        self.invalidate()
+
+    def __contains__(self, key):
+        return key in self._providers
+
+
+@click.command('warmup')
+@click.pass_context
+@click.option('--config', '-c', 'config_file', help='configuration file')
+@click.option('--max-workers', '-w', type=int, default=None,
+              help='maximum number of threads')
+@click.option('--fail-fast', default=False, is_flag=True,
+              help='stop at the first provider error')
+@click.option('--preload', default=False, is_flag=True,
+              help='also load provider data in memory')
+def warmup_providers(ctx, config_file, max_workers, fail_fast, preload):
+    """
+    Initialize all providers and report their load times
+    """
+
+    if config_file is None:
+        raise click.ClickException('--config/-c required')
+    with open(config_file) as ff:
+        s = yaml_load(ff)
+
+    registry = ProviderRegistry(s['resources'])
+    try:
+        timings = registry.warmup(max_workers=max_workers,
+                                  fail_fast=fail_fast, preload=preload)
+    except Exception as err:
+        raise click.ClickException(str(err))
+
+    for (dataset, provider_type), seconds in sorted(timings.items()):
+        click.echo('{} ({}): {:.3f}s'.format(dataset, provider_type,
+                                             seconds))
+    for (dataset, provider_type), err in sorted(registry.errors.items()):
+        click.echo('{} ({}): ERROR {}'.format(dataset, provider_type, err))
+
+    if registry.errors:
+        ctx.exit(1)
+
+
 class InvalidPluginError(Exception):
     """Invalid plugin"""
     pass
@@ -5,7 +5,7 @@ from Abstract Syntax Tree for PostGres
 
 import logging
 from datetime import datetime
-from psycopg2.sql import SQL, Identifier, Literal
+from psycopg2.sql import SQL, Composed, Identifier, Placeholder
 
 from pygeoapi.cql_exception import (CQLExceptionAttribute,
                                     CQLExceptionSpatial,
@@ -16,6 +16,44 @@ from pygeoapi.cql_exception import (CQLExceptionAttribute,
 LOGGER = logging.getLogger(__name__)
 
 
+class Parameter(Placeholder):
+    """
+    Query parameter: rendered as a placeholder (``%s``), its value being
+    passed to the database separately, so that queries differing only
+    in values have the same text
+    """
+
+    def __init__(self, value):
+        """
+        Initialize object
+
+        :param value: parameter value
+
+        :returns: pygeoapi.postgres_where_clauses.Parameter
+        """
+
+        Placeholder.__init__(self)
+        self.value = value
+
+
+def get_parameters(composable):
+    """
+    Collect the values of the parameters of a query, in order
+
+    :param composable: psycopg2.sql.Composable
+
+    :return: parameter values
+    :rtype: list
+    """
+
+    if isinstance(composable, Parameter):
+        return [composable.value]
+    if isinstance(composable, Composed):
+        return [value for part in composable.seq
+                for value in get_parameters(part)]
+    return []
+
+
 def combine(sub_filters, combination):
     """
     Combine filters using a logical combinator
@@ -33,13 +71,12 @@ def combine(sub_filters, combination):
     for sub_filter in sub_filters:
         where_conditions += sub_filter
 
-    if where_conditions:
-        if combination == "AND":
-            where_clause = SQL('{}').format(
-                SQL(' AND ').join(where_conditions))
-        else:
-            where_clause = SQL('{}').format(
-                SQL(' OR ').join(where_conditions))
+    if combination == "AND":
+        where_clause = [SQL('({})').format(
+            SQL(' AND ').join(where_conditions))]
+    else:
+        where_clause = [SQL('({})').format(
+            SQL(' OR ').join(where_conditions))]
 
     return where_clause
 
@@ -58,7 +95,7 @@ def negate(feature_list, sub_filter):
     :rtype: str
     """
 
-    where_clause = [SQL(' NOT {}').format(SQL(' AND ').join(sub_filter))]
+    where_clause = [SQL('NOT ({})').format(SQL(' AND ').join(sub_filter))]
 
     return where_clause
 
@@ -92,7 +129,7 @@ def compare(feature_list, lhs, rhs, op):
     :rtype: str
     """
 
-    where_clause = [Comparisons[op].format(Identifier(lhs), Literal(rhs))]
+    where_clause = [Comparisons[op].format(Identifier(lhs), Parameter(rhs))]
 
     return where_clause
 
@@ -120,11 +157,11 @@ def between(feature_list, lhs, low, high, not_=False):
     """
 
     where_clause = [SQL('{} BETWEEN {} AND {}').format(
-        Identifier(lhs), Literal(low), Literal(high))]
+        Identifier(lhs), Parameter(low), Parameter(high))]
 
     if not_:
         where_clause = [SQL('{} NOT BETWEEN {} AND {}').format(
-            Identifier(lhs), Literal(low), Literal(high))]
+            Identifier(lhs), Parameter(low), Parameter(high))]
 
     return where_clause
 
@@ -152,16 +189,16 @@ def like(feature_list, lhs, rhs, case=False, not_=False):
     :rtype: str
     """
 
+    column = Identifier(lhs)
     if not case:
-        lhs = "UPPER({})".format(lhs)
+        column = SQL('UPPER({})').format(column)
         rhs = rhs.upper()
 
-    where_clause = [SQL('{} LIKE {}').format(
-        Identifier(lhs), Literal(rhs))]
+    where_clause = [SQL('{} LIKE {}').format(column, Parameter(rhs))]
 
     if not_:
         where_clause = [SQL('{} NOT LIKE {}').format(
-            Identifier(lhs), Literal(rhs))]
+            column, Parameter(rhs))]
 
     return where_clause
 
@@ -185,12 +222,13 @@ def contains(feature_list, lhs, items, not_=False):
     :rtype: str
     """
 
-    where_clause = [SQL('{} IN {}').format(
-        Identifier(lhs), Literal(tuple(items)))]
+    values = SQL(', ').join([Parameter(item) for item in items])
+
+    where_clause = [SQL('{} IN ({})').format(Identifier(lhs), values)]
 
     if not_:
-        where_clause = [SQL('{} NOT IN {}').format(
-            Identifier(lhs), Literal(tuple(items)))]
+        where_clause = [SQL('{} NOT IN ({})').format(
+            Identifier(lhs), values)]
 
     return where_clause
 
@@ -253,12 +291,12 @@ def temporal(feature_list, field_list, lhs, time_or_period, op):
             if op == 'BEFORE':
                 where_clause = [SQL('{} < {}').format(
                     Identifier(field_list[lhs]),
-                    Literal(query_date_time))]
+                    Parameter(query_date_time))]
 
             elif op == 'AFTER':
                 where_clause = [SQL('{} > {}').format(
                     Identifier(field_list[lhs]),
-                    Literal(query_date_time))]
+                    Parameter(query_date_time))]
 
         # perform during operation
         elif 'DURING' in op:
@@ -268,23 +306,23 @@ def temporal(feature_list, field_list, lhs, time_or_period, op):
 
             where_conditions = []
             where_conditions = [SQL('{} >= {}').format(
-                Identifier(field_list[lhs]), Literal(low))]
+                Identifier(field_list[lhs]), Parameter(low))]
             where_conditions += [SQL('{} <= {}').format(
-                Identifier(field_list[lhs]), Literal(high))]
+                Identifier(field_list[lhs]), Parameter(high))]
 
             if where_conditions:
-                where_clause = SQL('{}').format(
-                    SQL(' AND ').join(where_conditions))
+                where_clause = [SQL('({})').format(
+                    SQL(' AND ').join(where_conditions))]
 
             if 'BEFORE' in op:
                 where_clause = [SQL('{} < {}').format(
                     Identifier(field_list[lhs]),
-                    Literal(high))]
+                    Parameter(high))]
 
             elif 'AFTER' in op:
                 where_clause = [SQL('{} > {}').format(
                     Identifier(field_list[lhs]),
-                    Literal(low))]
+                    Parameter(low))]
 
         return where_clause
 
@@ -359,13 +397,13 @@ def spatial(feature_list, field_list, lhs, rhs, op,
                     '{distance})').format(
                     relation=Spatial_Operator[op],
                     geometry=Identifier(field_list[lhs]),
-                    parameter=Literal(rhs), srid=Literal(4326),
-                    distance=Literal(distance))
+                    parameter=Parameter(rhs), srid=SQL('4326'),
+                    distance=Parameter(distance))
             ]
 
             if op == "BEYOND":
                 where_clause = [
-                    SQL(' NOT {}').format(SQL(' AND ').join(
+                    SQL('NOT ({})').format(SQL(' AND ').join(
                         where_condition))]
             else:
                 where_clause = where_condition
@@ -377,9 +415,8 @@ def spatial(feature_list, field_list, lhs, rhs, op,
                     '{pattern})').format(
                     relation=Spatial_Operator[op],
                     geometry=Identifier(field_list[lhs]),
-                    parameter=Literal(rhs), srid=Literal(4326),
-                    distance=Literal(distance),
-                    pattern=Literal(pattern))]
+                    parameter=Parameter(rhs), srid=SQL('4326'),
+                    pattern=Parameter(pattern))]
 
         else:
             where_clause = [
@@ -387,7 +424,7 @@ def spatial(feature_list, field_list, lhs, rhs, op,
                     'ST_GeomFromText({parameter},{srid}))').format(
                     relation=Spatial_Operator[op],
                     geometry=Identifier(field_list[lhs]),
-                    parameter=Literal(rhs), srid=Literal(4326))
+                    parameter=Parameter(rhs), srid=SQL('4326'))
             ]
 
         return where_clause
@@ -428,15 +465,10 @@ def bbox(feature_list, field_list, lhs, minx, miny, maxx, maxy,
     :rtype: str
     """
 
-    bbox_coord = [Literal(minx), Literal(miny), Literal(maxx), Literal(maxy)]
-    where_conditions = []
-    bbox_clause = SQL('{} && ST_MakeEnvelope({})').format(
-        Identifier(field_list[lhs]), SQL(', ').join(bbox_coord))
-    where_conditions.append(bbox_clause)
-
-    if where_conditions:
-        where_clause = SQL('{}').format(
-            SQL(' AND ').join(where_conditions))
+    bbox_coord = [Parameter(minx), Parameter(miny), Parameter(maxx),
+                  Parameter(maxy)]
+    where_clause = [SQL('{} && ST_MakeEnvelope({})').format(
+        Identifier(field_list[lhs]), SQL(', ').join(bbox_coord))]
 
     return where_clause
 
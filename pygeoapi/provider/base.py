@@ -72,6 +72,16 @@ class BaseProvider:
 
         raise NotImplementedError()
 
+    def preload(self):
+        """
+        Load provider data in memory ahead of requests (e.g. before
+        forking worker processes), for providers keeping data in memory
+
+        :returns: void
+        """
+
+        pass
+
     def get_data_path(self, baseurl, urlpath, dirpath):
         """
         Gets directory listing or file description or raw file dump
@@ -0,0 +1,265 @@
+# =================================================================
+#
+# Authors: Tom Kralidis <tomkralidis@gmail.com>
+#
+# Copyright (c) 2020 Tom Kralidis
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# =================================================================
+
+
+"""In-memory columnar tables for file based providers"""
+
+import csv
+import logging
+import sys
+import threading
+
+import numpy as np
+import shapely
+from shapely.geometry import Point
+
+from pygeoapi.provider.packed_rtree import PackedRTree
+
+LOGGER = logging.getLogger(__name__)
+
+
+class ColumnarTable:
+    """
+    Column-oriented copy of a point dataset: attribute values are kept
+    as arrays of strings and coordinates as float64 vectors, so that
+    filters can be evaluated as vectorized boolean masks
+    """
+
+    def __init__(self, ids, x, y, columns):
+        """
+        Initialize object
+
+        :param ids: `numpy.ndarray` of feature ids
+        :param x: `numpy.ndarray` (float64) of x coordinates
+        :param y: `numpy.ndarray` (float64) of y coordinates
+        :param columns: `dict` of property name and `numpy.ndarray`
+                        of values
+
+        :returns: `pygeoapi.provider.columnar.ColumnarTable`
+        """
+
+        self.ids = ids
+        self.x = x
+        self.y = y
+        self.columns = columns
+        self._numeric = {}
+        self._codes = {}
+        self._points = None
+        self._rtree = None
+        self._positions = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.ids)
+
+    @classmethod
+    def from_csv(cls, filename, id_field, x_field, y_field):
+        """
+        Load a CSV file
+
+        :param filename: CSV filename
+        :param id_field: name of the id column
+        :param x_field: name of the x coordinate column
+        :param y_field: name of the y coordinate column
+
+        :returns: `pygeoapi.provider.columnar.ColumnarTable`
+        """
+
+        with open(filename) as ff:
+            reader = csv.reader(ff)
+            fieldnames = next(reader, [])
+            rows = [row for row in reader if row]
+
+        values = {}
+        for i, name in enumerate(fieldnames):
+            # repeated property values are stored once
+            intern = str if name in (id_field, x_field, y_field) \
+                else sys.intern
+            column = np.empty(len(rows), dtype=object)
+            column[:] = [intern(row[i]) if i < len(row) else None
+                         for row in rows]
+            values[name] = column
+
+        x = values.pop(x_field).astype(np.float64)
+        y = values.pop(y_field).astype(np.float64)
+        ids = values.pop(id_field)
+
+        return cls(ids, x, y, values)
+
+    def column(self, name):
+        """
+        Get the values of a column
+
+        :param name: column name (`id` or property name)
+
+        :returns: `numpy.ndarray` of values
+        """
+
+        if name == 'id':
+            return self.ids
+        return self.columns[name]
+
+    def numeric(self, name):
+        """
+        Get the values of a column as numbers (converted on first use)
+
+        :param name: column name
+
+        :returns: `numpy.ndarray` (float64) of values
+
+        :raises: `ValueError` if a value is not numeric
+        """
+
+        numeric = self._numeric.get(name)
+        if numeric is None:
+            numeric = self.column(name).astype(np.float64)
+            self._numeric[name] = numeric
+        return numeric
+
+    def codes(self, name):
+        """
+        Get the distinct values of a column and the position of the
+        value of each row in them (computed on first use)
+
+        :param name: column name
+
+        :returns: `tuple` of `list` of distinct values and
+                  `numpy.ndarray` of positions
+        """
+
+        codes = self._codes.get(name)
+        if codes is None:
+            uniques = {}
+            column = self.column(name)
+            inverse = np.fromiter(
+                (uniques.setdefault(value, len(uniques))
+                 for value in column),
+                dtype=np.intp, count=len(column))
+            codes = list(uniques), inverse
+            self._codes[name] = codes
+        return codes
+
+    def map(self, name, function):
+        """
+        Evaluate a predicate once per distinct value of a column
+
+        :param name: column name
+        :param function: predicate taking a value
+
+        :returns: `numpy.ndarray` (bool) mask
+        """
+
+        uniques, inverse = self.codes(name)
+        results = np.fromiter((bool(function(value)) for value in uniques),
+                              dtype=bool, count=len(uniques))
+        return results[inverse]
+
+    def points(self):
+        """
+        Get the geometries of the rows (built on first use)
+
+        :returns: `numpy.ndarray` of `shapely.geometry.Point`
+        """
+
+        if self._points is None:
+            if hasattr(shapely, 'points'):
+                points = shapely.points(self.x, self.y)
+            else:
+                points = np.empty(len(self), dtype=object)
+                points[:] = [Point(x, y) for x, y in zip(self.x, self.y)]
+            self._points = points
+        return self._points
+
+    def rtree(self):
+        """
+        Get the R-tree of the rows (built on first use)
+
+        :returns: `pygeoapi.provider.packed_rtree.PackedRTree`
+        """
+
+        if self._rtree is None:
+            with self._lock:
+                if self._rtree is None:
+                    self._rtree = PackedRTree.from_points(self.x, self.y)
+        return self._rtree
+
+    def search(self, bbox):
+        """
+        Find the rows within a bbox
+
+        :param bbox: `tuple` of minx, miny, maxx, maxy
+
+        :returns: `numpy.ndarray` (bool) mask
+        """
+
+        mask = np.zeros(len(self), dtype=bool)
+        mask[self.rtree().search(bbox)] = True
+        return mask
+
+    def position(self, identifier):
+        """
+        Get the position of a row by id
+
+        :param identifier: feature id
+
+        :returns: row position, or `None` if not found
+        """
+
+        if self._positions is None:
+            with self._lock:
+                if self._positions is None:
+                    positions = {}
+                    for i, id_ in enumerate(self.ids):
+                        positions.setdefault(id_, i)
+                    self._positions = positions
+
+        return self._positions.get(str(identifier))
+
+    def feature(self, i, properties=None):
+        """
+        Materialize a row as a GeoJSON feature
+
+        :param i: row position
+        :param properties: `list` of property names to include
+                           (default all)
+
+        :returns: `dict` of GeoJSON Feature
+        """
+
+        names = properties or self.columns.keys()
+
+        return {
+            'type': 'Feature',
+            'id': self.ids[i],
+            'geometry': {
+                'type': 'Point',
+                'coordinates': [float(self.x[i]), float(self.y[i])]
+            },
+            'properties': {name: self.columns[name][i] for name in names}
+        }
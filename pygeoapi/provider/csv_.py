@@ -28,22 +28,40 @@
 # =================================================================
 
 from collections import OrderedDict
+import collections
 import csv
+import heapq
 import itertools
 import logging
 import os
+import threading
 
-from pygeoapi.provider.base import (BaseProvider, ProviderQueryError,
+from pygeoapi.provider.base import (BaseProvider, ProviderConnectionError,
+                                    ProviderQueryError,
                                     ProviderItemNotFoundError)
+from pygeoapi.provider.file_index import (FeatureIndexCache,
+                                          get_file_signature, open_mmap)
 
 from pygeoapi.plugin import load_plugin
 from pygeoapi.cql_exception import CQLException
+from pygeoapi.util import (get_bbox_2d, get_datetime_interval,
+                           get_sort_key, get_timestamp, get_typed_value)
 
 LOGGER = logging.getLogger(__name__)
 
 
 class CSVProvider(BaseProvider):
-    """CSV provider"""
+    """CSV provider
+
+    Setting ``columnar: true`` in the provider definition keeps the file
+    in memory as typed columns (requires numpy), reloading it only when
+    the file modification time or size changes: filters are evaluated
+    as vectorized masks and only the requested page is materialized
+
+    Setting ``index: true`` persists a sidecar index (`.idx`) of the byte
+    offset of each row, so that pages and items are read directly at
+    their offset
+    """
 
     def __init__(self, provider_def):
         """
@@ -57,6 +75,18 @@ class CSVProvider(BaseProvider):
         BaseProvider.__init__(self, provider_def)
         self.geometry_x = provider_def['geometry']['x_field']
         self.geometry_y = provider_def['geometry']['y_field']
+        self.index = None
+        if provider_def.get('index', False):
+            self.index = FeatureIndexCache(self.data, self._index_rows)
+        self.columnar = provider_def.get('columnar', False)
+        if self.columnar:
+            try:
+                import numpy  # noqa
+            except ImportError as err:
+                LOGGER.error('numpy is required for columnar mode')
+                raise ProviderConnectionError(err)
+        self._table = None
+        self._table_lock = threading.Lock()
         self.fields = self.get_fields()
 
     def get_fields(self):
@@ -75,22 +105,291 @@ class CSVProvider(BaseProvider):
                 fields[f] = 'string'
             return fields
 
-    def _load(self, identifier=None):
+    def _get_table(self):
         """
-        Load CSV data
+        Get the in-memory columnar copy of the source CSV file,
+        (re)loading it if the file has changed since it was last loaded
 
-        :param identifier: feature id
+        :returns: `pygeoapi.provider.columnar.ColumnarTable`
+        """
+
+        from pygeoapi.provider.columnar import ColumnarTable
+
+        stat = get_file_signature(self.data)
+
+        cache = self._table
+        if cache is not None and cache['stat'] == stat:
+            return cache['table']
+
+        with self._table_lock:
+            cache = self._table
+            if cache is None or cache['stat'] != stat:
+                LOGGER.debug('(Re)loading {}'.format(self.data))
+                try:
+                    table = ColumnarTable.from_csv(
+                        self.data, self.id_field,
+                        self.geometry_x, self.geometry_y)
+                except (KeyError, ValueError) as err:
+                    LOGGER.error(err)
+                    raise ProviderQueryError(err)
+                cache = {
+                    'stat': stat,
+                    'table': table
+                }
+                self._table = cache
+
+        return cache['table']
+
+    def preload(self):
+        """
+        Load the in-memory columnar copy (``columnar``) or the index
+        (``index``) of the source CSV file ahead of requests
+
+        :returns: void
+        """
+
+        if self.columnar:
+            self._get_table().rtree()
+        elif self.index:
+            self.index.get()
+
+    def _query_columnar(self, startindex=0, limit=10, resulttype='results',
+                        bbox=[], datetime_=None, properties=[], sortby=[],
+                        cql_expression=None):
+        """
+        CSV query on the in-memory columnar copy of the file
+
+        :param startindex: starting record to return (default 0)
+        :param limit: number of records to return (default 10)
+        :param resulttype: return results or hit limit (default results)
+        :param bbox: bounding box [minx,miny,maxx,maxy]
+        :param datetime_: temporal (datestamp or extent)
+        :param properties: list of tuples (name, value)
+        :param sortby: list of dicts (property, order)
+        :param cql_expression: CQL filter expression
+
+        :returns: dict of GeoJSON FeatureCollection
         """
 
-        if os.path.exists(self.data):
-            with open(self.data) as ff:
-                LOGGER.debug('Serializing DictReader')
-                data_ = csv.DictReader(ff)
-                dataset = list(data_)
+        import numpy as np
+
+        table = self._get_table()
+
+        missing = set(self.properties) - set(table.columns)
+        if missing:
+            LOGGER.error('Unknown properties: {}'.format(missing))
+            raise ProviderQueryError()
+
+        mask = None
+
+        if bbox:
+            mask = table.search(get_bbox_2d(bbox))
+
+        if datetime_ is not None:
+            if self.time_field not in table.columns:
+                LOGGER.error('time_field not enabled for collection')
+                raise ProviderQueryError()
+
+            begin, end = get_datetime_interval(datetime_)
+
+            def in_interval(value):
+                timestamp = get_timestamp(value)
+                return (timestamp is not None and
+                        (begin is None or timestamp >= begin) and
+                        (end is None or timestamp <= end))
+
+            match = table.map(self.time_field, in_interval)
+            mask = match if mask is None else mask & match
+
+        for name, value in properties:
+            try:
+                if name == self.geometry_x:
+                    match = table.x == float(value)
+                elif name == self.geometry_y:
+                    match = table.y == float(value)
+                else:
+                    typed_value = get_typed_value(value)
+                    match = table.map(
+                        'id' if name == self.id_field else name,
+                        lambda v: (v is not None and
+                                   get_typed_value(v) == typed_value))
+            except (KeyError, ValueError) as err:
+                LOGGER.error(err)
+                raise ProviderQueryError()
+            mask = match if mask is None else mask & match
+
+        if cql_expression:
+            field_list = {name: name for name in
+                          ['type', 'id', 'geometry'] + list(table.columns)}
+            try:
+                cql_handler = load_plugin('extensions',
+                                          {'name': 'CQL',
+                                           'cql_expression': cql_expression,
+                                           'feature_list': table,
+                                           'field_list': field_list})
+                match = cql_handler.cql_mask()
+            except Exception as err:
+                raise CQLException(err)
+            mask = match if mask is None else mask & match
+
+        if mask is None:
+            positions = np.arange(len(table))
         else:
-            dataset = None
+            positions = np.flatnonzero(mask)
+
+        feature_collection = {
+            'type': 'FeatureCollection',
+            'features': [],
+            'numberMatched': len(positions)
+        }
+
+        if resulttype == 'hits':
+            LOGGER.debug('Returning hits only')
+            return feature_collection
+
+        if sortby:
+            key = get_sort_key(sortby)
+            positions = heapq.nsmallest(
+                startindex + limit, positions,
+                key=lambda i: key(self._table_row(table, i)))
+
+        feature_collection['features'] = [
+            table.feature(i, self.properties)
+            for i in positions[startindex:startindex + limit]
+        ]
+        feature_collection['numberReturned'] = len(
+            feature_collection['features'])
+
+        return feature_collection
+
+    def _table_row(self, table, i):
+        """
+        Get a row of the columnar copy of the file (for sorting)
+
+        :param table: `pygeoapi.provider.columnar.ColumnarTable`
+        :param i: row position
+
+        :returns: `dict` of CSV row
+        """
+
+        row = {name: column[i] for name, column in table.columns.items()}
+        row[self.id_field] = table.ids[i]
+        row[self.geometry_x] = table.x[i]
+        row[self.geometry_y] = table.y[i]
+
+        return row
+
+    def _index_rows(self, buf):
+        """
+        Index builder of the source CSV file
+
+        :param buf: memory-mapped source CSV file
+
+        :returns: generator of `tuple` of start, end byte offsets, id
+                  and bbox of each row
+        """
+
+        spans = iter_record_spans(buf)
+        header = next(spans, None)
+        if header is None:
+            return
+
+        fieldnames = self._parse_record(buf, *header)
+        for start, end in spans:
+            values = self._parse_record(buf, start, end)
+            if not values:
+                continue
+            row = dict(zip(fieldnames, values))
+            try:
+                x = float(row[self.geometry_x])
+                y = float(row[self.geometry_y])
+                bbox = (x, y, x, y)
+            except (KeyError, ValueError):
+                bbox = None
+            yield start, end, row.get(self.id_field), bbox
+
+    def _parse_record(self, buf, start, end):
+        """
+        Parse a single record of the source CSV file
+
+        :param buf: memory-mapped source CSV file
+        :param start: start byte offset of the record
+        :param end: end byte offset of the record
+
+        :returns: `list` of record values
+        """
+
+        record = buf[start:end].decode('utf-8')
+        return next(csv.reader([record]), [])
+
+    def _row_to_feature(self, row):
+        """
+        Assembles GeoJSON output from a CSV row
+
+        :param row: `dict` of CSV row
+
+        :returns: `dict` of GeoJSON Feature
+        """
+
+        feature = {'type': 'Feature'}
+        feature['id'] = row.pop(self.id_field)
+        feature['geometry'] = {
+            'type': 'Point',
+            'coordinates': [
+                float(row.pop(self.geometry_x)),
+                float(row.pop(self.geometry_y))
+            ]
+        }
+        if self.properties:
+            feature['properties'] = OrderedDict()
+            for p in self.properties:
+                try:
+                    feature['properties'][p] = row[p]
+                except KeyError as err:
+                    LOGGER.error(err)
+                    raise ProviderQueryError()
+        else:
+            feature['properties'] = row
+
+        return feature
+
+    def _query_index(self, startindex=0, limit=10, resulttype='results'):
+        """
+        CSV query using the sidecar index: only the rows of the
+        requested page are read and parsed
 
-        return dataset
+        :param startindex: starting record to return (default 0)
+        :param limit: number of records to return (default 10)
+        :param resulttype: return results or hit limit (default results)
+
+        :returns: dict of GeoJSON FeatureCollection
+        """
+
+        index = self.index.get()
+
+        feature_collection = {
+            'type': 'FeatureCollection',
+            'features': [],
+            'numberMatched': len(index)
+        }
+
+        if resulttype == 'hits':
+            LOGGER.debug('Returning hits only')
+            return feature_collection
+
+        with open_mmap(self.data) as buf:
+            if len(index):
+                fieldnames = self._parse_record(buf, 0, index.offsets[0])
+            for start, end in index.spans(startindex, startindex + limit):
+                row = dict(zip(fieldnames,
+                               self._parse_record(buf, start, end)))
+                feature_collection['features'].append(
+                    self._row_to_feature(row))
+
+        feature_collection['numberReturned'] = len(
+            feature_collection['features'])
+
+        return feature_collection
 
     def query(self, startindex=0, limit=10, resulttype='results',
               bbox=[], datetime=None, properties=[], sortby=[],
@@ -111,83 +410,190 @@ class CSVProvider(BaseProvider):
         :returns: dict of GeoJSON FeatureCollection
         """
 
-        dataset = self._load(identifier=identifier)
+        if self.columnar and identifier is None:
+            return self._query_columnar(startindex, limit, resulttype,
+                                        bbox, datetime, properties, sortby,
+                                        cql_expression)
+
+        if self.index and identifier is None and not any(
+                [bbox, datetime, properties, sortby, cql_expression]):
+            return self._query_index(startindex, limit, resulttype)
+
+        if identifier is not None:
+            return self._find(identifier)
+
+        row_filter = self._row_filter(bbox, datetime, properties)
 
-        found = False
-        result = None
         feature_collection = {
             'type': 'FeatureCollection',
             'features': []
         }
 
-        count = len(dataset)
-
-        if resulttype == 'hits' and not cql_expression:
-            LOGGER.debug('Returning hits only')
-            feature_collection['numberMatched'] = count
+        if not os.path.exists(self.data):
+            feature_collection['numberMatched'] = 0
+            feature_collection['numberReturned'] = 0
             return feature_collection
 
-        LOGGER.debug('Slicing CSV rows')
-        for row in itertools.islice(dataset, 0, count):
-            feature = {'type': 'Feature'}
-            feature['id'] = row.pop(self.id_field)
-            feature['geometry'] = {
-                'type': 'Point',
-                'coordinates': [
-                    float(row.pop(self.geometry_x)),
-                    float(row.pop(self.geometry_y))
-                ]
-            }
-            if self.properties:
-                feature['properties'] = OrderedDict()
-                for p in self.properties:
-                    try:
-                        feature['properties'][p] = row[p]
-                    except KeyError as err:
-                        LOGGER.error(err)
-                        raise ProviderQueryError()
+        with open(self.data) as ff:
+            LOGGER.debug('Streaming CSV rows')
+            rows = csv.DictReader(ff)
+            if row_filter is not None:
+                rows = filter(row_filter, rows)
+
+            if cql_expression:
+                # CQL filters are evaluated on the features of the
+                # rows matching the other filters
+                cql_def = {
+                    'name': 'CQL',
+                    'cql_expression': cql_expression,
+                    'feature_list': [self._row_to_feature(row)
+                                     for row in rows]
+                }
+                try:
+                    cql_handler = load_plugin('extensions', cql_def)
+                    features = cql_handler.cql_filter()
+                except Exception as err:
+                    raise CQLException(err)
+
+                feature_collection['numberMatched'] = len(features)
+                if resulttype == 'hits':
+                    return feature_collection
+
+                if sortby:
+                    key = get_sort_key(sortby)
+                    features = heapq.nsmallest(
+                        startindex + limit, features,
+                        key=lambda feature: key(self._feature_to_row(feature)))
+                features = features[startindex:startindex + limit]
+
             else:
-                feature['properties'] = row
+                # count rows as they are consumed
+                matched = itertools.count()
+                rows = (row for row in rows if next(matched) is not None)
+
+                if resulttype == 'hits':
+                    LOGGER.debug('Returning hits only')
+                    collections.deque(rows, maxlen=0)
+                    feature_collection['numberMatched'] = next(matched)
+                    return feature_collection
+
+                if sortby:
+                    # bounded heap: only the top rows are kept in memory
+                    rows = heapq.nsmallest(startindex + limit, rows,
+                                           key=get_sort_key(sortby))
+                    page = rows[startindex:]
+                    feature_collection['numberMatched'] = next(matched)
+                else:
+                    # stop reading after the page: the rows after it
+                    # are only counted if the file ended within it
+                    page = list(itertools.islice(rows, startindex,
+                                                 startindex + limit))
+                    if len(page) < limit:
+                        feature_collection['numberMatched'] = next(matched)
+
+                features = [self._row_to_feature(row) for row in page]
+
+        feature_collection['features'] = features
+        feature_collection['numberReturned'] = len(features)
 
-            if identifier is not None and feature['id'] == identifier:
-                found = True
-                result = feature
-            feature_collection['features'].append(feature)
-            feature_collection['numberMatched'] = \
-                len(feature_collection['features'])
+        return feature_collection
 
-        if cql_expression:
-            try:
-                feature_list = feature_collection['features']
+    def _find(self, identifier):
+        """
+        Scan the source CSV file for a row by id
 
-                cql_handler = load_plugin('extensions',
-                                          {'name': 'CQL',
-                                           'cql_expression': cql_expression,
-                                           'feature_list': feature_list})
-                feature_list = cql_handler.cql_filter()
-            except Exception as err:
-                raise CQLException(err)
+        :param identifier: feature id
 
-            feature_collection['features'] = feature_list
-            feature_collection['numberMatched'] = len(feature_collection
-                                                      ['features'])
+        :returns: dict of single GeoJSON feature, or `None` if not found
+        """
 
-            if resulttype == 'hits':
-                feature_collection['features'] = []
-                return feature_collection
+        if not os.path.exists(self.data):
+            return None
 
-        feature_collection['features'] = \
-            feature_collection['features'][startindex:startindex + limit]
+        with open(self.data) as ff:
+            for row in csv.DictReader(ff):
+                if row.get(self.id_field) == identifier:
+                    return self._row_to_feature(row)
 
-        if identifier is not None and not found:
+        return None
+
+    def _row_filter(self, bbox=[], datetime_=None, properties=[]):
+        """
+        Build a predicate matching CSV rows against query filters
+
+        :param bbox: bounding box [minx,miny,maxx,maxy]
+        :param datetime_: temporal (datestamp or extent)
+        :param properties: list of tuples (name, value)
+
+        :returns: function taking a `dict` of CSV row and returning
+                  whether it matches, or `None` if there are no filters
+        """
+
+        predicates = []
+
+        if bbox:
+            minx, miny, maxx, maxy = get_bbox_2d(bbox)
+
+            def in_bbox(row):
+                try:
+                    x = float(row[self.geometry_x])
+                    y = float(row[self.geometry_y])
+                except (KeyError, TypeError, ValueError):
+                    return False
+                return minx <= x <= maxx and miny <= y <= maxy
+
+            predicates.append(in_bbox)
+
+        if datetime_ is not None:
+            if self.time_field is None:
+                LOGGER.error('time_field not enabled for collection')
+                raise ProviderQueryError()
+
+            begin, end = get_datetime_interval(datetime_)
+
+            def in_interval(row):
+                timestamp = get_timestamp(row.get(self.time_field))
+                return (timestamp is not None and
+                        (begin is None or timestamp >= begin) and
+                        (end is None or timestamp <= end))
+
+            predicates.append(in_interval)
+
+        if properties:
+            typed_properties = [(name, get_typed_value(value))
+                                for name, value in properties]
+
+            def has_properties(row):
+                for name, value in typed_properties:
+                    row_value = row.get(name)
+                    if (row_value is None or
+                            get_typed_value(row_value) != value):
+                        return False
+                return True
+
+            predicates.append(has_properties)
+
+        if not predicates:
             return None
-        elif identifier is not None and found:
-            return result
+        if len(predicates) == 1:
+            return predicates[0]
+        return lambda row: all(predicate(row) for predicate in predicates)
 
-        feature_collection['numberReturned'] = len(
-            feature_collection['features'])
+    def _feature_to_row(self, feature):
+        """
+        Get back the CSV columns of a feature (for sorting)
 
-        return feature_collection
+        :param feature: `dict` of GeoJSON Feature
+
+        :returns: `dict` of CSV row
+        """
+
+        row = dict(feature['properties'])
+        row[self.id_field] = feature['id']
+        row[self.geometry_x], row[self.geometry_y] = \
+            feature['geometry']['coordinates']
+
+        return row
 
     def get(self, identifier):
         """
@@ -198,7 +604,32 @@ class CSVProvider(BaseProvider):
         :returns: dict of single GeoJSON feature
         """
 
-        item = self.query(identifier=identifier)
+        if self.columnar:
+            table = self._get_table()
+            i = table.position(identifier)
+            if i is not None:
+                return table.feature(i, self.properties)
+
+            err = 'item {} not found'.format(identifier)
+            LOGGER.error(err)
+            raise ProviderItemNotFoundError(err)
+
+        if self.index:
+            index = self.index.get()
+            i = index.position(identifier)
+            if i is not None:
+                with open_mmap(self.data) as buf:
+                    fieldnames = self._parse_record(buf, 0, index.offsets[0])
+                    start, end = index.span(i)
+                    row = dict(zip(fieldnames,
+                                   self._parse_record(buf, start, end)))
+                return self._row_to_feature(row)
+
+            err = 'item {} not found'.format(identifier)
+            LOGGER.error(err)
+            raise ProviderItemNotFoundError(err)
+
+        item = self._find(identifier)
         if item:
             return item
         else:
@@ -208,3 +639,29 @@ class CSVProvider(BaseProvider):
 
     def __repr__(self):
         return '<CSVProvider> {}'.format(self.data)
+
+
+def iter_record_spans(buf):
+    """
+    Iterate over the records of a CSV file without parsing them
+    (newlines within quoted values are supported)
+
+    :param buf: bytes-like object (e.g. `mmap.mmap`) of a CSV file
+
+    :returns: generator of (start, end) byte offsets of each record
+    """
+
+    pos = 0
+    size = len(buf)
+
+    while pos < size:
+        start = pos
+        quotes = 0
+        while pos < size:
+            newline = buf.find(b'\n', pos)
+            end = size if newline == -1 else newline + 1
+            quotes += buf[pos:end].count(b'"')
+            pos = end
+            if quotes % 2 == 0:
+                break
+        yield start, pos
@@ -0,0 +1,449 @@
+# =================================================================
+#
+# Authors: Tom Kralidis <tomkralidis@gmail.com>
+#
+# Copyright (c) 2020 Tom Kralidis
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# =================================================================
+
+"""Byte offset index of features for file based providers"""
+
+from array import array
+from contextlib import contextmanager
+import json
+import logging
+import mmap
+import os
+import sys
+import threading
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from pygeoapi.provider.packed_rtree import PackedRTree
+
+LOGGER = logging.getLogger(__name__)
+
+#: sidecar index format version
+INDEX_VERSION = 1
+
+#: sidecar index filename suffix
+INDEX_SUFFIX = '.idx'
+
+NaN = float('nan')
+
+
+class FeatureIndex:
+    """
+    Index of the byte offset, length, id and bbox of each feature
+    of a file
+    """
+
+    def __init__(self, signature, offsets, lengths, ids, bboxes):
+        """
+        Initialize object
+
+        :param signature: `tuple` of source file mtime (ns) and size
+        :param offsets: `array` of feature start byte offsets
+        :param lengths: `array` of feature byte lengths
+        :param ids: `list` of feature ids (as strings)
+        :param bboxes: `array` of minx, miny, maxx, maxy of each feature
+
+        :returns: `pygeoapi.provider.file_index.FeatureIndex`
+        """
+
+        self.signature = signature
+        self.offsets = offsets
+        self.lengths = lengths
+        self.ids = ids
+        self.bboxes = bboxes
+        self._positions = None
+        self._rtree = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def span(self, i):
+        """
+        Get the byte span of a feature
+
+        :param i: feature position
+
+        :returns: `tuple` of start, end byte offsets
+        """
+
+        start = self.offsets[i]
+        return start, start + self.lengths[i]
+
+    def spans(self, start=0, stop=None):
+        """
+        Iterate over feature byte spans
+
+        :param start: first feature position (default 0)
+        :param stop: last feature position, excluded (default all)
+
+        :returns: generator of `tuple` of start, end byte offsets
+        """
+
+        stop = len(self) if stop is None else min(stop, len(self))
+        for i in range(start, stop):
+            yield self.span(i)
+
+    def bbox(self, i):
+        """
+        Get the bbox of a feature
+
+        :param i: feature position
+
+        :returns: `tuple` of minx, miny, maxx, maxy
+        """
+
+        return tuple(self.bboxes[i * 4:i * 4 + 4])
+
+    def search(self, bbox):
+        """
+        Find the features whose bbox intersects a bbox, using an R-tree
+        built on first use
+
+        :param bbox: `tuple` of minx, miny, maxx, maxy
+
+        :returns: `list` of feature positions (in ascending order)
+        """
+
+        if self._rtree is None:
+            with self._lock:
+                if self._rtree is None:
+                    self._rtree = PackedRTree(self.bboxes)
+
+        return self._rtree.search(bbox)
+
+    def position(self, identifier):
+        """
+        Get the position of a feature by id
+
+        :param identifier: feature id
+
+        :returns: feature position, or `None` if not found
+        """
+
+        if self._positions is None:
+            with self._lock:
+                if self._positions is None:
+                    positions = {}
+                    for i, id_ in enumerate(self.ids):
+                        positions.setdefault(id_, i)
+                    self._positions = positions
+
+        return self._positions.get(str(identifier))
+
+    @classmethod
+    def build(cls, signature, entries):
+        """
+        Build an index
+
+        :param signature: `tuple` of source file mtime (ns) and size
+        :param entries: iterable of `tuple` of start, end byte offsets,
+                        id and bbox (or `None`) of each feature
+
+        :returns: `pygeoapi.provider.file_index.FeatureIndex`
+        """
+
+        offsets = array('Q')
+        lengths = array('Q')
+        ids = []
+        envelopes = []
+
+        for start, end, id_, bbox in entries:
+            offsets.append(start)
+            lengths.append(end - start)
+            ids.append(str(id_))
+            envelopes.append(bbox)
+
+        bboxes = pack_envelopes(envelopes)
+
+        return cls(signature, offsets, lengths, ids, bboxes)
+
+    def dump(self, filename):
+        """
+        Persist index to a file
+
+        :param filename: index filename
+
+        :returns: void
+        """
+
+        header = {
+            'version': INDEX_VERSION,
+            'byteorder': sys.byteorder,
+            'signature': list(self.signature),
+            'count': len(self)
+        }
+
+        tmp_filename = '{}.{}.tmp'.format(filename, os.getpid())
+        with open(tmp_filename, 'wb') as fh:
+            fh.write(json.dumps(header).encode('utf-8'))
+            fh.write(b'\n')
+            self.offsets.tofile(fh)
+            self.lengths.tofile(fh)
+            self.bboxes.tofile(fh)
+            fh.write('\0'.join(self.ids).encode('utf-8'))
+        os.replace(tmp_filename, filename)
+
+    @classmethod
+    def load(cls, filename, signature=None):
+        """
+        Load index from a file
+
+        :param filename: index filename
+        :param signature: expected source file signature
+
+        :returns: `pygeoapi.provider.file_index.FeatureIndex`, or `None`
+                  if the index is missing, invalid or out of date
+        """
+
+        try:
+            with open(filename, 'rb') as fh:
+                header = json.loads(fh.readline())
+                if any([header.get('version') != INDEX_VERSION,
+                        header.get('byteorder') != sys.byteorder,
+                        signature is not None and
+                        tuple(header.get('signature', [])) != signature]):
+                    LOGGER.debug('Index {} out of date'.format(filename))
+                    return None
+
+                count = header['count']
+                offsets = array('Q')
+                offsets.fromfile(fh, count)
+                lengths = array('Q')
+                lengths.fromfile(fh, count)
+                bboxes = array('d')
+                bboxes.fromfile(fh, count * 4)
+                ids = fh.read().decode('utf-8').split('\0') if count else []
+        except (OSError, EOFError, ValueError, KeyError) as err:
+            LOGGER.debug('Cannot load index {}: {}'.format(filename, err))
+            return None
+
+        if len(ids) != count:
+            LOGGER.debug('Invalid index {}'.format(filename))
+            return None
+
+        return cls(tuple(header['signature']), offsets, lengths, ids, bboxes)
+
+
+class FeatureIndexCache:
+    """
+    In-memory copy of the sidecar index of a file, (re)building the
+    index when the file has changed
+    """
+
+    def __init__(self, filename, builder, index_filename=None):
+        """
+        Initialize object
+
+        :param filename: source filename
+        :param builder: function taking the memory-mapped source file
+                        and returning an iterable of `tuple` of start,
+                        end byte offsets, id and bbox of each feature
+        :param index_filename: sidecar index filename (default is
+                               source filename + `.idx`)
+
+        :returns: `pygeoapi.provider.file_index.FeatureIndexCache`
+        """
+
+        self.filename = filename
+        self.builder = builder
+        self.index_filename = index_filename or '{}{}'.format(
+            filename, INDEX_SUFFIX)
+        self._index = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        """
+        Get the index of the source file, loading or (re)building it
+        if required
+
+        :returns: `pygeoapi.provider.file_index.FeatureIndex`
+        """
+
+        signature = get_file_signature(self.filename)
+
+        index = self._index
+        if index is not None and index.signature == signature:
+            return index
+
+        with self._lock:
+            index = self._index
+            if index is None or index.signature != signature:
+                index = FeatureIndex.load(self.index_filename, signature)
+                if index is None:
+                    index = self._build(signature)
+                self._index = index
+
+        return index
+
+    def _build(self, signature):
+        """
+        Build the index of the source file and persist it
+
+        :param signature: source file signature
+
+        :returns: `pygeoapi.provider.file_index.FeatureIndex`
+        """
+
+        LOGGER.debug('Building index of {}'.format(self.filename))
+        with open_mmap(self.filename) as buf:
+            index = FeatureIndex.build(signature, self.builder(buf))
+
+        try:
+            index.dump(self.index_filename)
+        except OSError as err:
+            LOGGER.warning('Cannot write index {}: {}'.format(
+                self.index_filename, err))
+
+        return index
+
+    def invalidate(self):
+        """
+        Drop the in-memory index
+
+        :returns: void
+        """
+
+        self._index = None
+
+
+def pack_envelopes(envelopes):
+    """
+    Pack feature envelopes into a flat array
+
+    :param envelopes: iterable of `tuple` of minx, miny, maxx, maxy
+                      (or `None`) of each feature
+
+    :returns: `array` of minx, miny, maxx, maxy of each feature
+              (NaN if `None`)
+    """
+
+    bboxes = array('d')
+    for envelope in envelopes:
+        bboxes.extend(envelope or (NaN, NaN, NaN, NaN))
+    return bboxes
+
+
+def select_envelopes(bboxes, bbox):
+    """
+    Select the features whose envelope intersects a bbox
+    (vectorized when numpy is available)
+
+    :param bboxes: `array` of minx, miny, maxx, maxy of each feature
+    :param bbox: `tuple` of minx, miny, maxx, maxy
+
+    :returns: `list` of positions of the matching features
+    """
+
+    minx, miny, maxx, maxy = bbox
+
+    if np is not None:
+        envelopes = np.frombuffer(bboxes, dtype=np.float64).reshape(-1, 4)
+        mask = ((envelopes[:, 0] <= maxx) & (envelopes[:, 2] >= minx) &
+                (envelopes[:, 1] <= maxy) & (envelopes[:, 3] >= miny))
+        return np.flatnonzero(mask).tolist()
+
+    return [i for i in range(len(bboxes) // 4)
+            if bboxes[i * 4] <= maxx and bboxes[i * 4 + 2] >= minx and
+            bboxes[i * 4 + 1] <= maxy and bboxes[i * 4 + 3] >= miny]
+
+
+def select_range(values, begin=None, end=None, positions=None):
+    """
+    Select the features whose value is within a range
+    (vectorized when numpy is available)
+
+    :param values: `array` of the value of each feature (NaN if null)
+    :param begin: lower bound (included, `None` if open)
+    :param end: upper bound (included, `None` if open)
+    :param positions: `list` of positions of the features to consider
+                      (default all)
+
+    :returns: `list` of positions of the matching features
+    """
+
+    if begin is None:
+        begin = float('-inf')
+    if end is None:
+        end = float('inf')
+
+    if np is not None:
+        values = np.frombuffer(values, dtype=np.float64)
+        if positions is None:
+            return np.flatnonzero((values >= begin) &
+                                  (values <= end)).tolist()
+        positions = np.asarray(positions, dtype=np.intp)
+        selected = values[positions]
+        return positions[(selected >= begin) & (selected <= end)].tolist()
+
+    if positions is None:
+        positions = range(len(values))
+    return [i for i in positions if begin <= values[i] <= end]
+
+
+def get_file_signature(filename):
+    """
+    helper function to get the signature (modification time and size)
+    of a file
+
+    :param filename: filename
+
+    :returns: `tuple` of mtime (ns) and size, or `None` if missing
+    """
+
+    try:
+        st = os.stat(filename)
+        return st.st_mtime_ns, st.st_size
+    except OSError:
+        return None
+
+
+@contextmanager
+def open_mmap(filename):
+    """
+    Memory-map a file for reading
+
+    :param filename: filename
+
+    :returns: `mmap.mmap` (empty `bytes` if file is missing or empty)
+    """
+
+    if not os.path.exists(filename) or os.path.getsize(filename) == 0:
+        yield b''
+        return
+
+    with open(filename, 'rb') as fh:
+        buf = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        yield buf
+    finally:
+        buf.close()
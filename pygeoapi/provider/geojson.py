@@ -27,17 +27,44 @@
 #
 # =================================================================
 
+from array import array
+import collections
+import heapq
+import itertools
 import json
 import logging
 import os
+import re
+import threading
 import uuid
 
-from pygeoapi.provider.base import BaseProvider, ProviderItemNotFoundError
+from pygeoapi.provider.base import (BaseProvider, ProviderQueryError,
+                                    ProviderItemNotFoundError)
+from pygeoapi.provider.file_index import (NaN, FeatureIndexCache,
+                                          get_file_signature, open_mmap,
+                                          pack_envelopes, select_envelopes,
+                                          select_range)
+from pygeoapi.provider.packed_features import PackedFeatureList
+from pygeoapi.provider.packed_rtree import IndexedFeatureList, PackedRTree
 from pygeoapi.plugin import load_plugin
 from pygeoapi.cql_exception import CQLException
+from pygeoapi.util import (get_bbox_2d, get_datetime_interval,
+                           get_envelope, get_sort_key, get_timestamp,
+                           get_typed_value)
 
 LOGGER = logging.getLogger(__name__)
 
+# JSON tokens relevant to locate the top-level 'features' array
+_TOKEN = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"|[{}\[\]:]')
+# JSON tokens relevant to delimit an object (coordinates have no braces)
+_OBJECT_TOKEN = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"|[{}]')
+_SEPARATOR = re.compile(rb'\s*([,\]])\s*')
+_WHITESPACE = re.compile(rb'\s*')
+_PLAIN_ID = re.compile(rb'^[\w.:-]+$')
+
+#: number of features evaluated at once by filters in streaming mode
+STREAM_BATCH_SIZE = 1000
+
 
 class GeoJSONProvider(BaseProvider):
     """Provider class backed by local GeoJSON files
@@ -48,6 +75,24 @@ class GeoJSONProvider(BaseProvider):
     at the expense of performance
     (no indexing, full serialization roundtrip on each request)
 
+    Setting ``cache: true`` in the provider definition keeps the parsed
+    file in memory (with an id index and packed feature envelopes and
+    timestamps for bbox and datetime queries), reloading it only when the
+    file modification time or size changes
+
+    Setting ``cache: packed`` keeps a compact copy instead (coordinates in
+    flat arrays, interned property names and string values), rebuilding
+    features on access: less memory, and when preloaded before forking
+    worker processes, shared between them
+
+    Setting ``stream: true`` reads the file feature by feature from a
+    memory-mapped file instead, only deserializing the features needed
+    to answer a request (bounded memory for very large files)
+
+    Setting ``index: true`` additionally persists a sidecar index (`.idx`)
+    of the byte offset, id and bbox of each feature, so that pages and
+    items are read directly at their offset
+
     Not thread safe, a single server process is assumed
 
     This implementation uses the feature 'id' heavily
@@ -55,7 +100,6 @@ class GeoJSONProvider(BaseProvider):
     The feature 'properties' will be preserved.
 
     TODO:
-    * query method should take bbox
     * instead of methods returning FeatureCollections,
     we should be yielding Features and aggregating in the view
     * there are strict id semantics; all features in the input GeoJSON file
@@ -68,6 +112,14 @@ class GeoJSONProvider(BaseProvider):
         """initializer"""
 
         BaseProvider.__init__(self, provider_def)
+        self.cache = provider_def.get('cache', False)
+        self.stream = provider_def.get('stream', False)
+        self.index = None
+        if provider_def.get('index', False):
+            self.stream = True
+            self.index = FeatureIndexCache(self.data, self._index_features)
+        self._cache = None
+        self._cache_lock = threading.Lock()
         self.fields = self.get_fields()
 
     def get_fields(self):
@@ -79,8 +131,17 @@ class GeoJSONProvider(BaseProvider):
 
         LOGGER.debug('Treating all columns as string types')
         if os.path.exists(self.data):
-            with open(self.data) as src:
-                data = json.loads(src.read())
+            if self.stream:
+                with open_mmap(self.data) as buf:
+                    span = next(iter_feature_spans(buf), None)
+                    if span is None:
+                        return {}
+                    data = {'features': [self._decode(buf, *span)]}
+            elif self.cache:
+                data = self._get_cache()['data']
+            else:
+                with open(self.data) as src:
+                    data = json.loads(src.read())
             fields = {}
             for f in data['features'][0]['properties'].keys():
                 fields[f] = 'string'
@@ -110,6 +171,358 @@ class GeoJSONProvider(BaseProvider):
                 i['id'] = i['properties'][self.id_field]
         return data
 
+    def _get_cache(self):
+        """
+        Get the in-memory copy of the source GeoJSON file, (re)loading
+        it if the file has changed since it was last loaded
+
+        :returns: `dict` of parsed data (`data`), feature id index
+                  (`index`), packed feature envelopes (`envelopes`)
+                  and timestamps (`timestamps`), R-tree of the envelopes
+                  (`rtree`), spatially indexed features (`features`)
+                  and file signature (`stat`)
+        """
+
+        stat = get_file_signature(self.data)
+
+        cache = self._cache
+        if cache is not None and cache['stat'] == stat:
+            return cache
+
+        with self._cache_lock:
+            cache = self._cache
+            if cache is None or cache['stat'] != stat:
+                LOGGER.debug('(Re)loading {}'.format(self.data))
+                data = self._load()
+                index = {}
+                for i, feature in enumerate(data['features']):
+                    index.setdefault(str(feature.get('id')), i)
+                envelopes = pack_envelopes(
+                    get_envelope(feature.get('geometry'))
+                    for feature in data['features'])
+                rtree = PackedRTree(envelopes)
+                timestamps = self._pack_timestamps(data['features'])
+                if self.cache == 'packed':
+                    features = PackedFeatureList(data['features'], rtree)
+                    data = {key: value for key, value in data.items()
+                            if key != 'features'}
+                    data['features'] = features
+                else:
+                    features = IndexedFeatureList(data['features'], rtree)
+                cache = {
+                    'stat': stat,
+                    'data': data,
+                    'index': index,
+                    'envelopes': envelopes,
+                    'rtree': rtree,
+                    'features': features,
+                    'timestamps': timestamps
+                }
+                self._cache = cache
+
+        return cache
+
+    def preload(self):
+        """
+        Load the in-memory copy (``cache``) or the index (``index``) of
+        the source GeoJSON file ahead of requests
+
+        :returns: void
+        """
+
+        if self.index:
+            self.index.get().search((0, 0, 0, 0))
+        elif self.cache:
+            self._get_cache()
+
+    def _pack_timestamps(self, features):
+        """
+        Pack the timestamps (`time_field`) of features into a flat array
+
+        :param features: `list` of GeoJSON features
+
+        :returns: `array` of POSIX timestamps (NaN if null or invalid)
+        """
+
+        timestamps = array('d')
+        if self.time_field is not None:
+            for feature in features:
+                timestamp = get_timestamp(
+                    (feature['properties'] or {}).get(self.time_field))
+                timestamps.append(NaN if timestamp is None else timestamp)
+        return timestamps
+
+    def _decode(self, buf, start, end):
+        """
+        Deserialize a single feature of the source GeoJSON file
+
+        :param buf: memory-mapped source GeoJSON file
+        :param start: start byte offset of the feature
+        :param end: end byte offset of the feature
+
+        :returns: `dict` of GeoJSON feature
+        """
+
+        feature = json.loads(buf[start:end])
+        if 'id' not in feature and self.id_field in feature['properties']:
+            feature['id'] = feature['properties'][self.id_field]
+        return feature
+
+    def _index_features(self, buf):
+        """
+        Index builder of the source GeoJSON file
+
+        :param buf: memory-mapped source GeoJSON file
+
+        :returns: generator of `tuple` of start, end byte offsets, id
+                  and bbox of each feature
+        """
+
+        for start, end in iter_feature_spans(buf):
+            feature = self._decode(buf, start, end)
+            yield (start, end, feature.get('id'),
+                   get_envelope(feature.get('geometry')))
+
+    def _cql_filter(self, feature_list, cql_expression):
+        """
+        Apply a CQL filter expression to a list of features
+
+        :param feature_list: `list` of GeoJSON features
+        :param cql_expression: string of filter expression
+
+        :returns: `list` of matching GeoJSON features
+        """
+
+        try:
+            cql_handler = load_plugin('extensions',
+                                      {'name': 'CQL',
+                                       'cql_expression': cql_expression,
+                                       'feature_list': feature_list})
+            return cql_handler.cql_filter()
+        except Exception as err:
+            raise CQLException(err)
+
+    def _feature_filter(self, bbox=[], datetime_=None, properties=[]):
+        """
+        Build a predicate matching features against query filters
+
+        :param bbox: bounding box [minx,miny,maxx,maxy]
+        :param datetime_: temporal (datestamp or extent)
+        :param properties: list of tuples (name, value)
+
+        :returns: function taking a GeoJSON feature and returning whether
+                  it matches, or `None` if there are no filters
+        """
+
+        predicates = []
+
+        if bbox:
+            minx, miny, maxx, maxy = get_bbox_2d(bbox)
+
+            def in_bbox(feature):
+                envelope = get_envelope(feature.get('geometry'))
+                return (envelope is not None and
+                        envelope[0] <= maxx and envelope[2] >= minx and
+                        envelope[1] <= maxy and envelope[3] >= miny)
+
+            predicates.append(in_bbox)
+
+        if datetime_ is not None:
+            begin, end = self._get_datetime_interval(datetime_)
+
+            def in_interval(feature):
+                timestamp = get_timestamp(
+                    (feature['properties'] or {}).get(self.time_field))
+                return (timestamp is not None and
+                        (begin is None or timestamp >= begin) and
+                        (end is None or timestamp <= end))
+
+            predicates.append(in_interval)
+
+        if properties:
+            typed_properties = [(name, get_typed_value(value))
+                                for name, value in properties]
+
+            def has_properties(feature):
+                for name, value in typed_properties:
+                    feature_value = (feature['properties'] or {}).get(name)
+                    if isinstance(feature_value, str):
+                        feature_value = get_typed_value(feature_value)
+                    if feature_value != value:
+                        return False
+                return True
+
+            predicates.append(has_properties)
+
+        if not predicates:
+            return None
+        if len(predicates) == 1:
+            return predicates[0]
+        return lambda feature: all(predicate(feature)
+                                   for predicate in predicates)
+
+    def _get_datetime_interval(self, datetime_):
+        """
+        Parse a datetime query parameter, checking that the provider
+        has a time field
+
+        :param datetime_: temporal (datestamp or extent)
+
+        :returns: `tuple` of begin and end POSIX timestamps
+        """
+
+        if self.time_field is None:
+            LOGGER.error('time_field not enabled for collection')
+            raise ProviderQueryError()
+
+        return get_datetime_interval(datetime_)
+
+    def _sort_key(self, sortby):
+        """
+        Get a key function ordering features according to sortby
+
+        :param sortby: list of dicts (property, order)
+
+        :returns: function taking a GeoJSON feature and returning its
+                  sort key
+        """
+
+        key = get_sort_key(sortby)
+
+        def feature_key(feature):
+            properties = feature['properties'] or {}
+            if 'id' not in properties:
+                properties = dict(properties, id=feature.get('id'))
+            return key(properties)
+
+        return feature_key
+
+    def _query_stream(self, startindex=0, limit=10, resulttype='results',
+                      bbox=[], datetime_=None, properties=[], sortby=[],
+                      cql_expression=None):
+        """
+        query the provider in streaming mode: features are deserialized
+        one at a time and scanning stops once the requested page is
+        complete (numberMatched is only reported for hits, for sorted
+        results, or when an index can answer the query)
+
+        :param startindex: starting record to return (default 0)
+        :param limit: number of records to return (default 10)
+        :param resulttype: return results or hit limit (default results)
+        :param bbox: bounding box [minx,miny,maxx,maxy]
+        :param datetime_: temporal (datestamp or extent)
+        :param properties: list of tuples (name, value)
+        :param sortby: list of dicts (property, order)
+        :param cql_expression: string of filter expression
+
+        :returns: FeatureCollection dict of 0..n GeoJSON features
+        """
+
+        feature_collection = {
+            'type': 'FeatureCollection',
+            'features': []
+        }
+        end_index = startindex + limit
+
+        try:
+            index = self.index.get() if self.index else None
+
+            with open_mmap(self.data) as buf:
+                if index is not None and bbox:
+                    # the indexed envelopes answer the bbox filter
+                    positions = index.search(get_bbox_2d(bbox))
+                    spans = [index.span(i) for i in positions]
+                    bbox = []
+                elif index is not None:
+                    spans = index.spans()
+                else:
+                    spans = iter_feature_spans(buf)
+
+                predicate = self._feature_filter(bbox, datetime_,
+                                                 properties)
+
+                if predicate is None and not cql_expression:
+                    if isinstance(spans, list):
+                        feature_collection['numberMatched'] = len(spans)
+                    elif index is not None:
+                        feature_collection['numberMatched'] = len(index)
+                    elif resulttype == 'hits' or sortby:
+                        spans = list(spans)
+                        feature_collection['numberMatched'] = len(spans)
+
+                    if resulttype == 'hits':
+                        return feature_collection
+
+                    if not sortby:
+                        if isinstance(spans, list):
+                            spans = spans[startindex:end_index]
+                        elif index is not None:
+                            spans = index.spans(startindex, end_index)
+                        else:
+                            spans = itertools.islice(spans, startindex,
+                                                     end_index)
+                        features = [self._decode(buf, *span)
+                                    for span in spans]
+                        feature_collection['features'] = features
+                        feature_collection['numberReturned'] = len(
+                            features)
+                        return feature_collection
+
+                # count matching features as they are consumed
+                matched = itertools.count()
+                features = (
+                    feature for feature in self._iter_stream(
+                        buf, spans, predicate, cql_expression)
+                    if next(matched) is not None)
+
+                if resulttype == 'hits':
+                    collections.deque(features, maxlen=0)
+                    feature_collection['numberMatched'] = next(matched)
+                    return feature_collection
+
+                if sortby:
+                    # bounded heap: only the top features are kept
+                    features = heapq.nsmallest(
+                        end_index, features, key=self._sort_key(sortby))
+                    features = features[startindex:]
+                    feature_collection['numberMatched'] = next(matched)
+                else:
+                    features = list(itertools.islice(features, startindex,
+                                                     end_index))
+        except ValueError as err:
+            LOGGER.error('Invalid GeoJSON {}: {}'.format(self.data, err))
+            raise ProviderQueryError(err)
+
+        feature_collection['features'] = features
+        feature_collection['numberReturned'] = len(features)
+
+        return feature_collection
+
+    def _iter_stream(self, buf, spans, predicate=None, cql_expression=None):
+        """
+        Deserialize and filter features in batches
+
+        :param buf: memory-mapped source GeoJSON file
+        :param spans: iterable of (start, end) byte offsets of features
+        :param predicate: function matching features (optional)
+        :param cql_expression: string of filter expression (optional)
+
+        :returns: generator of matching GeoJSON features
+        """
+
+        spans = iter(spans)
+
+        while True:
+            batch = [self._decode(buf, *span)
+                     for span in itertools.islice(spans, STREAM_BATCH_SIZE)]
+            if not batch:
+                return
+            if predicate is not None:
+                batch = [feature for feature in batch if predicate(feature)]
+            if cql_expression and batch:
+                batch = self._cql_filter(batch, cql_expression)
+            yield from batch
+
     def query(self, startindex=0, limit=10, resulttype='results',
               bbox=[], datetime=None, properties=[], sortby=[],
               cql_expression=None):
@@ -128,30 +541,66 @@ class GeoJSONProvider(BaseProvider):
         :returns: FeatureCollection dict of 0..n GeoJSON features
         """
 
-        # TODO filter by bbox without resorting to third-party libs
-        data = self._load()
-
-        if cql_expression:
-            try:
-                feature_list = data['features']
+        if self.stream:
+            return self._query_stream(startindex, limit, resulttype,
+                                      bbox, datetime, properties, sortby,
+                                      cql_expression)
 
-                cql_handler = load_plugin('extensions',
-                                          {'name': 'CQL',
-                                           'cql_expression': cql_expression,
-                                           'feature_list': feature_list})
-                feature_list = cql_handler.cql_filter()
-            except Exception as err:
-                raise CQLException(err)
+        if self.cache:
+            cache = self._get_cache()
+            # shallow copy, the cached data is shared across requests
+            data = dict(cache['data'])
+        else:
+            cache = None
+            data = self._load()
+
+        features = data['features']
+        positions = None
+
+        if bbox:
+            if cache is not None:
+                positions = cache['rtree'].search(get_bbox_2d(bbox))
+            else:
+                envelopes = pack_envelopes(
+                    get_envelope(f.get('geometry')) for f in features)
+                positions = select_envelopes(envelopes, get_bbox_2d(bbox))
+
+        if datetime is not None:
+            begin, end = self._get_datetime_interval(datetime)
+            if cache is not None:
+                timestamps = cache['timestamps']
+            else:
+                timestamps = self._pack_timestamps(features)
+            positions = select_range(timestamps, begin, end, positions)
+
+        predicate = self._feature_filter(properties=properties)
+
+        if positions is not None:
+            features = [features[i] for i in positions]
+        elif cache is not None and predicate is None:
+            # CQL spatial filters can use the R-tree of the whole dataset
+            features = cache['features']
+
+        if predicate is not None:
+            features = [f for f in features if predicate(f)]
 
-            data['features'] = feature_list
+        if cql_expression:
+            features = self._cql_filter(features, cql_expression)
 
-        data['numberMatched'] = len(data['features'])
+        data['numberMatched'] = len(features)
 
         if resulttype == 'hits':
             data['features'] = []
-        else:
-            data['features'] = data['features'][startindex:startindex + limit]
-            data['numberReturned'] = len(data['features'])
+            return data
+
+        if sortby:
+            features = heapq.nsmallest(startindex + limit, features,
+                                       key=self._sort_key(sortby))
+
+        data['features'] = features[startindex:startindex + limit]
+        if self.cache:
+            data['features'] = [dict(f) for f in data['features']]
+        data['numberReturned'] = len(data['features'])
 
         return data
 
@@ -164,6 +613,19 @@ class GeoJSONProvider(BaseProvider):
         :returns: dict of single GeoJSON feature
         """
 
+        if self.stream:
+            return self._get_stream(identifier)
+
+        if self.cache:
+            cache = self._get_cache()
+            try:
+                i = cache['index'][str(identifier)]
+                return dict(cache['data']['features'][i])
+            except KeyError:
+                err = 'item {} not found'.format(identifier)
+                LOGGER.error(err)
+                raise ProviderItemNotFoundError(err)
+
         all_data = self._load()
         # if matches
         for feature in all_data['features']:
@@ -174,6 +636,47 @@ class GeoJSONProvider(BaseProvider):
         LOGGER.error(err)
         raise ProviderItemNotFoundError(err)
 
+    def _get_stream(self, identifier):
+        """
+        query the provider by id in streaming mode
+
+        :param identifier: feature id
+
+        :returns: dict of single GeoJSON feature
+        """
+
+        needle = str(identifier).encode('utf-8')
+        # a plain identifier appears verbatim in the feature, which
+        # allows to skip deserializing non-matching features
+        plain = _PLAIN_ID.match(needle) is not None
+
+        try:
+            if self.index:
+                index = self.index.get()
+                i = index.position(identifier)
+                if i is not None:
+                    with open_mmap(self.data) as buf:
+                        return self._decode(buf, *index.span(i))
+
+                err = 'item {} not found'.format(identifier)
+                LOGGER.error(err)
+                raise ProviderItemNotFoundError(err)
+
+            with open_mmap(self.data) as buf:
+                for start, end in iter_feature_spans(buf):
+                    if plain and buf.find(needle, start, end) == -1:
+                        continue
+                    feature = self._decode(buf, start, end)
+                    if str(feature.get('id')) == str(identifier):
+                        return feature
+        except ValueError as err:
+            LOGGER.error('Invalid GeoJSON {}: {}'.format(self.data, err))
+            raise ProviderQueryError(err)
+
+        err = 'item {} not found'.format(identifier)
+        LOGGER.error(err)
+        raise ProviderItemNotFoundError(err)
+
     def create(self, new_feature):
         """Create a new feature
 
@@ -190,6 +693,7 @@ class GeoJSONProvider(BaseProvider):
 
         with open(self.data, 'w') as dst:
             dst.write(json.dumps(all_data))
+        self._cache = None
 
     def update(self, identifier, new_feature):
         """Updates an existing feature id with new_feature
@@ -210,6 +714,7 @@ class GeoJSONProvider(BaseProvider):
                     all_data['features'][i] = new_feature
         with open(self.data, 'w') as dst:
             dst.write(json.dumps(all_data))
+        self._cache = None
 
     def delete(self, identifier):
         """Deletes an existing feature
@@ -227,6 +732,92 @@ class GeoJSONProvider(BaseProvider):
                     all_data['features'].pop(i)
         with open(self.data, 'w') as dst:
             dst.write(json.dumps(all_data))
+        self._cache = None
 
     def __repr__(self):
         return '<GeoJSONProvider> {}'.format(self.data)
+
+
+def iter_feature_spans(buf):
+    """
+    Iterate over the features of a GeoJSON FeatureCollection without
+    deserializing them
+
+    :param buf: bytes-like object (e.g. `mmap.mmap`) of a GeoJSON
+                FeatureCollection
+
+    :returns: generator of (start, end) byte offsets of each feature
+    """
+
+    pos = _find_features_array(buf)
+    if pos is None or buf[pos:pos + 1] == b']':
+        return
+
+    while True:
+        if buf[pos:pos + 1] != b'{':
+            raise ValueError('Expected feature at byte {}'.format(pos))
+
+        end = _find_object_end(buf, pos)
+        yield pos, end
+
+        m = _SEPARATOR.match(buf, end)
+        if m is None:
+            raise ValueError('Expected , or ] at byte {}'.format(end))
+        if m.group(1) == b']':
+            return
+        pos = m.end()
+
+
+def _find_features_array(buf):
+    """
+    Helper function to locate the top-level 'features' array
+
+    :param buf: bytes-like object of a GeoJSON FeatureCollection
+
+    :returns: byte offset of the first feature, or `None`
+    """
+
+    depth = 0
+    key = None
+    last_string = None
+
+    for m in _TOKEN.finditer(buf):
+        c = buf[m.start()]
+        if c == 0x22:  # "
+            if depth == 1:
+                last_string = m
+        elif c == 0x3a:  # :
+            if depth == 1:
+                key = buf[last_string.start():last_string.end()]
+        elif c == 0x5b and depth == 1 and key == b'"features"':  # [
+            return _WHITESPACE.match(buf, m.end()).end()
+        elif c in (0x7b, 0x5b):  # { [
+            depth += 1
+        else:  # } ]
+            depth -= 1
+
+    return None
+
+
+def _find_object_end(buf, pos):
+    """
+    Helper function to find the end of the JSON object starting at pos
+
+    :param buf: bytes-like object
+    :param pos: byte offset of the opening brace
+
+    :returns: byte offset following the closing brace
+    """
+
+    depth = 0
+
+    for m in _OBJECT_TOKEN.finditer(buf, pos):
+        c = buf[m.start()]
+        if c == 0x7b:  # {
+            depth += 1
+        elif c == 0x7d:  # }
+            depth -= 1
+            if depth == 0:
+                return m.end()
+
+    raise ValueError('Unterminated object at byte {}'.format(pos))
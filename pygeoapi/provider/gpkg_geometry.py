@@ -0,0 +1,162 @@
+# =================================================================
+#
+# Authors: Tom Kralidis <tomkralidis@gmail.com>
+#
+# Copyright (c) 2020 Tom Kralidis
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# =================================================================
+
+"""Decoding of GeoPackage binary geometries to GeoJSON"""
+
+from array import array
+import logging
+import struct
+import sys
+
+LOGGER = logging.getLogger(__name__)
+
+#: GeoJSON type of each WKB geometry type code
+GEOMETRY_TYPES = {
+    1: 'Point',
+    2: 'LineString',
+    3: 'Polygon',
+    4: 'MultiPoint',
+    5: 'MultiLineString',
+    6: 'MultiPolygon',
+    7: 'GeometryCollection'
+}
+
+#: size (bytes) of the envelope of each envelope contents indicator
+ENVELOPE_SIZES = {0: 0, 1: 32, 2: 48, 3: 48, 4: 64}
+
+#: WKB byte order of the platform
+NATIVE_BYTE_ORDER = 1 if sys.byteorder == 'little' else 0
+
+
+def decode_gpkg_geometry(blob, precision=None):
+    """
+    Decode a GeoPackage binary geometry (header and WKB) to a GeoJSON
+    geometry, keeping Z but not M coordinates
+
+    :param blob: `bytes` of the GeoPackage geometry (or `None`)
+    :param precision: number of decimal digits to round coordinates to
+                      (default none)
+
+    :returns: `dict` of GeoJSON geometry, or `None` if null or empty
+    """
+
+    if blob is None:
+        return None
+
+    if blob[:2] != b'GP':
+        raise ValueError('Not a GeoPackage geometry')
+
+    flags = blob[3]
+    if flags & 0x20:
+        raise ValueError('Extended GeoPackage geometry')
+    if flags & 0x10:
+        return None
+
+    envelope_size = ENVELOPE_SIZES.get((flags >> 1) & 0x07)
+    if envelope_size is None:
+        raise ValueError('Invalid GeoPackage geometry envelope')
+
+    geometry, _ = decode_wkb(blob, 8 + envelope_size, precision)
+    return geometry
+
+
+def decode_wkb(buf, offset=0, precision=None):
+    """
+    Decode a WKB (ISO, or extended with Z/M/SRID flags) geometry to a
+    GeoJSON geometry, keeping Z but not M coordinates
+
+    :param buf: `bytes` containing the WKB geometry
+    :param offset: byte offset of the WKB geometry (default 0)
+    :param precision: number of decimal digits to round coordinates to
+                      (default none)
+
+    :returns: `tuple` of `dict` of GeoJSON geometry and byte offset of
+              the end of the WKB geometry
+    """
+
+    byte_order = buf[offset]
+    fmt = '<I' if byte_order == 1 else '>I'
+    code, = struct.unpack_from(fmt, buf, offset + 1)
+    offset += 5
+
+    if code & 0xe0000000:
+        has_z = bool(code & 0x80000000)
+        has_m = bool(code & 0x40000000)
+        if code & 0x20000000:
+            offset += 4  # SRID
+        code &= 0xffff
+    else:
+        dims, code = divmod(code, 1000)
+        has_z = dims in (1, 3)
+        has_m = dims in (2, 3)
+
+    type_ = GEOMETRY_TYPES.get(code)
+    if type_ is None:
+        raise ValueError('Unsupported WKB geometry type {}'.format(code))
+
+    dims = 2 + has_z + has_m
+    keep = 3 if has_z else 2
+
+    def points(count):
+        nonlocal offset
+        values = array('d')
+        end = offset + 8 * dims * count
+        values.frombytes(buf[offset:end])
+        offset = end
+        if byte_order != NATIVE_BYTE_ORDER:
+            values.byteswap()
+        values = values.tolist()
+        if precision is not None:
+            values = [round(value, precision) for value in values]
+        return [values[i:i + keep] for i in range(0, len(values), dims)]
+
+    def count():
+        nonlocal offset
+        value, = struct.unpack_from(fmt, buf, offset)
+        offset += 4
+        return value
+
+    if type_ == 'Point':
+        coordinates = points(1)[0]
+        if coordinates[0] != coordinates[0]:  # NaN: empty point
+            coordinates = []
+    elif type_ == 'LineString':
+        coordinates = points(count())
+    elif type_ == 'Polygon':
+        coordinates = [points(count()) for _ in range(count())]
+    else:
+        members = []
+        for _ in range(count()):
+            member, offset = decode_wkb(buf, offset, precision)
+            members.append(member)
+        if type_ == 'GeometryCollection':
+            return {'type': type_, 'geometries': members}, offset
+        coordinates = [member['coordinates'] for member in members]
+
+    return {'type': type_, 'coordinates': coordinates}, offset
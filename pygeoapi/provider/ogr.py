@@ -29,10 +29,13 @@
 #
 # =================================================================
 
+from collections import OrderedDict
 import functools
 import importlib
 import logging
 import os
+import threading
+import time
 from typing import Any
 
 from osgeo import gdal as osgeo_gdal
@@ -43,9 +46,21 @@ from pygeoapi.provider.base import (
     BaseProvider, ProviderGenericError,
     ProviderQueryError, ProviderConnectionError,
     ProviderItemNotFoundError)
+from pygeoapi.provider.file_index import get_file_signature
 
 LOGGER = logging.getLogger(__name__)
 
+#: default dataset handle cache settings (provider definition
+#: ``handle_cache``)
+HANDLE_CACHE_DEFAULTS = {
+    'lifetime': 300,
+    'max_handles': 8,
+    'timeout': 30
+}
+
+_DATASET_CACHES = {}
+_DATASET_CACHES_LOCK = threading.Lock()
+
 
 class OGRProvider(BaseProvider):
     """
@@ -102,6 +117,10 @@ class OGRProvider(BaseProvider):
 
             id_field: gml_id
             layer: rdinfo:stations
+            handle_cache:  # optional (false to disable)
+                lifetime: 300
+                max_handles: 8
+                timeout: 30
 
 
         :param provider_def: provider definition
@@ -180,6 +199,21 @@ class OGRProvider(BaseProvider):
         # Init driver and Source connection
         self.driver = None
         self.conn = None
+        self.layers = {}
+        self._handle = None
+
+        # Open datasets are kept per process and source, see DatasetCache
+        handle_cache = provider_def.get('handle_cache', {})
+        if handle_cache is False:
+            self.handle_cache = None
+        else:
+            self.handle_cache = dict(HANDLE_CACHE_DEFAULTS,
+                                     **(handle_cache or {}))
+
+        # Provider instances are shared across requests; the state of
+        # the source helper (paging, result set) is per instance, so
+        # serialize access to it
+        self._lock = threading.RLock()
 
         LOGGER.debug('Grabbing field information')
         self.fields = self.get_fields()
@@ -195,6 +229,26 @@ class OGRProvider(BaseProvider):
             msg = 'No Driver for Source: {}'.format(source_type)
             LOGGER.error(msg)
             raise Exception(msg)
+
+        if self.handle_cache and self.source_helper.reuse_dataset():
+            key = (source_type, self.data_def['source'],
+                   tuple(sorted(self._list_open_options())))
+            self._handle = get_dataset_cache().checkout(
+                key, self._open_dataset,
+                signature=get_file_signature(self.data_def['source']),
+                **self.handle_cache)
+            self.conn = self._handle['dataset']
+            self.layers = self._handle['layers']
+        else:
+            self._open_dataset()
+            self.layers = {}
+
+        # Always need to disable paging immediately after Open!
+        if self.source_capabilities['paging']:
+            self.source_helper.disable_paging()
+
+    def _open_dataset(self):
+        source_type = self.data_def['source_type']
         if self.open_options:
             try:
                 self.conn = self.gdal.OpenEx(
@@ -231,13 +285,22 @@ class OGRProvider(BaseProvider):
             LOGGER.error(msg)
             raise Exception(msg)
 
-        # Always need to disable paging immediately after Open!
-        if self.source_capabilities['paging']:
-            self.source_helper.disable_paging()
+        return self.conn
+
+    def _close(self, discard=False):
+        """
+        Release the dataset (returned to the dataset cache, unless
+        discarded, e.g. after an error)
+
+        :param discard: close the dataset even if cached (default False)
+        """
 
-    def _close(self):
         self.source_helper.close()
+        if self._handle is not None:
+            get_dataset_cache().checkin(self._handle, discard)
         self.conn = None
+        self.layers = {}
+        self._handle = None
         LOGGER.debug('closed self.conn')
 
         self.driver = None
@@ -247,7 +310,15 @@ class OGRProvider(BaseProvider):
             self._open()
 
         # Delegate getting Layer to SourceHelper
-        return self.source_helper.get_layer()
+        layer = self.source_helper.get_layer()
+
+        # Layers are reused: reset the filters and reading of the
+        # previous request
+        layer.SetSpatialFilter(None)
+        layer.SetAttributeFilter(None)
+        layer.ResetReading()
+
+        return layer
 
     def get_fields(self):
         """
@@ -277,9 +348,11 @@ class OGRProvider(BaseProvider):
 
         except RuntimeError as err:
             LOGGER.error(err)
+            self._close(discard=True)
             raise ProviderConnectionError(err)
         except Exception as err:
             LOGGER.error(err)
+            self._close(discard=True)
 
         finally:
             self._close()
@@ -302,6 +375,7 @@ class OGRProvider(BaseProvider):
         :returns: dict of 0..n GeoJSON features
         """
         result = None
+        self._lock.acquire()
         try:
             if self.source_capabilities['paging']:
                 self.source_helper.enable_paging(startindex, limit)
@@ -352,16 +426,19 @@ class OGRProvider(BaseProvider):
 
         except RuntimeError as err:
             LOGGER.error(err)
+            self._close(discard=True)
             raise ProviderQueryError(err)
         except ProviderConnectionError as err:
             LOGGER.error(err)
             raise ProviderConnectionError(err)
         except Exception as err:
             LOGGER.error(err)
+            self._close(discard=True)
             raise ProviderGenericError(err)
 
         finally:
             self._close()
+            self._lock.release()
 
         return result
 
@@ -374,6 +451,7 @@ class OGRProvider(BaseProvider):
         :returns: feature collection
         """
         result = None
+        self._lock.acquire()
         try:
             LOGGER.debug('Fetching identifier {}'.format(identifier))
             layer = self._get_layer()
@@ -386,6 +464,7 @@ class OGRProvider(BaseProvider):
 
         except RuntimeError as err:
             LOGGER.error(err)
+            self._close(discard=True)
             raise ProviderQueryError(err)
         except ProviderConnectionError as err:
             LOGGER.error(err)
@@ -395,10 +474,12 @@ class OGRProvider(BaseProvider):
             raise ProviderItemNotFoundError(err)
         except Exception as err:
             LOGGER.error(err)
+            self._close(discard=True)
             raise ProviderGenericError(err)
 
         finally:
             self._close()
+            self._lock.release()
 
         return result
 
@@ -550,9 +631,14 @@ class SourceHelper:
 
     def get_layer(self):
         """
-        Default action to get a Layer object from opened OGR Driver.
+        Default action to get a Layer object from opened OGR Driver
+        (reused while the dataset is open).
         :return:
         """
+        layer = self.provider.layers.get(self.provider.layer_name)
+        if layer is not None:
+            return layer
+
         layer = self.provider.conn.GetLayerByName(self.provider.layer_name)
 
         if not layer:
@@ -561,8 +647,20 @@ class SourceHelper:
             LOGGER.error(msg)
             raise Exception(msg)
 
+        self.provider.layers[self.provider.layer_name] = layer
         return layer
 
+    def reuse_dataset(self):
+        """
+        Whether an open dataset of the source can be reused, i.e. the
+        dataset does not depend on settings of the request applied
+        when opening it (OGR Driver-specific)
+
+        :returns: bool
+        """
+
+        return True
+
     def enable_paging(self, startindex=-1, limit=-1):
         """
         Enable paged access to dataset (OGR Driver-specific)
@@ -740,6 +838,25 @@ class WFSHelper(SourceHelper):
         :returns: pygeoapi.providers.ogr.SourceHelper
         """
         SourceHelper.__init__(self, provider)
+        self.paging = False
+
+    def close(self):
+        """
+        OGR Driver-specific handling of closing dataset.
+        Paging only applies to the dataset opened for the request.
+        """
+
+        self.paging = False
+
+    def reuse_dataset(self):
+        """
+        Whether an open dataset of the source can be reused: not when
+        paging, the WFS paging settings being read when opening
+
+        :returns: bool
+        """
+
+        return not self.paging
 
     def enable_paging(self, startindex=-1, limit=-1):
         """
@@ -750,6 +867,7 @@ class WFSHelper(SourceHelper):
         if startindex < 0:
             return
 
+        self.paging = True
         self.provider.gdal.SetConfigOption(
             'OGR_WFS_PAGING_ALLOWED', 'ON')
         self.provider.gdal.SetConfigOption(
@@ -768,6 +886,177 @@ class WFSHelper(SourceHelper):
             'OGR_WFS_PAGE_SIZE', None)
 
 
+class DatasetCache:
+    """
+    Thread safe cache of open OGR datasets, by source and open options,
+    so that headers, projections or capabilities are not read again for
+    each request.  A dataset is checked out by one thread at a time
+    (datasets must not be used by several threads at once) and returned
+    afterwards.  Datasets are reopened after ``lifetime`` seconds or
+    when the source file changes, and at most ``max_handles`` datasets
+    are open at once, the least recently used idle ones being closed
+    first.
+    """
+
+    def __init__(self):
+        """
+        Initialize object
+
+        :returns: pygeoapi.providers.ogr.DatasetCache
+        """
+
+        # idle datasets, least recently used first
+        self._idle = OrderedDict()  # id: handle
+        self._size = 0
+        self._cond = threading.Condition()
+
+    def checkout(self, key, open_dataset, signature=None, lifetime=None,
+                 max_handles=None, timeout=None):
+        """
+        Check out an open dataset, opening one if none is idle
+
+        :param key: source key (source type, source and open options)
+        :param open_dataset: function opening the dataset
+        :param signature: signature of the source file, if any
+        :param lifetime: seconds a dataset is reused (default forever)
+        :param max_handles: maximum number of datasets open at once
+                            (default unlimited)
+        :param timeout: seconds to wait for a dataset when the maximum
+                        is reached (default none)
+
+        :returns: `dict` of handle, with the OGR dataset and `dict` of
+                  its layers by name
+        """
+
+        deadline = time.monotonic() + (timeout or 0)
+        with self._cond:
+            while True:
+                handle = self._take(key)
+                if handle is not None:
+                    if handle['signature'] == signature and not (
+                            lifetime and time.monotonic() -
+                            handle['opened'] > lifetime):
+                        return handle
+                    LOGGER.debug('Closing expired OGR Source: {}'.format(
+                        key[1]))
+                    self._close(handle)
+                    continue
+
+                while max_handles and self._size >= max_handles and \
+                        self._idle:
+                    _, handle = self._idle.popitem(last=False)
+                    LOGGER.debug('Closing OGR Source: {}'.format(
+                        handle['key'][1]))
+                    self._close(handle)
+
+                if not max_handles or self._size < max_handles:
+                    self._size += 1
+                    break
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    msg = 'No OGR dataset available after {}s'.format(
+                        timeout)
+                    LOGGER.error(msg)
+                    raise ProviderConnectionError(msg)
+                self._cond.wait(remaining)
+
+        try:
+            dataset = open_dataset()
+        except BaseException:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+
+        return {
+            'key': key,
+            'dataset': dataset,
+            'layers': {},
+            'signature': signature,
+            'opened': time.monotonic()
+        }
+
+    def checkin(self, handle, discard=False):
+        """
+        Return a checked out dataset
+
+        :param handle: `dict` of handle (see `checkout`)
+        :param discard: close the dataset (default False)
+
+        :returns: void
+        """
+
+        with self._cond:
+            if discard:
+                self._close(handle)
+            else:
+                self._idle[id(handle)] = handle
+            self._cond.notify()
+
+    def datasets(self, source=None):
+        """
+        Get the idle datasets
+
+        :param source: OGR source (default all sources)
+
+        :returns: `list` of OGR datasets
+        """
+
+        with self._cond:
+            return [handle['dataset'] for handle in self._idle.values()
+                    if source is None or handle['key'][1] == source]
+
+    def _take(self, key):
+        """
+        Take the most recently used idle dataset of a source (to be
+        called with the cache lock held)
+
+        :param key: source key
+
+        :returns: `dict` of handle, or `None`
+        """
+
+        for id_ in reversed(self._idle):
+            if self._idle[id_]['key'] == key:
+                return self._idle.pop(id_)
+        return None
+
+    def _close(self, handle):
+        """
+        Close a dataset, once no longer referenced (to be called with
+        the cache lock held)
+
+        :param handle: `dict` of handle
+
+        :returns: void
+        """
+
+        self._size -= 1
+        # layers before their dataset
+        handle['layers'].clear()
+        handle['dataset'] = None
+
+
+def get_dataset_cache():
+    """
+    Get the process-wide dataset cache, creating it on first use
+    (datasets are not shared with forked processes)
+
+    :returns: `DatasetCache`
+    """
+
+    pid = os.getpid()
+    cache = _DATASET_CACHES.get(pid)
+    if cache is None:
+        with _DATASET_CACHES_LOCK:
+            cache = _DATASET_CACHES.get(pid)
+            if cache is None:
+                cache = DatasetCache()
+                _DATASET_CACHES[pid] = cache
+    return cache
+
+
 class GdalErrorHandler:
 
     def __init__(self):
@@ -0,0 +1,254 @@
+# =================================================================
+#
+# Authors: Tom Kralidis <tomkralidis@gmail.com>
+#
+# Copyright (c) 2020 Tom Kralidis
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# =================================================================
+
+"""Compact read-only storage of GeoJSON features"""
+
+from array import array
+from collections.abc import Sequence
+import logging
+import sys
+
+LOGGER = logging.getLogger(__name__)
+
+#: nesting depth of the coordinates of each geometry type
+COORDINATES_DEPTH = {
+    'Point': 0,
+    'LineString': 1,
+    'MultiPoint': 1,
+    'Polygon': 2,
+    'MultiLineString': 2,
+    'MultiPolygon': 3
+}
+
+#: members of a GeoJSON feature stored by the packed feature list
+FEATURE_MEMBERS = ('type', 'id', 'geometry', 'properties')
+
+
+class PackedGeometry:
+    """
+    GeoJSON geometry stored as a flat array of coordinates and an array
+    of the number of items at each nesting level (in depth-first order)
+    """
+
+    __slots__ = ('type', 'dims', 'coordinates', 'counts')
+
+    def __init__(self, type_, dims, coordinates, counts):
+        """
+        Initialize object
+
+        :param type_: geometry type
+        :param dims: number of dimensions of the positions
+        :param coordinates: `array` of coordinates
+        :param counts: `array` of the number of items of each list
+
+        :returns: `pygeoapi.provider.packed_features.PackedGeometry`
+        """
+
+        self.type = type_
+        self.dims = dims
+        self.coordinates = coordinates
+        self.counts = counts
+
+    @classmethod
+    def pack(cls, geometry):
+        """
+        Pack a GeoJSON geometry
+
+        :param geometry: `dict` of GeoJSON geometry
+
+        :returns: `pygeoapi.provider.packed_features.PackedGeometry`, or
+                  `None` if the geometry cannot be packed (geometry
+                  collections, mixed dimensions, non float coordinates,
+                  foreign members)
+        """
+
+        if not isinstance(geometry, dict) or \
+                set(geometry) != {'type', 'coordinates'}:
+            return None
+
+        depth = COORDINATES_DEPTH.get(geometry['type'])
+        if depth is None:
+            return None
+
+        coordinates = array('d')
+        counts = array('L')
+        dims = []
+
+        def flatten(items, depth):
+            if depth == 0:
+                if not dims:
+                    dims.append(len(items))
+                if len(items) != dims[0] or \
+                        not all(type(value) is float for value in items):
+                    raise ValueError('position cannot be packed')
+                coordinates.extend(items)
+                return
+            counts.append(len(items))
+            for item in items:
+                flatten(item, depth - 1)
+
+        try:
+            flatten(geometry['coordinates'], depth)
+        except (TypeError, ValueError):
+            return None
+
+        return cls(sys.intern(geometry['type']), dims[0] if dims else 0,
+                   coordinates, counts)
+
+    def unpack(self):
+        """
+        Rebuild the GeoJSON geometry
+
+        :returns: `dict` of GeoJSON geometry
+        """
+
+        coordinates = self.coordinates
+        counts = iter(self.counts)
+        dims = self.dims
+        position = 0
+
+        def unflatten(depth):
+            nonlocal position
+            if depth == 0:
+                start = position
+                position += dims
+                return coordinates[start:position].tolist()
+            return [unflatten(depth - 1) for _ in range(next(counts))]
+
+        return {
+            'type': self.type,
+            'coordinates': unflatten(COORDINATES_DEPTH[self.type])
+        }
+
+
+class PackedFeatureList(Sequence):
+    """
+    Read-only list of GeoJSON features stored compactly: coordinates in
+    flat arrays, property names shared between features with the same
+    schema and string values interned. Items are rebuilt as GeoJSON
+    features on access.
+
+    Memory is mostly held in buffers which are never written once
+    loaded, so that a list loaded before forking worker processes stays
+    shared (copy-on-write) between them.
+    """
+
+    def __init__(self, features, spatial_index=None):
+        """
+        Initialize object
+
+        :param features: iterable of GeoJSON features
+        :param spatial_index: index of the features, with a `search`
+                              method taking a bbox and returning feature
+                              positions
+
+        :returns: `pygeoapi.provider.packed_features.PackedFeatureList`
+        """
+
+        self.spatial_index = spatial_index
+        self._ids = []
+        self._keys = []
+        self._values = []
+        self._geometries = []
+        self._members = {}
+
+        schemas = {}
+        for feature in features:
+            properties = feature.get('properties')
+            if properties is None:
+                keys, values = None, None
+            else:
+                keys = tuple(sys.intern(key) for key in properties)
+                keys = schemas.setdefault(keys, keys)
+                values = tuple(intern_value(value)
+                               for value in properties.values())
+
+            geometry = feature.get('geometry')
+            packed = PackedGeometry.pack(geometry)
+
+            self._ids.append(intern_value(feature.get('id')))
+            self._keys.append(keys)
+            self._values.append(values)
+            self._geometries.append(geometry if packed is None else packed)
+
+            members = {key: value for key, value in feature.items()
+                       if key not in FEATURE_MEMBERS}
+            if members:
+                self._members[len(self._ids) - 1] = members
+
+        LOGGER.debug('Packed {} features ({} property schemas)'.format(
+            len(self._ids), len(schemas)))
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self._feature(j) for j in range(*i.indices(len(self)))]
+        return self._feature(range(len(self))[i])
+
+    def _feature(self, i):
+        """
+        Rebuild a GeoJSON feature
+
+        :param i: feature position
+
+        :returns: `dict` of GeoJSON feature
+        """
+
+        keys = self._keys[i]
+        geometry = self._geometries[i]
+        if isinstance(geometry, PackedGeometry):
+            geometry = geometry.unpack()
+
+        feature = {
+            'type': 'Feature',
+            'geometry': geometry,
+            'properties': None if keys is None else dict(
+                zip(keys, self._values[i]))
+        }
+        if self._ids[i] is not None:
+            feature['id'] = self._ids[i]
+        if i in self._members:
+            feature.update(self._members[i])
+        return feature
+
+
+def intern_value(value):
+    """
+    helper function to intern a property value if it is a string
+
+    :param value: property value
+
+    :returns: interned value
+    """
+
+    if isinstance(value, str):
+        return sys.intern(value)
+    return value
@@ -0,0 +1,173 @@
+# =================================================================
+#
+# Authors: Tom Kralidis <tomkralidis@gmail.com>
+#
+# Copyright (c) 2020 Tom Kralidis
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# =================================================================
+
+
+"""Static packed R-tree (Sort-Tile-Recursive) over feature envelopes"""
+
+from array import array
+import logging
+import math
+
+LOGGER = logging.getLogger(__name__)
+
+#: maximum number of children of a node
+NODE_SIZE = 16
+
+
+class PackedRTree:
+    """
+    Read-only R-tree over the envelopes of a dataset, bulk loaded with
+    the Sort-Tile-Recursive (STR) algorithm and stored as flat arrays of
+    node bounding boxes (one array per level)
+    """
+
+    def __init__(self, bboxes, node_size=NODE_SIZE):
+        """
+        Initialize object
+
+        :param bboxes: `array` (or sequence) of minx, miny, maxx, maxy of
+                       each feature (NaN for features without geometry,
+                       which are not indexed)
+        :param node_size: maximum number of children of a node
+
+        :returns: `pygeoapi.provider.packed_rtree.PackedRTree`
+        """
+
+        self.node_size = node_size
+
+        items = [i for i in range(len(bboxes) // 4)
+                 if not math.isnan(bboxes[i * 4])]
+
+        # STR: sort by x center, cut into vertical slices, and sort each
+        # slice by y center so that consecutive items are close
+        leaf_count = math.ceil(len(items) / node_size)
+        slice_size = math.ceil(math.sqrt(leaf_count)) * node_size
+
+        items.sort(key=lambda i: bboxes[i * 4] + bboxes[i * 4 + 2])
+        order = array('q')
+        for k in range(0, len(items), max(slice_size, 1)):
+            tile = items[k:k + slice_size]
+            tile.sort(key=lambda i: bboxes[i * 4 + 1] + bboxes[i * 4 + 3])
+            order.extend(tile)
+
+        level = array('d')
+        for i in order:
+            level.extend(bboxes[i * 4:i * 4 + 4])
+
+        self._order = order
+        self._levels = [level]
+
+        # parent nodes group consecutive children
+        while len(level) > node_size * 4:
+            parents = array('d')
+            for k in range(0, len(level), node_size * 4):
+                children = level[k:k + node_size * 4]
+                parents.extend((min(children[0::4]), min(children[1::4]),
+                                max(children[2::4]), max(children[3::4])))
+            self._levels.append(parents)
+            level = parents
+
+    def __len__(self):
+        return len(self._order)
+
+    @classmethod
+    def from_points(cls, x, y, node_size=NODE_SIZE):
+        """
+        Build a tree over points
+
+        :param x: sequence of x coordinates
+        :param y: sequence of y coordinates
+        :param node_size: maximum number of children of a node
+
+        :returns: `pygeoapi.provider.packed_rtree.PackedRTree`
+        """
+
+        bboxes = array('d')
+        for x_, y_ in zip(x, y):
+            bboxes.extend((x_, y_, x_, y_))
+
+        return cls(bboxes, node_size)
+
+    def search(self, bbox):
+        """
+        Find the features whose envelope intersects a bbox
+
+        :param bbox: `tuple` of minx, miny, maxx, maxy
+
+        :returns: `list` of feature positions (in ascending order)
+        """
+
+        minx, miny, maxx, maxy = bbox
+        node_size = self.node_size
+        levels = self._levels
+        results = []
+
+        top = len(levels) - 1
+        stack = [(top, 0, len(levels[top]) // 4)]
+
+        while stack:
+            level, first, last = stack.pop()
+            boxes = levels[level]
+            for node in range(first, last):
+                k = node * 4
+                if (boxes[k] > maxx or boxes[k + 1] > maxy or
+                        boxes[k + 2] < minx or boxes[k + 3] < miny):
+                    continue
+                if level == 0:
+                    results.append(self._order[node])
+                else:
+                    children = len(levels[level - 1]) // 4
+                    stack.append((level - 1, node * node_size,
+                                  min((node + 1) * node_size, children)))
+
+        results.sort()
+        return results
+
+
+class IndexedFeatureList(list):
+    """
+    List of GeoJSON features carrying a spatial index over their
+    envelopes, which allows in-memory CQL spatial filters to only test
+    candidate features
+    """
+
+    def __init__(self, features, spatial_index):
+        """
+        Initialize object
+
+        :param features: `list` of GeoJSON features
+        :param spatial_index: index of the features, with a `search`
+                              method taking a bbox and returning feature
+                              positions
+
+        :returns: `pygeoapi.provider.packed_rtree.IndexedFeatureList`
+        """
+
+        list.__init__(self, features)
+        self.spatial_index = spatial_index
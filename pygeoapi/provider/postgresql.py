@@ -43,26 +43,799 @@
 # gunzip < tests/data/hotosm_bdi_waterways.sql.gz |
 #  psql -U postgres -h 127.0.0.1 -p 5432 test
 
+import asyncio
+import base64
+import collections
+import hashlib
 import logging
 import json
+import os
+import re
+import threading
+import time
+import weakref
+
 import psycopg2
-from psycopg2.sql import SQL, Identifier, Literal
+from psycopg2.sql import SQL, Identifier, Placeholder
 from pygeoapi.provider.base import BaseProvider, \
-    ProviderConnectionError, ProviderQueryError, ProviderItemNotFoundError
+    ProviderConnectionError, ProviderInvalidQueryError, ProviderQueryError, \
+    ProviderItemNotFoundError
 from pygeoapi.cql_exception import CQLException
 from pygeoapi.plugin import load_plugin
+from pygeoapi.postgres_where_clauses import Parameter, get_parameters
+from pygeoapi.util import RawJSONList
 
 from psycopg2.extras import RealDictCursor
 
 LOGGER = logging.getLogger(__name__)
 
+#: default connection pool settings (provider definition ``pool``)
+POOL_DEFAULTS = {
+    'min_size': 1,  # idle connections kept open
+    'max_size': 10,  # connections open at once
+    'timeout': 30,  # seconds to wait for a connection
+    'max_idle': 300,  # seconds before closing an idle connection
+    'max_lifetime': 3600,  # seconds before recycling a connection
+    'check_interval': 30  # idle seconds before checking a connection
+}
+
+#: default time to live (seconds) of cached table columns
+COLUMNS_TTL = 300
+
+#: result columns of the previous and next ids of an item
+PREV_COLUMN = '_pygeoapi_prev'
+NEXT_COLUMN = '_pygeoapi_next'
+
+#: result column of GeoJSON features serialized by PostGIS
+FEATURE_COLUMN = '_pygeoapi_feature'
+
+#: maximum number of statements prepared on a connection
+PREPARED_MAX = 100
+
+#: default time limit (milliseconds) of exact counts with ``count: auto``
+COUNT_TIMEOUT = 1000
+
+_POOLS = {}
+_POOLS_LOCK = threading.Lock()
+
+_ASYNC_POOLS = weakref.WeakKeyDictionary()  # event loop: pools
+
+_COLUMNS = {}
+_COLUMNS_LOCK = threading.Lock()
+
+_COLUMNS_QUERY = SQL("""SELECT a.attname, t.typname, EXISTS (
+    SELECT 1 FROM pg_index i WHERE i.indrelid = a.attrelid
+    AND i.indisunique AND i.indnatts = 1 AND i.indkey[0] = a.attnum
+    AND i.indpred IS NULL) FROM pg_attribute a
+JOIN pg_type t ON t.oid = a.atttypid
+WHERE a.attrelid = quote_ident(%s)::regclass AND a.attnum > 0
+AND NOT a.attisdropped AND t.typname != 'geometry'
+ORDER BY a.attnum""")
+
+
+class BaseConnectionPool:
+    """
+    Bookkeeping of a pool of connections to a database: idle
+    connections, slots (connections open or being opened), creation
+    times and prepared statements. Connections are checked when they
+    have been idle for a while, and closed when idle or old.
+    """
+
+    def __init__(self, conn_dic, min_size=1, max_size=10, timeout=30,
+                 max_idle=300, max_lifetime=3600, check_interval=30):
+        """
+        Initialize object
+
+        :param conn_dic: `dict` of psycopg2 connection parameters
+        :param min_size: number of idle connections kept open
+        :param max_size: maximum number of connections open at once
+        :param timeout: seconds to wait for a connection
+        :param max_idle: seconds before closing an idle connection
+        :param max_lifetime: seconds before recycling a connection
+        :param check_interval: idle seconds before checking a
+                               connection on checkout
+
+        :returns: pygeoapi.provider.postgresql.BaseConnectionPool
+        """
+
+        self.conn_dic = conn_dic
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.max_lifetime = max_lifetime
+        self.check_interval = check_interval
+
+        self._idle = collections.deque()  # (connection, last used)
+        self._created = {}  # connection: creation time
+        self._prepared = {}  # connection: names of prepared statements
+        self._size = 0
+
+    def prepared(self, conn):
+        """
+        Get the names of the statements prepared on a connection of
+        the pool (which only live as long as the connection)
+
+        :param conn: psycopg2.extensions.connection
+
+        :returns: `set` of statement names
+        """
+
+        return self._prepared.setdefault(conn, set())
+
+    def _checkout(self, deadline):
+        """
+        Take an idle connection, or else a free slot (to be called with
+        the pool lock held)
+
+        :param deadline: time after which to give up waiting
+
+        :returns: `tuple` of idle connection and time it was returned
+                  to the pool, `tuple` of `None` if a slot was taken,
+                  or seconds to wait for a connection if the pool is
+                  full
+        """
+
+        self._recycle()
+        if self._idle:
+            return self._idle.pop()
+        if self._size < self.max_size:
+            self._size += 1
+            return None, None
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            msg = 'No connection available after {}s'.format(self.timeout)
+            LOGGER.error(msg)
+            raise ProviderConnectionError(msg)
+        return remaining
+
+    def _expired(self, conn, now):
+        """
+        Whether a connection is closed or too old to be reused
+
+        :param conn: psycopg2.extensions.connection
+        :param now: current time
+
+        :returns: bool
+        """
+
+        return bool(conn.closed) or \
+            now - self._created.get(conn, now) > self.max_lifetime
+
+    def _connected(self, conn):
+        """
+        Account for a new connection
+
+        :param conn: psycopg2.extensions.connection
+
+        :returns: psycopg2.extensions.connection
+        """
+
+        self._created[conn] = time.monotonic()
+        return conn
+
+    def _connect_error(self, conn, err):
+        """
+        Handle an error opening a connection (its slot being freed by
+        the caller): close it and raise the error
+
+        :param conn: psycopg2.extensions.connection (or `None` if not
+                     created)
+        :param err: exception raised
+
+        :returns: void
+        """
+
+        if conn is not None:
+            try:
+                conn.close()
+            except psycopg2.Error:
+                pass
+        if isinstance(err, psycopg2.OperationalError):
+            LOGGER.error("Couldn't connect to Postgis using:{}".format(
+                str(self.conn_dic)))
+            raise ProviderConnectionError()
+        raise err
+
+    def _recycle(self):
+        """
+        Close the connections idle for too long, keeping `min_size`
+        connections open (to be called with the pool lock held)
+
+        :returns: void
+        """
+
+        expiry = time.monotonic() - self.max_idle
+        while self._idle and self._size > self.min_size and \
+                self._idle[0][1] < expiry:
+            conn, _ = self._idle.popleft()
+            self._close(conn)
+
+    def _release(self, conn):
+        """
+        Close a connection taken from the pool and free its slot (to be
+        called with the pool lock held)
+
+        :param conn: psycopg2.extensions.connection (or `None` if it
+                     could not be opened)
+
+        :returns: void
+        """
+
+        if conn is not None:
+            self._close(conn)
+        else:
+            self._size -= 1
+
+    def _close_idle(self):
+        """
+        Close the idle connections (to be called with the pool lock
+        held)
+
+        :returns: void
+        """
+
+        while self._idle:
+            conn, _ = self._idle.popleft()
+            self._close(conn)
+
+    def _close(self, conn):
+        """
+        Close a connection (to be called with the pool lock held)
+
+        :param conn: psycopg2.extensions.connection
+
+        :returns: void
+        """
+
+        self._size -= 1
+        self._created.pop(conn, None)
+        self._prepared.pop(conn, None)
+        try:
+            conn.close()
+        except psycopg2.Error:
+            pass
+
+
+class ConnectionPool(BaseConnectionPool):
+    """
+    Thread safe pool of connections to a database, blocking when all
+    connections are in use (see `BaseConnectionPool`)
+    """
+
+    def __init__(self, conn_dic, **kwargs):
+        """
+        Initialize object
+
+        :param conn_dic: `dict` of psycopg2 connection parameters
+        :param kwargs: pool settings (see `BaseConnectionPool`)
+
+        :returns: pygeoapi.provider.postgresql.ConnectionPool
+        """
+
+        BaseConnectionPool.__init__(self, conn_dic, **kwargs)
+        self._cond = threading.Condition()
+
+    def getconn(self):
+        """
+        Get a connection from the pool, opening one if none is idle
+        and the pool is not full
+
+        :returns: psycopg2.extensions.connection
+        """
+
+        deadline = time.monotonic() + self.timeout
+        while True:
+            with self._cond:
+                taken = self._checkout(deadline)
+                if not isinstance(taken, tuple):
+                    self._cond.wait(taken)
+                    continue
+
+            conn, last_used = taken
+            if conn is None:
+                return self._connect()
+            if self._check(conn, last_used):
+                return conn
+            self._discard(conn)
+
+    def putconn(self, conn, close=False):
+        """
+        Return a connection to the pool, ending its transaction
+
+        :param conn: psycopg2.extensions.connection
+        :param close: close the connection instead
+
+        :returns: void
+        """
+
+        now = time.monotonic()
+        if not close and not conn.closed:
+            try:
+                conn.rollback()
+            except psycopg2.Error:
+                close = True
+        if close or self._expired(conn, now):
+            self._discard(conn)
+            return
+
+        with self._cond:
+            self._idle.append((conn, now))
+            self._cond.notify()
+
+    def closeall(self):
+        """
+        Close the idle connections of the pool
+
+        :returns: void
+        """
+
+        with self._cond:
+            self._close_idle()
+
+    def _connect(self):
+        """
+        Open a new connection (accounted for by the caller)
+
+        :returns: psycopg2.extensions.connection
+        """
+
+        conn = None
+        try:
+            conn = psycopg2.connect(**self.conn_dic)
+            conn.set_client_encoding('utf8')
+        except BaseException as err:
+            self._discard(None)
+            self._connect_error(conn, err)
+
+        return self._connected(conn)
+
+    def _check(self, conn, last_used):
+        """
+        Check that an idle connection is still usable
+
+        :param conn: psycopg2.extensions.connection
+        :param last_used: time the connection was returned to the pool
+
+        :returns: `bool` of whether the connection is usable
+        """
+
+        now = time.monotonic()
+        if self._expired(conn, now):
+            return False
+        if now - last_used > self.check_interval:
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute('SELECT 1')
+                conn.rollback()
+            except psycopg2.Error as err:
+                LOGGER.debug('Discarding broken connection: {}'.format(err))
+                return False
+        return True
+
+    def _discard(self, conn):
+        """
+        Close a connection taken from the pool and free its slot
+
+        :param conn: psycopg2.extensions.connection (or `None` if it
+                     could not be opened)
+
+        :returns: void
+        """
+
+        with self._cond:
+            self._release(conn)
+            self._cond.notify()
+
+
+def get_pool(conn_dic, options=None):
+    """
+    Get the process-wide connection pool of a database, creating it on
+    first use (pools are not shared with forked processes)
+
+    :param conn_dic: `dict` of psycopg2 connection parameters
+    :param options: `dict` of pool settings (see `POOL_DEFAULTS`)
+
+    :returns: pygeoapi.provider.postgresql.ConnectionPool
+    """
+
+    key = (os.getpid(), _get_conn_key(conn_dic))
+
+    pool = _POOLS.get(key)
+    if pool is None:
+        with _POOLS_LOCK:
+            pool = _POOLS.get(key)
+            if pool is None:
+                settings = dict(POOL_DEFAULTS, **(options or {}))
+                LOGGER.debug('Creating connection pool: {}'.format(
+                    settings))
+                pool = ConnectionPool(conn_dic, **settings)
+                _POOLS[key] = pool
+    return pool
+
+
+class AsyncConnectionPool(BaseConnectionPool):
+    """
+    Pool of asynchronous connections to a database for an asyncio event
+    loop, waiting when all connections are in use (see
+    `BaseConnectionPool`)
+    """
+
+    def __init__(self, conn_dic, **kwargs):
+        """
+        Initialize object
+
+        :param conn_dic: `dict` of psycopg2 connection parameters
+        :param kwargs: pool settings (see `BaseConnectionPool`)
+
+        :returns: pygeoapi.provider.postgresql.AsyncConnectionPool
+        """
+
+        BaseConnectionPool.__init__(self, conn_dic, **kwargs)
+        self._cond = asyncio.Condition()
+
+    async def getconn(self):
+        """
+        Get a connection from the pool, opening one if none is idle
+        and the pool is not full
+
+        :returns: psycopg2.extensions.connection (asynchronous)
+        """
+
+        deadline = time.monotonic() + self.timeout
+        while True:
+            async with self._cond:
+                taken = self._checkout(deadline)
+                if not isinstance(taken, tuple):
+                    try:
+                        await asyncio.wait_for(self._cond.wait(), taken)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
+            conn, last_used = taken
+            if conn is None:
+                return await self._connect()
+            if await self._check(conn, last_used):
+                return conn
+            await self._discard(conn)
+
+    async def putconn(self, conn, close=False):
+        """
+        Return a connection to the pool
+
+        :param conn: psycopg2.extensions.connection (asynchronous)
+        :param close: close the connection instead
+
+        :returns: void
+        """
+
+        now = time.monotonic()
+        # a connection is left busy by a cancelled query
+        if close or self._expired(conn, now) or conn.isexecuting():
+            await self._discard(conn)
+            return
+
+        async with self._cond:
+            self._idle.append((conn, now))
+            self._cond.notify()
+
+    def closeall(self):
+        """
+        Close the idle connections of the pool
+
+        :returns: void
+        """
+
+        self._close_idle()
+
+    async def _connect(self):
+        """
+        Open a new connection (accounted for by the caller)
+
+        :returns: psycopg2.extensions.connection (asynchronous)
+        """
+
+        conn = None
+        try:
+            conn = psycopg2.connect(async_=True, client_encoding='utf8',
+                                    **self.conn_dic)
+            await wait(conn)
+        except BaseException as err:
+            await self._discard(None)
+            self._connect_error(conn, err)
+
+        return self._connected(conn)
+
+    async def _check(self, conn, last_used):
+        """
+        Check that an idle connection is still usable
+
+        :param conn: psycopg2.extensions.connection (asynchronous)
+        :param last_used: time the connection was returned to the pool
+
+        :returns: `bool` of whether the connection is usable
+        """
+
+        now = time.monotonic()
+        if self._expired(conn, now):
+            return False
+        if now - last_used > self.check_interval:
+            try:
+                cursor = conn.cursor()
+                cursor.execute('SELECT 1')
+                await wait(conn)
+            except psycopg2.Error as err:
+                LOGGER.debug('Discarding broken connection: {}'.format(err))
+                return False
+        return True
+
+    async def _discard(self, conn):
+        """
+        Close a connection taken from the pool and free its slot
+
+        :param conn: psycopg2.extensions.connection (or `None` if it
+                     could not be opened)
+
+        :returns: void
+        """
+
+        async with self._cond:
+            self._release(conn)
+            self._cond.notify()
+
+
+def get_async_pool(conn_dic, options=None):
+    """
+    Get the asynchronous connection pool of a database for the running
+    event loop, creating it on first use
+
+    :param conn_dic: `dict` of psycopg2 connection parameters
+    :param options: `dict` of pool settings (see `POOL_DEFAULTS`)
+
+    :returns: pygeoapi.provider.postgresql.AsyncConnectionPool
+    """
+
+    pools = _ASYNC_POOLS.setdefault(asyncio.get_event_loop(), {})
+    key = _get_conn_key(conn_dic)
+
+    pool = pools.get(key)
+    if pool is None:
+        settings = dict(POOL_DEFAULTS, **(options or {}))
+        LOGGER.debug('Creating asynchronous connection pool: {}'.format(
+            settings))
+        pool = AsyncConnectionPool(conn_dic, **settings)
+        pools[key] = pool
+    return pool
+
+
+def get_columns(conn, conn_dic, table, ttl=COLUMNS_TTL):
+    """
+    Get the (non geometry) columns of a table, cached per database,
+    search path and table for `ttl` seconds
+
+    :param conn: psycopg2.extensions.connection
+    :param conn_dic: `dict` of psycopg2 connection parameters
+                     (including search path options)
+    :param table: table name (resolved with the search path)
+    :param ttl: seconds to keep the columns cached
+
+    :returns: `list` of `tuple` of column name, type name and whether
+              the column is a key (has a unique index of its own)
+    """
+
+    key = (_get_conn_key(conn_dic), table)
+    now = time.monotonic()
+
+    cached = _COLUMNS.get(key)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+
+    LOGGER.debug('Getting columns of table {}'.format(table))
+    with conn.cursor() as cursor:
+        cursor.execute(_COLUMNS_QUERY, (table,))
+        columns = [tuple(row) for row in cursor.fetchall()]
+
+    with _COLUMNS_LOCK:
+        _COLUMNS[key] = (now + ttl, columns)
+
+    return columns
+
+
+async def get_columns_async(conn, conn_dic, table, ttl=COLUMNS_TTL):
+    """
+    Get the (non geometry) columns of a table on an asynchronous
+    connection (see `get_columns`)
+
+    :param conn: psycopg2.extensions.connection (asynchronous)
+    :param conn_dic: `dict` of psycopg2 connection parameters
+                     (including search path options)
+    :param table: table name (resolved with the search path)
+    :param ttl: seconds to keep the columns cached
+
+    :returns: `list` of `tuple` of column name, type name and whether
+              the column is a key (has a unique index of its own)
+    """
+
+    key = (_get_conn_key(conn_dic), table)
+    now = time.monotonic()
+
+    cached = _COLUMNS.get(key)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+
+    LOGGER.debug('Getting columns of table {}'.format(table))
+    cursor = conn.cursor()
+    cursor.execute(_COLUMNS_QUERY, (table,))
+    await wait(conn)
+    columns = [tuple(row) for row in cursor.fetchall()]
+
+    with _COLUMNS_LOCK:
+        _COLUMNS[key] = (now + ttl, columns)
+
+    return columns
+
+
+def invalidate_columns(table=None):
+    """
+    Drop cached table columns (e.g. after a schema change)
+
+    :param table: table name (default all tables)
+
+    :returns: void
+    """
+
+    with _COLUMNS_LOCK:
+        for key in list(_COLUMNS):
+            if table is None or key[1] == table:
+                del _COLUMNS[key]
+
+
+def execute(cursor, sql_query, prepared=None):
+    """
+    Execute a query with its parameters (see
+    `pygeoapi.postgres_where_clauses.Parameter`), as a statement
+    prepared on the connection if `prepared` is given, so that queries
+    of the same shape are only parsed and planned once
+
+    :param cursor: psycopg2 cursor
+    :param sql_query: psycopg2.sql.Composed
+    :param prepared: `set` of the names of the statements prepared on
+                     the connection (updated), or `None` to not prepare
+
+    :returns: void
+    """
+
+    for statement, params in _get_statements(cursor, sql_query, prepared):
+        cursor.execute(statement, params)
+
+
+async def execute_async(cursor, sql_query, prepared=None):
+    """
+    Execute a query on an asynchronous connection (see `execute`)
+
+    :param cursor: psycopg2 cursor of an asynchronous connection
+    :param sql_query: psycopg2.sql.Composed
+    :param prepared: `set` of the names of the statements prepared on
+                     the connection (updated), or `None` to not prepare
+
+    :returns: void
+    """
+
+    for statement, params in _get_statements(cursor, sql_query, prepared):
+        cursor.execute(statement, params)
+        await wait(cursor.connection)
+
+
+async def wait(conn):
+    """
+    Wait for the current operation of an asynchronous connection to
+    complete, without blocking the event loop
+
+    :param conn: psycopg2.extensions.connection (asynchronous)
+
+    :returns: void
+    """
+
+    loop = asyncio.get_event_loop()
+    while True:
+        state = conn.poll()
+        if state == psycopg2.extensions.POLL_OK:
+            return
+
+        fd = conn.fileno()
+        ready = loop.create_future()
+
+        def callback():
+            if not ready.done():
+                ready.set_result(None)
+
+        if state == psycopg2.extensions.POLL_READ:
+            loop.add_reader(fd, callback)
+            try:
+                await ready
+            finally:
+                loop.remove_reader(fd)
+        elif state == psycopg2.extensions.POLL_WRITE:
+            loop.add_writer(fd, callback)
+            try:
+                await ready
+            finally:
+                loop.remove_writer(fd)
+        else:
+            raise psycopg2.OperationalError(
+                'Unexpected poll state: {}'.format(state))
+
+
+def _get_statements(cursor, sql_query, prepared=None):
+    """
+    helper function to get the statements running a query (see
+    `execute`): the query itself, or the execution of a prepared
+    statement (prepared first if needed)
+
+    :param cursor: psycopg2 cursor
+    :param sql_query: psycopg2.sql.Composed
+    :param prepared: `set` of the names of the statements prepared on
+                     the connection (updated once a statement is
+                     prepared), or `None` to not prepare
+
+    :returns: generator of `tuple` of statement and parameters
+    """
+
+    params = get_parameters(sql_query)
+
+    if prepared is None:
+        yield sql_query, params
+        return
+
+    text = sql_query.as_string(cursor)
+    name = 'pygeoapi_{}'.format(
+        hashlib.md5(text.encode('utf-8')).hexdigest()[:16])
+
+    if name not in prepared:
+        if len(prepared) >= PREPARED_MAX:
+            yield sql_query, params
+            return
+        # %s placeholders become $1, $2 ...
+        numbers = iter(range(1, len(params) + 1))
+        statement = re.sub(
+            '%%|%s',
+            lambda m: '%' if m.group() == '%%' else '${}'.format(
+                next(numbers)),
+            text)
+        LOGGER.debug('Preparing statement {}'.format(name))
+        yield SQL('PREPARE {} AS ').format(
+            Identifier(name)).as_string(cursor) + statement, None
+        prepared.add(name)
+
+    if params:
+        yield SQL('EXECUTE {} ({})').format(
+            Identifier(name),
+            SQL(', ').join([Placeholder()] * len(params))), params
+    else:
+        yield SQL('EXECUTE {}').format(Identifier(name)), None
+
+
+def _get_conn_key(conn_dic):
+    """
+    helper function to get a hashable key of connection parameters
+
+    :param conn_dic: `dict` of psycopg2 connection parameters
+
+    :returns: `tuple` of sorted connection parameters
+    """
+
+    return tuple(sorted((k, str(v)) for k, v in conn_dic.items()))
+
 
 class DatabaseConnection:
     """Database connection class to be used as 'with' statement.
      The class returns a connection object.
     """
 
-    def __init__(self, conn_dic, table, context="query"):
+    def __init__(self, conn_dic, table, context="query", pool=None,
+                 columns_ttl=COLUMNS_TTL):
         """
         PostgreSQLProvider Class constructor returning
 
@@ -84,50 +857,126 @@ class DatabaseConnection:
                 assemble column information
         :param context: query or hits, if query then it will determine
                 table column otherwise will not do it
+        :param pool: `dict` of connection pool settings (see
+                     `POOL_DEFAULTS`), or `False` to open a new
+                     connection
+        :param columns_ttl: seconds to keep table columns cached
         :returns: psycopg2.extensions.connection
         """
 
-        self.conn_dic = conn_dic
+        # work on a copy, the provider definition is shared across requests
+        self.conn_dic = dict(conn_dic)
         self.table = table
         self.context = context
         self.columns = None
         self.fields = {}  # Dict of columns. Key is col name, value is type
+        self.keys = set()  # columns with a unique index
+        self.prepared = None  # names of statements prepared (if pooled)
         self.conn = None
+        self.pool = None
+        self.pool_options = {} if pool is None else pool
+        self.columns_ttl = columns_ttl
 
     def __enter__(self):
-        try:
-            search_path = self.conn_dic.pop('search_path', ['public'])
-            if search_path != ['public']:
-                self.conn_dic["options"] = '-c \
-                search_path={}'.format(",".join(search_path))
-                LOGGER.debug('Using search path: {} '.format(search_path))
-            self.conn = psycopg2.connect(**self.conn_dic)
-            self.conn.set_client_encoding('utf8')
-
-        except psycopg2.OperationalError:
-            LOGGER.error("Couldn't connect to Postgis using:{}".format(
-                str(self.conn_dic)))
-            raise ProviderConnectionError()
+        self._set_search_path()
+
+        if self.pool_options is not False:
+            self.pool = get_pool(self.conn_dic, self.pool_options)
+            self.conn = self.pool.getconn()
+            self.prepared = self.pool.prepared(self.conn)
+        else:
+            try:
+                self.conn = psycopg2.connect(**self.conn_dic)
+                self.conn.set_client_encoding('utf8')
+
+            except psycopg2.OperationalError:
+                LOGGER.error("Couldn't connect to Postgis using:{}".format(
+                    str(self.conn_dic)))
+                raise ProviderConnectionError()
 
         self.cur = self.conn.cursor()
         if self.context == 'query':
             # Getting columns
-            query_cols = "SELECT column_name, udt_name FROM information_schema.columns \
-            WHERE table_name = '{}' and udt_name != 'geometry';".format(
-                self.table)
-
-            self.cur.execute(query_cols)
-            result = self.cur.fetchall()
-            self.columns = SQL(', ').join(
-                [Identifier(item[0]) for item in result]
-            )
-            self.fields = dict(result)
+            try:
+                result = get_columns(self.conn, self.conn_dic, self.table,
+                                     self.columns_ttl)
+            except Exception:
+                self.__exit__(None, None, None)
+                raise
+            self._set_columns(result)
 
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         # some logic to commit/rollback
-        self.conn.close()
+        if self.pool is not None:
+            # connections broken by an error are not reused
+            self.pool.putconn(self.conn, close=isinstance(
+                exc_val, psycopg2.OperationalError))
+        else:
+            self.conn.close()
+
+    def _set_search_path(self):
+        """
+        Set the search path of the connection parameters
+
+        :returns: void
+        """
+
+        search_path = self.conn_dic.pop('search_path', ['public'])
+        if search_path != ['public']:
+            self.conn_dic["options"] = '-c \
+            search_path={}'.format(",".join(search_path))
+            LOGGER.debug('Using search path: {} '.format(search_path))
+
+    def _set_columns(self, result):
+        """
+        Set the columns, fields and keys of the table
+
+        :param result: `list` of `tuple` of column name, type name and
+                       whether the column is a key (see `get_columns`)
+
+        :returns: void
+        """
+
+        self.columns = SQL(', ').join(
+            [Identifier(item[0]) for item in result]
+        )
+        self.fields = {item[0]: item[1] for item in result}
+        self.keys = {item[0] for item in result if item[2]}
+
+
+class AsyncDatabaseConnection(DatabaseConnection):
+    """Asynchronous database connection class to be used as
+    'async with' statement, connections being always pooled (see
+    `DatabaseConnection`)
+    """
+
+    async def __aenter__(self):
+        self._set_search_path()
+
+        self.pool = get_async_pool(self.conn_dic, self.pool_options or {})
+        self.conn = await self.pool.getconn()
+        self.prepared = self.pool.prepared(self.conn)
+
+        if self.context == 'query':
+            try:
+                result = await get_columns_async(
+                    self.conn, self.conn_dic, self.table, self.columns_ttl)
+            except BaseException as err:
+                await self.__aexit__(type(err), err, None)
+                raise
+            self._set_columns(result)
+
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        # connections broken by a query error are not reused, nor
+        # those whose session settings may have been left changed
+        await self.pool.putconn(self.conn, close=exc_val is not None and
+                                not isinstance(exc_val, (
+                                    ProviderInvalidQueryError,
+                                    ProviderItemNotFoundError)))
 
 
 class PostgreSQLProvider(BaseProvider):
@@ -154,6 +1003,15 @@ class PostgreSQLProvider(BaseProvider):
         self.id_field = provider_def['id_field']
         self.conn_dic = provider_def['data']
         self.geom = provider_def.get('geom_field', 'geom')
+        self.pool = provider_def.get('pool', {})
+        self.columns_ttl = provider_def.get('columns_ttl', COLUMNS_TTL)
+        self.pagination = provider_def.get('pagination', 'offset')
+        self.prev_next = provider_def.get('prev_next', True)
+        self.postgis_json = provider_def.get('postgis_json', False)
+        self.prepare = provider_def.get('prepare', False)
+        self.count = provider_def.get('count', 'exact')
+        self.count_timeout = provider_def.get('count_timeout', COUNT_TIMEOUT)
+        self.number_matched = provider_def.get('number_matched', False)
 
         LOGGER.debug('Setting Postgresql properties:')
         LOGGER.debug('Connection String:{}'.format(
@@ -172,42 +1030,130 @@ class PostgreSQLProvider(BaseProvider):
         :returns: dict of fields
         """
         if not self.fields:
-            with DatabaseConnection(self.conn_dic, self.table) as db:
+            with DatabaseConnection(self.conn_dic, self.table,
+                                    pool=self.pool,
+                                    columns_ttl=self.columns_ttl) as db:
                 self.fields = db.fields
         return self.fields
 
-    def __get_where_clauses(self, properties=[], bbox=[]):
+    def refresh_fields(self):
+        """
+        Reload fields from PostgreSQL table (e.g. after a schema change)
+
+        :returns: dict of fields
+        """
+
+        invalidate_columns(self.table)
+        self.fields = {}
+        return self.get_fields()
+
+    def __get_where_conditions(self, properties=[], bbox=[]):
         """
         Generarates WHERE conditions to be implemented in query.
         Private method mainly associated with query method
         :param properties: list of tuples (name, value)
         :param bbox: bounding box [minx,miny,maxx,maxy]
 
-        :returns: psycopg2.sql.Composed or psycopg2.sql.SQL
+        :returns: `list` of psycopg2.sql.Composed
         """
 
         where_conditions = []
         if properties:
             property_clauses = [SQL('{} = {}').format(
-                Identifier(k), Literal(v)) for k, v in properties]
+                Identifier(k), Parameter(v)) for k, v in properties]
             where_conditions += property_clauses
         if bbox:
             bbox_clause = SQL('{} && ST_MakeEnvelope({})').format(
                 Identifier(self.geom), SQL(', ').join(
-                    [Literal(bbox_coord) for bbox_coord in bbox]))
+                    [Parameter(bbox_coord) for bbox_coord in bbox]))
             where_conditions.append(bbox_clause)
 
-        if where_conditions:
-            where_clause = SQL(' WHERE {}').format(
-                SQL(' AND ').join(where_conditions))
-        else:
-            where_clause = SQL('')
+        return where_conditions
+
+    def __get_cql_where_conditions(self, cql_expression):
+        """
+        Generates WHERE conditions from a CQL filter expression
 
-        return where_clause
+        :param cql_expression: cql query filter expression
+
+        :returns: `list` of psycopg2.sql.Composed
+        """
+
+        fields = self.get_fields()
+        field_list = {}
+        for k in fields.keys():
+            field_list[k] = k
+        field_list['geometry'] = self.geom
+        cql_handler = load_plugin('extensions',
+                                  {'name': 'CQL',
+                                   'cql_expression': cql_expression,
+                                   'feature_list': None,
+                                   'field_list': field_list})
+
+        return cql_handler.postgres_where_clause()
+
+    def __get_keyset_condition(self, order_by, cursor):
+        """
+        Generates the WHERE condition selecting the rows after a keyset
+        pagination cursor, i.e. (a > x OR a IS NULL) OR
+        (a IS NOT DISTINCT FROM x AND b > y) ..., NULL sorting after
+        any value (last in ascending order, first in descending order)
+
+        :param order_by: list of tuples (column, order)
+        :param cursor: pagination cursor (sort key of the last row of
+                       the previous page)
+
+        :returns: psycopg2.sql.Composed
+        """
+
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        except (ValueError, TypeError) as err:
+            LOGGER.error('Invalid cursor {}: {}'.format(cursor, err))
+            raise ProviderInvalidQueryError('invalid cursor')
+
+        if not isinstance(values, list) or len(values) != len(order_by):
+            LOGGER.error('Invalid cursor {} for {}'.format(cursor, order_by))
+            raise ProviderInvalidQueryError('invalid cursor')
+
+        alternatives = []
+        for i, (column, order) in enumerate(order_by):
+            terms = [SQL('{} IS NOT DISTINCT FROM {}').format(
+                Identifier(c), Parameter(v))
+                for (c, _), v in zip(order_by[:i], values)]
+            if values[i] is None:
+                if order != 'D':
+                    continue
+                terms.append(SQL('{} IS NOT NULL').format(Identifier(column)))
+            elif order == 'D':
+                terms.append(SQL('{} < {}').format(
+                    Identifier(column), Parameter(values[i])))
+            else:
+                terms.append(SQL('({0} > {1} OR {0} IS NULL)').format(
+                    Identifier(column), Parameter(values[i])))
+            alternatives.append(SQL('({})').format(SQL(' AND ').join(terms)))
+
+        return SQL('({})').format(SQL(' OR ').join(alternatives))
+
+    def __get_order_by(self, sortby=[]):
+        """
+        Get the sort order of the rows (`sortby`, then `id_field` so that
+        the order is total)
+
+        :param sortby: list of dicts (property, order)
+
+        :returns: list of tuples (column, order)
+        """
+
+        order_by = [(s['property'], s['order']) for s in sortby]
+        if self.id_field not in [column for column, _ in order_by]:
+            order_by.append((self.id_field, 'A'))
+        return order_by
 
     def query(self, startindex=0, limit=10, resulttype='results',
               bbox=[], datetime=None, properties=[], sortby=[],
-              cql_expression=None):
+              cql_expression=None, cursor=None, select_properties=[],
+              simplify=None, precision=None):
         """
         Query Postgis for all the content.
         e,g: http://localhost:5000/collections/hotosm_bdi_waterways/items?
@@ -221,201 +1167,456 @@ class PostgreSQLProvider(BaseProvider):
         :param properties: list of tuples (name, value)
         :param sortby: list of dicts (property, order)
         :param cql_expression: cql query filter expression
+        :param cursor: keyset pagination cursor (`next_cursor` of the
+                       previous page), only with ``pagination: keyset``
+        :param select_properties: list of property names to return
+                                  (default all)
+        :param simplify: tolerance of the simplification of the
+                         geometries (default none)
+        :param precision: maximum number of decimal digits of the
+                          coordinates (default PostGIS default)
 
         :returns: GeoJSON FeaturesCollection
         """
 
         LOGGER.debug('Querying PostGIS')
 
-        if cql_expression:
-            try:
-                fields = self.get_fields()
-                field_list = {}
-                for k in fields.keys():
-                    field_list[k] = k
-                field_list['geometry'] = self.geom
-                cql_handler = load_plugin('extensions',
-                                          {'name': 'CQL',
-                                           'cql_expression': cql_expression,
-                                           'feature_list': None,
-                                           'field_list': field_list})
-
-                cql_where_conditions = cql_handler.postgres_where_clause()
-                cql_where_clause = SQL(' WHERE {}').\
-                    format(SQL(' AND ').join(cql_where_conditions))
-
-                if resulttype == 'hits':
-
-                    with DatabaseConnection(self.conn_dic,
-                                            self.table, context="hits") as db:
-                        cursor = db.conn.cursor(cursor_factory=RealDictCursor)
-
-                        sql_query = SQL("SELECT COUNT(*) as hits from {} {}").\
-                            format(Identifier(self.table), cql_where_clause)
-                        try:
-                            cursor.execute(sql_query)
-                        except Exception as err:
-                            LOGGER.error(
-                                'Error executing sql_query: {}: '
-                                '{}'.format(sql_query.as_string(cursor), err))
-                            raise ProviderQueryError()
-
-                        hits = cursor.fetchone()["hits"]
-
-                    return self.__response_feature_hits(hits)
-
-                end_index = startindex + limit
-
-                with DatabaseConnection(self.conn_dic, self.table) as db:
-                    cursor = db.conn.cursor(cursor_factory=RealDictCursor)
-
-                    sql_query = SQL("DECLARE \"geo_cursor\" CURSOR FOR \
-                    SELECT DISTINCT {},ST_AsGeoJSON({}) FROM {}{}"). \
-                        format(db.columns,
-                               Identifier(self.geom),
-                               Identifier(self.table),
-                               cql_where_clause)
-
-                    LOGGER.debug(
-                        'SQL Query: {}'.format(sql_query.as_string(cursor)))
-                    LOGGER.debug('Start Index: {}'.format(startindex))
-                    LOGGER.debug('End Index: {}'.format(end_index))
-                    try:
-                        cursor.execute(sql_query)
-                        for index in [startindex, limit]:
-                            cursor.execute("fetch forward {} from geo_cursor"
-                                           .format(index))
-                    except Exception as err:
-                        LOGGER.error('Error executing sql_query: {}'.format(
-                            sql_query.as_string(cursor)))
-                        LOGGER.error(err)
-                        raise ProviderQueryError()
+        where_conditions = self.__get_query_conditions(
+            properties, bbox, cql_expression)
 
-                    row_data = cursor.fetchall()
+        try:
+            return self.__run(
+                'hits' if resulttype == 'hits' else 'query',
+                self.__query_steps, resulttype, where_conditions,
+                startindex, limit, sortby, cursor, select_properties,
+                simplify, precision)
+        except ProviderQueryError as err:
+            if cql_expression:
+                LOGGER.debug('Invalid CQL filter evaluation: {}'.format(err))
+                raise CQLException()
+            raise
 
-                    feature_collection = {
-                        'type': 'FeatureCollection',
-                        'features': []
-                    }
+    async def query_async(self, startindex=0, limit=10,
+                          resulttype='results', bbox=[], datetime=None,
+                          properties=[], sortby=[], cql_expression=None,
+                          cursor=None, select_properties=[],
+                          simplify=None, precision=None):
+        """
+        Query Postgis for all the content without blocking the event
+        loop, on a pool of asynchronous connections (see `query`)
 
-                    for rd in row_data:
-                        feature_collection['features'].append(
-                            self.__response_feature(rd))
+        :param startindex: starting record to return (default 0)
+        :param limit: number of records to return (default 10)
+        :param resulttype: return results or hit limit (default results)
+        :param bbox: bounding box [minx,miny,maxx,maxy]
+        :param datetime: temporal (datestamp or extent)
+        :param properties: list of tuples (name, value)
+        :param sortby: list of dicts (property, order)
+        :param cql_expression: cql query filter expression
+        :param cursor: keyset pagination cursor (`next_cursor` of the
+                       previous page), only with ``pagination: keyset``
+        :param select_properties: list of property names to return
+                                  (default all)
+        :param simplify: tolerance of the simplification of the
+                         geometries (default none)
+        :param precision: maximum number of decimal digits of the
+                          coordinates (default PostGIS default)
 
-                    return feature_collection
+        :returns: GeoJSON FeaturesCollection
+        """
 
-            except Exception as err:
+        LOGGER.debug('Querying PostGIS (asynchronously)')
+
+        where_conditions = self.__get_query_conditions(
+            properties, bbox, cql_expression)
+
+        try:
+            return await self.__run_async(
+                'hits' if resulttype == 'hits' else 'query',
+                self.__query_steps, resulttype, where_conditions,
+                startindex, limit, sortby, cursor, select_properties,
+                simplify, precision)
+        except ProviderQueryError as err:
+            if cql_expression:
                 LOGGER.debug('Invalid CQL filter evaluation: {}'.format(err))
                 raise CQLException()
+            raise
 
-        else:
-            if resulttype == 'hits':
+    def __get_query_conditions(self, properties=[], bbox=[],
+                               cql_expression=None):
+        """
+        Generates the WHERE conditions of a query, from a CQL filter
+        expression if any, from properties and bbox otherwise
 
-                with DatabaseConnection(self.conn_dic,
-                                        self.table, context="hits") as db:
-                    cursor = db.conn.cursor(cursor_factory=RealDictCursor)
+        :param properties: list of tuples (name, value)
+        :param bbox: bounding box [minx,miny,maxx,maxy]
+        :param cql_expression: cql query filter expression
 
-                    where_clause = self.__get_where_clauses(
-                        properties=properties, bbox=bbox)
-                    sql_query = SQL("SELECT COUNT(*) as hits from {} {}"). \
-                        format(Identifier(self.table), where_clause)
-                    try:
-                        cursor.execute(sql_query)
-                    except Exception as err:
-                        LOGGER.error(
-                            'Error executing sql_query: {}: '
-                            '{}'.format(sql_query.as_string(cursor), err))
-                        raise ProviderQueryError()
+        :returns: `list` of psycopg2.sql.Composed
+        """
 
-                    hits = cursor.fetchone()["hits"]
+        if cql_expression:
+            try:
+                return self.__get_cql_where_conditions(cql_expression)
+            except Exception as err:
+                LOGGER.debug('Invalid CQL filter evaluation: {}'.format(err))
+                raise CQLException()
 
-                return self.__response_feature_hits(hits)
+        return self.__get_where_conditions(properties=properties, bbox=bbox)
 
-            end_index = startindex + limit
+    def __run(self, context, steps, *args):
+        """
+        Run the queries of a request on a connection
+
+        :param context: query or hits (see `DatabaseConnection`)
+        :param steps: generator function taking a `DatabaseConnection`
+                      and `args`, yielding `tuple` of query
+                      (psycopg2.sql.Composed) and whether it can be a
+                      prepared statement, receiving the result rows of
+                      each query (or its error), and returning the
+                      request result
+        :param args: arguments of `steps`
+
+        :returns: request result
+        """
 
-            with DatabaseConnection(self.conn_dic, self.table) as db:
-                cursor = db.conn.cursor(cursor_factory=RealDictCursor)
+        with DatabaseConnection(self.conn_dic, self.table,
+                                context=context, pool=self.pool,
+                                columns_ttl=self.columns_ttl) as db:
+            cursor = db.conn.cursor(cursor_factory=RealDictCursor)
+            steps = steps(db, *args)
+            rows = error = None
+            while True:
+                sql_query, prepare = self.__next_step(
+                    cursor, steps, rows, error)
+                if sql_query is None:
+                    return prepare
+                LOGGER.debug('SQL Query: {}'.format(
+                    sql_query.as_string(cursor)))
+                try:
+                    execute(cursor, sql_query,
+                            db.prepared if self.prepare and prepare
+                            else None)
+                    rows = cursor.fetchall() if cursor.description \
+                        else None
+                    error = None
+                except Exception as err:
+                    db.conn.rollback()
+                    rows, error = None, (sql_query, err)
 
-                where_clause = self.__get_where_clauses(
-                    properties=properties, bbox=bbox)
+    async def __run_async(self, context, steps, *args):
+        """
+        Run the queries of a request on an asynchronous connection
+        (see `__run`)
 
-                sql_query = SQL("DECLARE \"geo_cursor\" CURSOR FOR \
-                SELECT DISTINCT {},ST_AsGeoJSON({}) FROM {}{}"). \
-                    format(db.columns,
-                           Identifier(self.geom),
-                           Identifier(self.table),
-                           where_clause)
+        :param context: query or hits (see `DatabaseConnection`)
+        :param steps: generator function (see `__run`)
+        :param args: arguments of `steps`
 
-                LOGGER.debug(
-                    'SQL Query: '
-                    '{}'.format(sql_query.as_string(cursor)))
-                LOGGER.debug('Start Index: {}'.format(startindex))
-                LOGGER.debug('End Index: {}'.format(end_index))
+        :returns: request result
+        """
+
+        async with AsyncDatabaseConnection(
+                self.conn_dic, self.table, context=context, pool=self.pool,
+                columns_ttl=self.columns_ttl) as db:
+            cursor = db.conn.cursor(cursor_factory=RealDictCursor)
+            steps = steps(db, *args)
+            rows = error = None
+            while True:
+                sql_query, prepare = self.__next_step(
+                    cursor, steps, rows, error)
+                if sql_query is None:
+                    return prepare
+                LOGGER.debug('SQL Query: {}'.format(
+                    sql_query.as_string(cursor)))
                 try:
-                    cursor.execute(sql_query)
-                    for index in [startindex, limit]:
-                        cursor.execute(
-                            "fetch forward {} from "
-                            "geo_cursor".format(index))
+                    await execute_async(
+                        cursor, sql_query,
+                        db.prepared if self.prepare and prepare else None)
+                    rows = cursor.fetchall() if cursor.description \
+                        else None
+                    error = None
                 except Exception as err:
-                    LOGGER.error(
-                        'Error executing sql_query: '
-                        '{}'.format(sql_query.as_string(cursor)))
-                    LOGGER.error(err)
-                    raise ProviderQueryError()
+                    rows, error = None, (sql_query, err)
 
-                row_data = cursor.fetchall()
+    def __next_step(self, cursor, steps, rows=None, error=None):
+        """
+        Get the next query of a request (see `__run`)
 
-                feature_collection = {
-                    'type': 'FeatureCollection',
-                    'features': []
-                }
+        :param cursor: psycopg2 cursor
+        :param steps: generator of queries
+        :param rows: result rows of the previous query
+        :param error: `tuple` of query and error of the previous query,
+                      if it failed
 
-                for rd in row_data:
-                    feature_collection['features'].append(
-                        self.__response_feature(rd))
+        :returns: `tuple` of query and whether it can be prepared, or of
+                  `None` and the request result once done
+        """
 
-                return feature_collection
+        try:
+            if error is None:
+                return steps.send(rows)
+            return steps.throw(error[1])
+        except StopIteration as stop:
+            return None, stop.value
+        except Exception as err:
+            if error is None or err is not error[1]:
+                raise
+            LOGGER.error(
+                'Error executing sql_query: {}: '
+                '{}'.format(error[0].as_string(cursor), err))
+            raise ProviderQueryError()
+
+    def __query_steps(self, db, resulttype, where_conditions, startindex=0,
+                      limit=10, sortby=[], cursor=None, select_properties=[],
+                      simplify=None, precision=None):
+        """
+        Queries of a request of features or of their number (see `__run`)
 
-    def get_previous(self, cursor, identifier):
+        :param db: `DatabaseConnection`
+        :param resulttype: return results or hit limit
+        :param where_conditions: `list` of psycopg2.sql.Composed
+        :param startindex: starting record to return
+        :param limit: number of records to return
+        :param sortby: list of dicts (property, order)
+        :param cursor: keyset pagination cursor
+        :param select_properties: list of property names to return
+        :param simplify: tolerance of the simplification of the geometries
+        :param precision: maximum number of decimal digits of the
+                          coordinates
+
+        :returns: generator of queries, returning a GeoJSON
+                  FeaturesCollection
         """
-        Query previous ID given current ID
 
-        :param identifier: feature id
+        if resulttype == 'hits':
+            hits = yield from self.__hits_steps(where_conditions)
+            return self.__response_feature_hits(hits)
+
+        feature_collection = yield from self.__features_steps(
+            db, where_conditions, startindex, limit, sortby, cursor,
+            select_properties, simplify, precision)
+
+        if self.number_matched:
+            returned = len(feature_collection['features'])
+            if cursor is None and returned < limit and \
+                    (returned or not startindex):
+                # last page: no need to count
+                matched = startindex + returned
+            else:
+                matched = yield from self.__hits_steps(where_conditions)
+            feature_collection['numberMatched'] = matched
+
+        return feature_collection
 
-        :returns: feature id
+    def __hits_steps(self, where_conditions):
         """
+        Queries counting the rows matching WHERE conditions, following
+        the count strategy of the provider: ``exact``, ``estimate``
+        (from table statistics or the query plan) or ``auto`` (exact,
+        unless it takes more than ``count_timeout`` milliseconds)
 
-        sql = 'SELECT {} AS id FROM {} WHERE {}<%s ORDER BY {} DESC LIMIT 1'
-        cursor.execute(SQL(sql).format(
-            Identifier(self.id_field),
-            Identifier(self.table),
-            Identifier(self.id_field),
-            Identifier(self.id_field),
-        ), (identifier,))
-        item = cursor.fetchall()
-        id_ = item[0]['id'] if item else identifier
-        return id_
+        :param where_conditions: `list` of psycopg2.sql.Composed
 
-    def get_next(self, cursor, identifier):
+        :returns: generator of queries (see `__run`), returning the
+                  number of matching rows
         """
-        Query next ID given current ID
 
-        :param identifier: feature id
+        if self.count == 'estimate':
+            return (yield from self.__estimate_steps(where_conditions))
+
+        sql_query = SQL("SELECT COUNT(*) as hits from {} {}"). \
+            format(Identifier(self.table),
+                   self.__where(where_conditions))
+
+        if self.count != 'auto':
+            rows = yield sql_query, True
+            return rows[0]["hits"]
+
+        yield SQL('SET statement_timeout = {}').format(
+            SQL(str(int(self.count_timeout)))), False
+        try:
+            rows = yield sql_query, True
+        except psycopg2.extensions.QueryCanceledError:
+            LOGGER.debug('Count timed out, estimating')
+            rows = None
+        yield SQL('RESET statement_timeout'), False
+
+        if rows is None:
+            return (yield from self.__estimate_steps(where_conditions))
+        return rows[0]["hits"]
+
+    def __estimate_steps(self, where_conditions):
+        """
+        Queries estimating the number of rows matching WHERE conditions:
+        from the table statistics (``pg_class``) without conditions,
+        from the query plan otherwise
+
+        :param where_conditions: `list` of psycopg2.sql.Composed
+
+        :returns: generator of queries (see `__run`), returning the
+                  estimated number of matching rows
+        """
+
+        if not where_conditions:
+            # scaled to the current table size, as the planner does
+            rows = yield SQL("""SELECT (CASE
+                WHEN c.reltuples < 0 OR c.relpages = 0 THEN -1
+                ELSE c.reltuples / c.relpages * (pg_relation_size(c.oid)
+                / current_setting('block_size')::int) END)::bigint
+                AS hits FROM pg_class c
+                WHERE c.oid = quote_ident({})::regclass""").format(
+                    Parameter(self.table)), False
+            if rows[0]["hits"] >= 0:
+                return rows[0]["hits"]
+            # never analyzed
+
+        rows = yield SQL("EXPLAIN (FORMAT JSON) SELECT 1 FROM {} {}"). \
+            format(Identifier(self.table),
+                   self.__where(where_conditions)), False
+
+        plan = rows[0]["QUERY PLAN"]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows'])
+
+    def __features_steps(self, db, where_conditions, startindex=0,
+                         limit=10, sortby=[], after=None,
+                         select_properties=[], simplify=None, precision=None):
+        """
+        Query of a page of the rows matching WHERE conditions
+        (LIMIT/OFFSET, after a keyset pagination cursor if any)
 
-        :returns: feature id
+        :param db: `DatabaseConnection`
+        :param where_conditions: `list` of psycopg2.sql.Composed
+        :param startindex: starting record to return (default 0)
+        :param limit: number of records to return (default 10)
+        :param sortby: list of dicts (property, order)
+        :param after: keyset pagination cursor
+        :param select_properties: list of property names to return
+                                  (default all)
+        :param simplify: tolerance of the simplification of the
+                         geometries (default none)
+        :param precision: maximum number of decimal digits of the
+                          coordinates (default PostGIS default)
+
+        :returns: generator of queries (see `__run`), returning a
+                  GeoJSON FeaturesCollection
+        """
+
+        order_by = self.__get_order_by(sortby)
+        if after is not None:
+            where_conditions = where_conditions + [
+                self.__get_keyset_condition(order_by, after)]
+
+        # rows are distinct if the id field is a key
+        distinct = SQL('') if self.id_field in db.keys \
+            else SQL('DISTINCT ')
+
+        columns, hidden = self.__get_columns(
+            db, select_properties, [column for column, _ in order_by])
+        geojson = self.__get_geojson(simplify, precision)
+
+        if self.postgis_json:
+            # features serialized by PostGIS, with the sort key
+            # columns (for keyset pagination cursors)
+            if columns:
+                properties = SQL(
+                    '(SELECT row_to_json(r) FROM (SELECT {}) r)').format(
+                    SQL(', ').join([Identifier(c) for c in columns]))
+            else:
+                properties = SQL("'{}'::json")
+            select = SQL("""json_build_object('type', 'Feature', \
+            'id', {id}, 'geometry', {geojson}::json, \
+            'properties', {properties})::text AS {feature}, \
+            {keys}""").format(
+                id=Identifier(self.id_field),
+                geojson=geojson,
+                properties=properties,
+                feature=Identifier(FEATURE_COLUMN),
+                keys=SQL(', ').join(
+                    [Identifier(column) for column, _ in order_by]))
+        else:
+            select = SQL('{},{}').format(
+                SQL(', ').join([Identifier(c) for c in columns + hidden]),
+                geojson)
+
+        sql_query = SQL("SELECT {}{} FROM {}{} \
+        ORDER BY {} LIMIT {} OFFSET {}"). \
+            format(distinct,
+                   select,
+                   Identifier(self.table),
+                   self.__where(where_conditions),
+                   SQL(', ').join(
+                       [SQL('{} DESC' if order == 'D' else '{}').format(
+                           Identifier(column))
+                        for column, order in order_by]),
+                   Parameter(limit),
+                   Parameter(startindex))
+
+        LOGGER.debug('Start Index: {}'.format(startindex))
+        LOGGER.debug('Limit: {}'.format(limit))
+
+        row_data = yield sql_query, True
+
+        feature_collection = {
+            'type': 'FeatureCollection',
+            'features': []
+        }
+
+        if self.postgis_json:
+            feature_collection['features'] = RawJSONList(
+                rd[FEATURE_COLUMN] for rd in row_data)
+        else:
+            for rd in row_data:
+                feature_collection['features'].append(
+                    self.__response_feature(rd, hidden))
+
+        if self.pagination == 'keyset' and row_data and \
+                len(row_data) == limit:
+            last = row_data[-1]
+            feature_collection['next_cursor'] = base64.urlsafe_b64encode(
+                json.dumps([last[column] for column, _ in order_by],
+                           default=str).encode()).decode()
+
+        return feature_collection
+
+    def __get_geojson(self, simplify=None, precision=None):
+        """
+        Get the GeoJSON geometry column expression, simplifying the
+        geometry (preserving its topology) and limiting the number of
+        decimal digits of its coordinates if requested
+
+        :param simplify: tolerance of the simplification (default none)
+        :param precision: maximum number of decimal digits of the
+                          coordinates (default PostGIS default)
+
+        :returns: psycopg2.sql.Composed
+        """
+
+        geom = Identifier(self.geom)
+        if simplify:
+            geom = SQL('ST_SimplifyPreserveTopology({}, {})').format(
+                geom, Parameter(float(simplify)))
+
+        if precision is None:
+            return SQL('ST_AsGeoJSON({})').format(geom)
+        return SQL('ST_AsGeoJSON({}, {})').format(
+            geom, Parameter(int(precision)))
+
+    def __where(self, where_conditions):
+        """
+        Assembles a WHERE clause
+
+        :param where_conditions: `list` of psycopg2.sql.Composed
+
+        :returns: psycopg2.sql.Composed or psycopg2.sql.SQL
         """
 
-        sql = 'SELECT {} AS id FROM {} WHERE {}>%s ORDER BY {} LIMIT 1'
-        cursor.execute(SQL(sql).format(
-            Identifier(self.id_field),
-            Identifier(self.table),
-            Identifier(self.id_field),
-            Identifier(self.id_field),
-        ), (identifier,))
-        item = cursor.fetchall()
-        id_ = item[0]['id'] if item else identifier
-        return id_
+        if where_conditions:
+            return SQL(' WHERE {}').format(
+                SQL(' AND ').join(where_conditions))
+        return SQL('')
 
     def get(self, identifier):
         """
@@ -428,45 +1629,112 @@ class PostgreSQLProvider(BaseProvider):
         """
 
         LOGGER.debug('Get item from Postgis')
-        with DatabaseConnection(self.conn_dic, self.table) as db:
-            cursor = db.conn.cursor(cursor_factory=RealDictCursor)
+        return self.__run('query', self.__get_steps, identifier)
 
-            sql_query = SQL("SELECT {},ST_AsGeoJSON({}) \
-            from {} WHERE {}=%s").format(db.columns,
-                                         Identifier(self.geom),
-                                         Identifier(self.table),
-                                         Identifier(self.id_field))
+    async def get_async(self, identifier):
+        """
+        Query the provider for a specific feature id without blocking
+        the event loop, on a pool of asynchronous connections (see
+        `get`)
 
-            LOGGER.debug('SQL Query: {}'.format(sql_query.as_string(db.conn)))
-            LOGGER.debug('Identifier: {}'.format(identifier))
-            try:
-                cursor.execute(sql_query, (identifier,))
-            except Exception as err:
-                LOGGER.error('Error executing sql_query: {}'.format(
-                    sql_query.as_string(cursor)))
-                LOGGER.error(err)
-                raise ProviderQueryError()
-
-            results = cursor.fetchall()
-            row_data = None
-            if results:
-                row_data = results[0]
-            feature = self.__response_feature(row_data)
-
-            if feature:
-                feature['prev'] = self.get_previous(cursor, identifier)
-                feature['next'] = self.get_next(cursor, identifier)
-                return feature
-            else:
-                err = 'item {} not found'.format(identifier)
-                LOGGER.error(err)
-                raise ProviderItemNotFoundError(err)
+        :param identifier: feature id
+
+        :returns: GeoJSON FeaturesCollection
+        """
 
-    def __response_feature(self, row_data):
+        LOGGER.debug('Get item from Postgis (asynchronously)')
+        return await self.__run_async('query', self.__get_steps, identifier)
+
+    def __get_steps(self, db, identifier):
+        """
+        Query of a feature by id, with the ids of the previous and next
+        features (see `__run`)
+
+        :param db: `DatabaseConnection`
+        :param identifier: feature id
+
+        :returns: generator of queries, returning a GeoJSON Feature
+        """
+
+        if self.prev_next:
+            # previous and next ids (index lookups) in the same query
+            neighbours = SQL(""", \
+            (SELECT {id} FROM {table} WHERE {id}<{value} \
+            ORDER BY {id} DESC LIMIT 1) AS {prev}, \
+            (SELECT {id} FROM {table} WHERE {id}>{value} \
+            ORDER BY {id} LIMIT 1) AS {next}""").format(
+                id=Identifier(self.id_field),
+                table=Identifier(self.table),
+                value=Parameter(identifier),
+                prev=Identifier(PREV_COLUMN),
+                next=Identifier(NEXT_COLUMN))
+        else:
+            neighbours = SQL('')
+
+        columns, hidden = self.__get_columns(db)
+
+        sql_query = SQL("SELECT {},ST_AsGeoJSON({}){} \
+        from {} WHERE {}={}").format(SQL(', ').join(
+                                         [Identifier(c)
+                                          for c in columns + hidden]),
+                                     Identifier(self.geom),
+                                     neighbours,
+                                     Identifier(self.table),
+                                     Identifier(self.id_field),
+                                     Parameter(identifier))
+
+        LOGGER.debug('Identifier: {}'.format(identifier))
+        results = yield sql_query, True
+
+        row_data = None
+        if results:
+            row_data = dict(results[0])
+            prev = row_data.pop(PREV_COLUMN, None)
+            next_ = row_data.pop(NEXT_COLUMN, None)
+        feature = self.__response_feature(row_data, hidden)
+
+        if feature:
+            if self.prev_next:
+                feature['prev'] = identifier if prev is None else prev
+                feature['next'] = identifier if next_ is None else next_
+            return feature
+        else:
+            err = 'item {} not found'.format(identifier)
+            LOGGER.error(err)
+            raise ProviderItemNotFoundError(err)
+
+    def __get_columns(self, db, select_properties=[], keys=[]):
+        """
+        Get the columns to read: the properties to return (provider
+        ``properties``, in order, or all columns), restricted to
+        `select_properties` if any, then the id field and key columns
+        if they are not returned
+
+        :param db: `DatabaseConnection`
+        :param select_properties: list of property names to return
+        :param keys: list of other columns to read (e.g. sort keys)
+
+        :returns: `tuple` of `list` of property columns and `list` of
+                  the other columns
+        """
+
+        columns = self.properties or list(db.fields)
+        if select_properties:
+            columns = [c for c in columns if c in select_properties]
+
+        hidden = []
+        for column in [self.id_field] + keys:
+            if column not in columns and column not in hidden:
+                hidden.append(column)
+
+        return columns, hidden
+
+    def __response_feature(self, row_data, hidden=[]):
         """
         Assembles GeoJSON output from DB query
 
         :param row_data: DB row result
+        :param hidden: list of columns read but not returned
 
         :returns: `dict` of GeoJSON Feature
         """
@@ -479,8 +1747,12 @@ class PostgreSQLProvider(BaseProvider):
             feature["geometry"] = json.loads(
                 rd.pop('st_asgeojson'))
 
+            id_ = rd.get(self.id_field)
+            for column in hidden:
+                rd.pop(column, None)
+
             feature['properties'] = rd
-            feature['id'] = feature['properties'].get(self.id_field)
+            feature['id'] = id_
 
             return feature
         else:
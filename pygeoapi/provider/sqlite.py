@@ -31,21 +31,250 @@
 #
 # =================================================================
 
+import base64
 import sqlite3
 import logging
 import os
+from contextlib import contextmanager
+from datetime import datetime, time, timedelta, timezone
+import functools
 import json
+import pathlib
+import queue
+import threading
 from pygeoapi.plugin import InvalidPluginError
 from pygeoapi.provider.base import (BaseProvider, ProviderConnectionError,
-                                    ProviderItemNotFoundError)
+                                    ProviderInvalidQueryError,
+                                    ProviderItemNotFoundError,
+                                    ProviderQueryError)
 from pygeoapi.cql_exception import CQLException
 from pygeoapi.plugin import load_plugin
+from pygeoapi.provider.file_index import get_file_signature
+from pygeoapi.provider.gpkg_geometry import decode_gpkg_geometry
+from pygeoapi.sqlite_where_clauses import index_filter
+from pygeoapi.util import get_datetime_interval
 
 LOGGER = logging.getLogger(__name__)
 
 SPATIALITE_EXTENSION = os.getenv('SPATIALITE_LIBRARY_PATH',
                                  'mod_spatialite.so')
 
+#: GeoPackage application ids (GPKG 1.2 and greater, GP10, GP11)
+GPKG_APPLICATION_IDS = (1196444487, 1196437808, 1196437809)
+
+#: result column of the geometry (GeoJSON or GeoPackage binary)
+GEOMETRY_COLUMN = '_pygeoapi_geometry'
+
+#: result columns of the sort key (for keyset pagination cursors)
+KEY_COLUMN = '_pygeoapi_key{}'
+
+#: default connection settings (provider definition ``pool``)
+POOL_DEFAULTS = {
+    'immutable': False,  # file never changes while served (no locking)
+    'mmap_size': 268435456,  # bytes of the file accessed memory-mapped
+    'cache_size': -16384,  # page cache per connection (KiB if negative)
+    'temp_store': 'memory',  # storage of temporary tables and indexes
+    'max_size': 8,  # connections open at once
+    'timeout': 30  # seconds to wait for a free connection
+}
+
+_POOLS = {}
+_POOLS_LOCK = threading.Lock()
+
+
+class ConnectionPool:
+    """
+    Thread safe pool of read-only connections to a SQLite database,
+    opened on demand with SpatiaLite loaded and kept open, blocking
+    when all connections are in use
+    """
+
+    def __init__(self, data, immutable=False, mmap_size=268435456,
+                 cache_size=-16384, temp_store='memory', max_size=8,
+                 timeout=30):
+        """
+        Initialize object
+
+        :param data: path of the database file
+        :param immutable: whether the file never changes while served
+                          (opened without locking nor change detection)
+        :param mmap_size: maximum number of bytes of the file accessed
+                          memory-mapped (``PRAGMA mmap_size``)
+        :param cache_size: page cache size of each connection, in pages,
+                           or in KiB if negative (``PRAGMA cache_size``)
+        :param temp_store: storage of temporary tables and indexes
+                           (``default``, ``file`` or ``memory``)
+        :param max_size: maximum number of connections open at once
+        :param timeout: seconds to wait for a connection
+
+        :returns: pygeoapi.provider.sqlite.ConnectionPool
+        """
+
+        if temp_store not in ['default', 'file', 'memory']:
+            LOGGER.error('Invalid temp_store: {}'.format(temp_store))
+            raise ProviderConnectionError()
+
+        self.uri = '{}?mode=ro{}'.format(
+            pathlib.Path(data).resolve().as_uri(),
+            '&immutable=1' if immutable else '')
+        self.pragmas = [
+            'PRAGMA mmap_size={:d}'.format(int(mmap_size)),
+            'PRAGMA cache_size={:d}'.format(int(cache_size)),
+            'PRAGMA temp_store={}'.format(temp_store)
+        ]
+        self.max_size = max_size
+        self.timeout = timeout
+
+        # most recently used first, keeping their page cache warm
+        self._idle = queue.LifoQueue()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def getconn(self):
+        """
+        Get a connection from the pool, opening one if none is idle
+        and the pool is not full
+
+        :returns: sqlite3.Connection
+        """
+
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            new = self._size < self.max_size
+            if new:
+                self._size += 1
+
+        if new:
+            try:
+                return self._connect()
+            except BaseException:
+                with self._lock:
+                    self._size -= 1
+                raise
+
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            msg = 'No connection available after {}s'.format(self.timeout)
+            LOGGER.error(msg)
+            raise ProviderConnectionError(msg)
+
+    def putconn(self, conn):
+        """
+        Return a connection to the pool, ending its transaction
+
+        :param conn: sqlite3.Connection
+
+        :returns: void
+        """
+
+        try:
+            conn.rollback()
+        except sqlite3.Error as err:
+            LOGGER.debug('Discarding broken connection: {}'.format(err))
+            conn.close()
+            with self._lock:
+                self._size -= 1
+            return
+
+        self._idle.put(conn)
+
+    @contextmanager
+    def connection(self):
+        """
+        Use a connection of the pool, returned to it afterwards
+
+        :returns: sqlite3.Connection
+        """
+
+        conn = self.getconn()
+        try:
+            yield conn
+        finally:
+            self.putconn(conn)
+
+    def _connect(self):
+        """
+        Open a read-only connection, with SpatiaLite loaded (and reading
+        GeoPackage geometries) and the connection settings applied
+
+        :returns: sqlite3.Connection
+        """
+
+        LOGGER.debug('Connecting to {}'.format(self.uri))
+        try:
+            # used by one thread at a time, though not always the same
+            conn = sqlite3.connect(self.uri, uri=True,
+                                   check_same_thread=False)
+        except sqlite3.Error as err:
+            LOGGER.error('Cannot open {}: {}'.format(self.uri, err))
+            raise ProviderConnectionError()
+
+        try:
+            conn.enable_load_extension(True)
+        except AttributeError as err:
+            LOGGER.error('Extension loading not enabled: {}'.format(err))
+            conn.close()
+            raise ProviderConnectionError()
+
+        try:
+            conn.execute("SELECT load_extension('{}')".format(
+                SPATIALITE_EXTENSION))
+            conn.enable_load_extension(False)
+        except sqlite3.OperationalError as err:
+            LOGGER.error('Extension loading error: {}'.format(err))
+            conn.close()
+            raise ProviderConnectionError()
+
+        conn.row_factory = sqlite3.Row
+        # conn.set_trace_callback(LOGGER.debug)
+        for pragma in self.pragmas:
+            conn.execute(pragma)
+
+        application_id = conn.execute('PRAGMA application_id').fetchone()[0]
+        if application_id in GPKG_APPLICATION_IDS:
+            # SpatiaLite functions reading GeoPackage geometries of the
+            # tables themselves (VirtualGPKG tables need a writable file)
+            conn.execute('SELECT EnableGpkgAmphibiousMode()')
+            if conn.execute(
+                    'SELECT GetGpkgAmphibiousMode()').fetchone()[0] != 1:
+                LOGGER.error('Cannot read GeoPackage geometries')
+                conn.close()
+                raise ProviderConnectionError()
+
+        return conn
+
+
+def get_pool(data, options=None):
+    """
+    Get the process-wide connection pool of a database file, creating it
+    on first use (pools are not shared with forked processes)
+
+    :param data: path of the database file
+    :param options: `dict` of connection settings (see `POOL_DEFAULTS`)
+
+    :returns: pygeoapi.provider.sqlite.ConnectionPool
+    """
+
+    settings = dict(POOL_DEFAULTS, **(options or {}))
+    key = (os.getpid(), os.path.abspath(data),
+           tuple(sorted(settings.items())))
+
+    pool = _POOLS.get(key)
+    if pool is None:
+        with _POOLS_LOCK:
+            pool = _POOLS.get(key)
+            if pool is None:
+                LOGGER.debug('Creating connection pool: {}'.format(
+                    settings))
+                pool = ConnectionPool(data, **settings)
+                _POOLS[key] = pool
+    return pool
+
 
 class SQLiteGPKGProvider(BaseProvider):
     """Generic provider for SQLITE and GPKG using sqlite3 module.
@@ -65,8 +294,12 @@ class SQLiteGPKGProvider(BaseProvider):
         BaseProvider.__init__(self, provider_def)
 
         self.table = provider_def['table']
+        self.pool = provider_def.get('pool', {})
+        self.pagination = provider_def.get('pagination', 'offset')
         self.application_id = None
         self.geom_col = None
+        self.spatial_index = None
+        self._count = None
 
         LOGGER.debug('Setting SQLite properties:')
         LOGGER.debug('Data source: {}'.format(self.data))
@@ -74,9 +307,8 @@ class SQLiteGPKGProvider(BaseProvider):
         LOGGER.debug('ID_field: {}'.format(self.id_field))
         LOGGER.debug('Table: {}'.format(self.table))
 
-        self.cursor = self.__load()
+        self.__load()
 
-        LOGGER.debug('Got cursor from DB')
         LOGGER.debug('Get available fields/properties')
 
         self.get_fields()
@@ -89,14 +321,16 @@ class SQLiteGPKGProvider(BaseProvider):
         """
 
         if not self.fields:
-            results = self.cursor.execute(
-                'PRAGMA table_info({})'.format(self.table)).fetchall()
+            with self.__get_connection() as conn:
+                results = conn.execute(
+                    'PRAGMA table_info({})'.format(self.table)).fetchall()
             [self.fields.update(
                 {item["name"]: item["type"].lower()}
             ) for item in results]
         return self.fields
 
-    def __get_where_clauses(self, properties=[], bbox=[]):
+    def __get_where_clauses(self, properties=[], bbox=[], datetime_=None,
+                            cql_where_clause=None):
         """
         Generarates WHERE conditions to be implemented in query.
         Private method mainly associated with query method.
@@ -106,34 +340,217 @@ class SQLiteGPKGProvider(BaseProvider):
 
         :param properties: list of tuples (name, value)
         :param bbox: bounding box [minx,miny,maxx,maxy]
+        :param datetime_: temporal (datestamp or extent)
+        :param cql_where_clause: CQL filter where clause (replacing
+                                 properties and bbox)
 
         :returns: str, tuple
         """
 
+        conditions = []
         where_values = tuple()
-        where_clause = " WHERE " if (properties or bbox) else ""
-        if not where_clause:
-            return where_clause, where_values
-
-        if properties:
-            where_clause += " AND ".join(
-                ["{}=?".format(k) for k, v in properties])
-            where_values += where_values + tuple((v for k, v in properties))
-
-        if bbox:
-            if properties:
-                where_clause += " AND "
-            where_clause += " Intersects({}, \
-                BuildMbr(?,?,?,?)) ".format(self.geom_col)
-            where_values += tuple(bbox)
+
+        if cql_where_clause:
+            conditions.append("({})".format(cql_where_clause))
+
+        else:
+            for k, v in properties:
+                conditions.append("{}=?".format(k))
+                where_values += (v,)
+
+            if bbox:
+                if self.spatial_index:
+                    # indexed pre-filter before the exact predicate
+                    conditions.append(index_filter(
+                        self.spatial_index, ['?'] * 4))
+                    where_values += tuple(bbox)
+                conditions.append("Intersects({}, BuildMbr(?,?,?,?))".format(
+                    self.geom_col))
+                where_values += tuple(bbox)
+
+        if datetime_ is not None:
+            condition, values = self.__get_datetime_condition(datetime_)
+            conditions.append(condition)
+            where_values += values
+
+        if not conditions:
+            return "", where_values
+
         # WHERE continent=? <class 'tuple'>: ('Europe',)
-        return where_clause, where_values
+        return " WHERE " + " AND ".join(conditions), where_values
+
+    def __get_datetime_condition(self, datetime_):
+        """
+        Generates the WHERE condition of a datetime instant or interval
+        on the time field. GeoPackage DATE values (ISO 8601 text) are
+        compared as stored; DATETIME values, which may omit the seconds
+        or milliseconds, are normalised to YYYY-MM-DDTHH:MM:SS.SSSZ
+        behind a text range on the minute, which can use an index of the
+        time field. Other values are compared as timestamps.
+
+        :param datetime_: temporal (datestamp or extent)
+
+        :returns: str, tuple
+        """
+
+        if self.time_field is None:
+            LOGGER.error('time_field not enabled for collection')
+            raise ProviderQueryError()
+
+        begin, end = get_datetime_interval(datetime_)
+        type_ = self.fields.get(self.time_field)
+        column = '"{}"'.format(self.time_field)
+
+        conditions = ['{} IS NOT NULL'.format(column)]
+        values = tuple()
+        for bound, op in [(begin, '>='), (end, '<=')]:
+            if bound is None:
+                continue
+            if self.application_id and type_ in ['date', 'datetime']:
+                value = datetime.fromtimestamp(bound, timezone.utc)
+                if type_ == 'date':
+                    if op == '>=' and value.time() != time.min:
+                        value += timedelta(days=1)
+                    value = value.strftime('%Y-%m-%d')
+                    conditions.append('{}{}?'.format(column, op))
+                else:
+                    minute = value.strftime('%Y-%m-%dT%H:%M')
+                    value = '{}Z'.format(
+                        value.strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3])
+                    # any stored form of the bound minute sorts between
+                    # YYYY-MM-DDTHH:MM and YYYY-MM-DDTHH:MMZ as text
+                    conditions.append('{}{}?'.format(column, op))
+                    values += (minute if op == '>=' else minute + 'Z',)
+                    conditions.append(
+                        "strftime('%Y-%m-%dT%H:%M:%fZ', {}){}?".format(
+                            column, op))
+            else:
+                value = round(bound, 3)
+                conditions.append(
+                    'round((julianday({}) - 2440587.5) * 86400.0, 3)'
+                    '{}?'.format(column, op))
+            values += (value,)
+
+        return " AND ".join(conditions), values
+
+    def __get_order_by(self, sortby=[]):
+        """
+        Get the sort keys of a query: the sortby properties, then the
+        rowid (for a deterministic order), descending if all the sortby
+        properties are
+
+        :param sortby: list of dicts (property, order)
+
+        :returns: `list` of `tuple` of column and order (A or D), empty
+                  without sortby (unless paginated by keyset)
+        """
+
+        if not sortby and self.pagination != 'keyset':
+            return []
+
+        order_by = [(sort['property'], sort['order']) for sort in sortby]
+        if sortby and all(order == 'D' for _, order in order_by):
+            order_by.append(('ROWID', 'D'))
+        else:
+            order_by.append(('ROWID', 'A'))
+        return order_by
+
+    def __get_keyset_condition(self, order_by, cursor):
+        """
+        Generates the WHERE condition selecting the rows after a keyset
+        pagination cursor, i.e. (a, b) > (x, y) if all the keys are
+        ascending, (a, b) < (x, y) OR a IS NULL if all are descending
+        (with not null cursor values), (a > x) OR (a IS x AND b < y) ...
+        otherwise
+
+        :param order_by: list of tuples (column, order)
+        :param cursor: pagination cursor (sort key of the last row of
+                       the previous page)
+
+        :returns: str, tuple
+        """
+
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        except (ValueError, TypeError) as err:
+            LOGGER.error('Invalid cursor {}: {}'.format(cursor, err))
+            raise ProviderInvalidQueryError('invalid cursor')
+
+        if not isinstance(values, list) or len(values) != len(order_by):
+            LOGGER.error('Invalid cursor {} for {}'.format(cursor, order_by))
+            raise ProviderInvalidQueryError('invalid cursor')
+
+        orders = {order for _, order in order_by}
+        if len(orders) == 1 and None not in values:
+            # row value comparison, usable as an index range
+            condition = "({}) {} ({})".format(
+                ",".join([column for column, _ in order_by]),
+                '<' if orders == {'D'} else '>',
+                ",".join(['?'] * len(values)))
+            condition_values = tuple(values)
+            if orders == {'D'}:
+                # NULL sorts after any value, but fails the comparison
+                alternatives = [condition]
+                for i, (column, _) in enumerate(order_by[:-1]):
+                    terms = ["{} IS ?".format(c) for c, _ in order_by[:i]]
+                    terms.append("{} IS NULL".format(column))
+                    alternatives.append("({})".format(" AND ".join(terms)))
+                    condition_values += tuple(values[:i])
+                condition = "({})".format(" OR ".join(alternatives))
+            return condition, condition_values
+
+        # NULL sorts before any value
+        alternatives = []
+        condition_values = tuple()
+        for i, (column, order) in enumerate(order_by):
+            terms = ["{} IS ?".format(c) for c, _ in order_by[:i]]
+            terms_values = tuple(values[:i])
+            if values[i] is None:
+                if order == 'D':
+                    continue
+                terms.append("{} IS NOT NULL".format(column))
+            elif order == 'D':
+                terms.append("({0}<? OR {0} IS NULL)".format(column))
+                terms_values += (values[i],)
+            else:
+                terms.append("{}>?".format(column))
+                terms_values += (values[i],)
+            alternatives.append("({})".format(" AND ".join(terms)))
+            condition_values += terms_values
+
+        return "({})".format(" OR ".join(alternatives)), condition_values
+
+    def __get_count(self, cursor):
+        """
+        Get the number of rows of the table, cached until the database
+        file (or its write-ahead log) changes
+
+        :param cursor: sqlite3.Cursor
 
-    def __response_feature(self, row_data):
+        :returns: int
+        """
+
+        signature = (get_file_signature(self.data),
+                     get_file_signature('{}-wal'.format(self.data)))
+
+        count = self._count
+        if count is None or count[0] != signature:
+            LOGGER.debug('Counting rows of {}'.format(self.table))
+            hits = cursor.execute("SELECT COUNT(*) as hits FROM {}".format(
+                self.table)).fetchone()["hits"]
+            count = (signature, hits)
+            self._count = count
+
+        return count[1]
+
+    def __response_feature(self, row_data, decode=json.loads, hidden=[]):
         """
         Assembles GeoJSON output from DB query
 
         :param row_data: DB row result
+        :param decode: function decoding the geometry column to a
+                       GeoJSON geometry (default from GeoJSON text)
+        :param hidden: list of columns not returned as properties
 
         :returns: `dict` of GeoJSON Feature
         """
@@ -143,9 +560,13 @@ class SQLiteGPKGProvider(BaseProvider):
             feature = {
                 'type': 'Feature'
             }
-            feature["geometry"] = json.loads(
-                rd.pop('AsGeoJSON({})'.format(self.geom_col))
-            )
+            try:
+                feature["geometry"] = decode(rd.pop(GEOMETRY_COLUMN))
+            except ValueError as err:
+                LOGGER.error('Invalid geometry: {}'.format(err))
+                raise ProviderQueryError()
+            for column in hidden:
+                rd.pop(column)
             feature['properties'] = rd
             feature['id'] = feature['properties'].pop(self.id_field)
 
@@ -165,37 +586,39 @@ class SQLiteGPKGProvider(BaseProvider):
 
         return feature_collection
 
+    def __get_connection(self):
+        """
+        Get a connection of the pool of the database, to be used as
+        'with' statement
+
+        :returns: context manager of sqlite3.Connection
+        """
+
+        return get_pool(self.data, self.pool).connection()
+
     def __load(self):
         """
-        Private method for loading spatiallite,
-        get the table structure and dump geometry
+        Private method for opening the database,
+        get the table structure and spatial index
 
-        :returns: sqlite3.Cursor
+        :returns: void
         """
 
-        if (os.path.exists(self.data)):
-            conn = sqlite3.connect(self.data)
-        else:
+        if not os.path.exists(self.data):
             LOGGER.error('Path to sqlite does not exist')
             raise InvalidPluginError()
 
-        try:
-            conn.enable_load_extension(True)
-        except AttributeError as err:
-            LOGGER.error('Extension loading not enabled: {}'.format(err))
-            raise ProviderConnectionError()
+        with self.__get_connection() as conn:
+            self.__load_table(conn.cursor())
 
-        conn.row_factory = sqlite3.Row
-        conn.enable_load_extension(True)
-        # conn.set_trace_callback(LOGGER.debug)
-        cursor = conn.cursor()
-        try:
-            cursor.execute("SELECT load_extension('{}')".format(
-                SPATIALITE_EXTENSION))
-        except sqlite3.OperationalError as err:
-            LOGGER.error('Extension loading error: {}'.format(err))
-            raise ProviderConnectionError()
-        result = cursor.fetchall()
+    def __load_table(self, cursor):
+        """
+        Get the table structure and spatial index
+
+        :param cursor: sqlite3.Cursor
+
+        :returns: void
+        """
 
         # Checking for geopackage
         cursor.execute("PRAGMA application_id")
@@ -204,22 +627,12 @@ class SQLiteGPKGProvider(BaseProvider):
         self.application_id = result["application_id"]
         if self.application_id == 1196444487:
             LOGGER.info("Detected GPKG 1.2 and greater")
-        elif self.application_id == 1196437808:
+        elif self.application_id in GPKG_APPLICATION_IDS:
             LOGGER.info("Detected GPKG 1.0 or 1.1")
         else:
             LOGGER.info("No GPKG detected assuming spatial sqlite3")
             self.application_id = 0
 
-        if self.application_id:
-            cursor.execute("SELECT AutoGPKGStart()")
-            result = cursor.fetchall()
-            if result[0][0] == 1:
-                LOGGER.info("Loaded Geopackage support")
-            else:
-                LOGGER.info("SELECT AutoGPKGStart() returned 0." +
-                            "Detected GPKG but couldnt load support")
-                raise InvalidPluginError
-
         if self.application_id:
             self.geom_col = "geom"
         else:
@@ -240,19 +653,103 @@ class SQLiteGPKGProvider(BaseProvider):
         except AssertionError:
             raise InvalidPluginError
 
-        self.columns = [item[1] for item in result if item[1]
-                        not in [self.geom_col, self.geom_col.upper()]]
-        self.columns = ','.join(self.columns) + ',AsGeoJSON({})'.format(
-            self.geom_col)
+        self.column_names = [item[1] for item in result if item[1]
+                             not in [self.geom_col, self.geom_col.upper()]]
+        self.columns, _, self.decode = self.__get_columns()
+        self.spatial_index = self.__get_spatial_index(cursor)
 
-        if self.application_id:
-            self.table = "vgpkg_{}".format(self.table)
+    def __get_spatial_index(self, cursor):
+        """
+        Detect the R-tree index of the geometries: the ``rtree_`` table
+        of a GeoPackage, or the ``idx_`` table of a SpatiaLite database
+        when its spatial index is enabled
 
-        return cursor
+        :param cursor: sqlite3.Cursor
+
+        :returns: `tuple` of the R-tree table name and the names of its
+                  id, minx, maxx, miny and maxy columns, or `None`
+        """
+
+        try:
+            if self.application_id:
+                name = 'rtree_{}_{}'.format(self.table, self.geom_col)
+            else:
+                cursor.execute(
+                    'SELECT spatial_index_enabled FROM geometry_columns '
+                    'WHERE lower(f_table_name)=lower(?) AND '
+                    'lower(f_geometry_column)=lower(?)',
+                    (self.table, self.geom_col))
+                result = cursor.fetchone()
+                if not result or result[0] != 1:
+                    LOGGER.debug('No spatial index')
+                    return None
+                name = 'idx_{}_{}'.format(self.table, self.geom_col)
+
+            cursor.execute('PRAGMA table_info("{}")'.format(name))
+            result = cursor.fetchall()
+        except sqlite3.OperationalError as err:
+            LOGGER.debug('No spatial index: {}'.format(err))
+            return None
+
+        if len(result) != 5:
+            LOGGER.debug('No spatial index')
+            return None
+
+        LOGGER.debug('Using spatial index {}'.format(name))
+        return tuple([name] + [item[1] for item in result])
+
+    def __get_columns(self, select_properties=[], simplify=None,
+                      precision=None):
+        """
+        Get the columns to read: the id field and the properties to
+        return (provider ``properties``, in order, or all columns),
+        restricted to `select_properties` if any, and the geometry
+        (simplified and with limited precision if requested).
+
+        GeoPackage geometries are read as is and decoded in Python,
+        unless simplified by SpatiaLite
+
+        :param select_properties: list of property names to return
+        :param simplify: tolerance of the simplification of the geometry,
+                         preserving its topology (default none)
+        :param precision: maximum number of decimal digits of the
+                          coordinates (default SpatiaLite default)
+
+        :returns: str of comma separated columns, tuple of the values
+                  of their parameters, function decoding the geometry
+                  column to a GeoJSON geometry
+        """
+
+        columns = self.properties or self.column_names
+        if select_properties:
+            columns = [c for c in columns if c in select_properties]
+
+        columns = [self.id_field] + [c for c in columns if c != self.id_field]
+
+        geometry = self.geom_col
+        values = tuple()
+        if self.application_id and not simplify:
+            decode = functools.partial(decode_gpkg_geometry,
+                                       precision=precision)
+        else:
+            decode = json.loads
+            if simplify:
+                geometry = 'SimplifyPreserveTopology({},?)'.format(geometry)
+                values += (float(simplify),)
+            if precision is None:
+                geometry = 'AsGeoJSON({})'.format(geometry)
+            else:
+                geometry = 'AsGeoJSON({},?)'.format(geometry)
+                values += (int(precision),)
+
+        columns.append('{} AS {}'.format(geometry, GEOMETRY_COLUMN))
+
+        return ','.join(columns), values, decode
 
     def query(self, startindex=0, limit=10, resulttype='results',
               bbox=[], datetime=None, properties=[], sortby=[],
-              cql_expression=None):
+              cql_expression=None, cursor=None, select_properties=[],
+              simplify=None, precision=None):
         """
         Query SQLite/GPKG for all the content.
         e,g: http://localhost:5000/collections/countries/items?
@@ -266,11 +763,21 @@ class SQLiteGPKGProvider(BaseProvider):
         :param datetime: temporal (datestamp or extent)
         :param properties: list of tuples (name, value)
         :param sortby: list of dicts (property, order)
+        :param cql_expression: CQL filter expression
+        :param cursor: keyset pagination cursor (`next_cursor` of the
+                       previous page), only with ``pagination: keyset``
+        :param select_properties: list of property names to return
+                                  (default all)
+        :param simplify: tolerance of the simplification of the
+                         geometries (default none)
+        :param precision: maximum number of decimal digits of the
+                          coordinates (default SpatiaLite default)
 
         :returns: GeoJSON FeaturesCollection
         """
         LOGGER.debug('Querying SQLite/GPKG')
 
+        cql_where_clause = None
         if cql_expression:
             try:
                 fields = self.get_fields()
@@ -282,61 +789,133 @@ class SQLiteGPKGProvider(BaseProvider):
                                           {'name': 'CQL',
                                            'cql_expression': cql_expression,
                                            'feature_list': None,
-                                           'field_list': field_list})
+                                           'field_list': field_list,
+                                           'spatial_index':
+                                           self.spatial_index})
 
                 cql_where_clause = cql_handler.sqlite_where_clause()
 
-                if resulttype == 'hits':
-                    sql_query = "SELECT COUNT(*) as hits FROM {} WHERE " \
-                                "{} ".format(self.table, cql_where_clause)
+            except Exception as err:
+                LOGGER.debug('Invalid CQL filter evaluation: {}'.format(err))
+                raise CQLException()
+
+        where_clause, where_values = self.__get_where_clauses(
+            properties=properties, bbox=bbox, datetime_=datetime,
+            cql_where_clause=cql_where_clause)
 
-                    res = self.cursor.execute(sql_query)
+        with self.__get_connection() as conn:
+            db_cursor = conn.cursor()
 
-                    hits = res.fetchone()["hits"]
+            # page and number of matching rows read from the same
+            # snapshot (transaction ended when returning the connection)
+            try:
+                db_cursor.execute('BEGIN')
+                if resulttype == 'hits':
+                    hits = self.__get_hits(
+                        db_cursor, where_clause, where_values)
                     return self.__response_feature_hits(hits)
 
-                sql_query = "SELECT DISTINCT {} from \
-                    {} WHERE {} limit ? offset ?".format(
-                    self.columns, self.table, cql_where_clause)
+                return self.__get_features(
+                    db_cursor, where_clause, where_values, startindex,
+                    limit, sortby, cursor, select_properties, simplify,
+                    precision)
 
-                end_index = startindex + limit
+            except sqlite3.Error as err:
+                if cql_expression:
+                    LOGGER.debug('Invalid CQL filter evaluation: {}'.format(
+                        err))
+                    raise CQLException()
+                LOGGER.error('Error executing sql_query: {}'.format(err))
+                raise ProviderQueryError()
 
-                LOGGER.debug('SQL Query: {}'.format(sql_query))
-                LOGGER.debug('Start Index: {}'.format(startindex))
-                LOGGER.debug('End Index: {}'.format(end_index))
+    def __get_hits(self, cursor, where_clause, where_values):
+        """
+        Count the rows matching a WHERE clause (the rows of the table,
+        counted once per version of the file, without)
 
-                row_data = self.cursor.execute(
-                    sql_query, (limit, startindex))
+        :param cursor: sqlite3.Cursor
+        :param where_clause: str WHERE clause
+        :param where_values: tuple of the values of its parameters
 
-            except Exception as err:
-                LOGGER.debug('Invalid CQL filter evaluation: {}'.format(err))
-                raise CQLException()
+        :returns: int
+        """
 
-        else:
-            where_clause, where_values = self.__get_where_clauses(
-                properties=properties, bbox=bbox)
+        if not where_clause:
+            return self.__get_count(cursor)
 
-            if resulttype == 'hits':
-                sql_query = "SELECT COUNT(*) as hits FROM {} {} ".format(
-                    self.table, where_clause)
+        sql_query = "SELECT COUNT(*) as hits FROM {} {} ".format(
+            self.table, where_clause)
 
-                res = self.cursor.execute(sql_query, where_values)
+        LOGGER.debug('SQL Query: {}'.format(sql_query))
+        res = cursor.execute(sql_query, where_values)
 
-                hits = res.fetchone()["hits"]
-                return self.__response_feature_hits(hits)
+        return res.fetchone()["hits"]
 
-            sql_query = "SELECT DISTINCT {} from \
-                {} {} limit ? offset ?".format(
-                self.columns, self.table, where_clause)
+    def __get_features(self, cursor, where_clause, where_values,
+                       startindex=0, limit=10, sortby=[], after=None,
+                       select_properties=[], simplify=None, precision=None):
+        """
+        Query a page of the rows matching a WHERE clause (after a keyset
+        pagination cursor if any), with the number of matching rows
+        (derived from the page when it is the last one, counted
+        otherwise)
+
+        :param cursor: sqlite3.Cursor
+        :param where_clause: str WHERE clause
+        :param where_values: tuple of the values of its parameters
+        :param startindex: starting record to return (default 0)
+        :param limit: number of records to return (default 10)
+        :param sortby: list of dicts (property, order)
+        :param after: keyset pagination cursor
+        :param select_properties: list of property names to return
+                                  (default all)
+        :param simplify: tolerance of the simplification of the
+                         geometries (default none)
+        :param precision: maximum number of decimal digits of the
+                          coordinates (default SpatiaLite default)
 
-            end_index = startindex + limit
+        :returns: GeoJSON FeaturesCollection
+        """
 
-            LOGGER.debug('SQL Query: {}'.format(sql_query))
-            LOGGER.debug('Start Index: {}'.format(startindex))
-            LOGGER.debug('End Index: {}'.format(end_index))
+        columns, values, decode = self.__get_columns(
+            select_properties, simplify, precision)
+
+        order_by = self.__get_order_by(sortby)
+        order_by_clause = ""
+        if order_by:
+            order_by_clause = " ORDER BY " + ",".join(
+                ["{} DESC".format(column) if order == 'D' else column
+                 for column, order in order_by])
+
+        hidden = []
+        page_where_clause = where_clause
+        page_where_values = where_values
+        if self.pagination == 'keyset':
+            # sort key of the rows, for the cursor of the next page
+            hidden = [KEY_COLUMN.format(i) for i in range(len(order_by))]
+            columns += ''.join([',{} AS {}'.format(column, key)
+                                for (column, _), key in zip(order_by, hidden)])
+            if after is not None:
+                condition, condition_values = self.__get_keyset_condition(
+                    order_by, after)
+                page_where_clause = '{} AND {}'.format(
+                    where_clause, condition) if where_clause \
+                    else ' WHERE {}'.format(condition)
+                page_where_values = where_values + condition_values
+
+        sql_query = "SELECT DISTINCT {} from \
+            {} {}{} limit ? offset ?".format(
+            columns, self.table, page_where_clause, order_by_clause)
+
+        end_index = startindex + limit
 
-            row_data = self.cursor.execute(
-                sql_query, where_values + (limit, startindex))
+        LOGGER.debug('SQL Query: {}'.format(sql_query))
+        LOGGER.debug('Start Index: {}'.format(startindex))
+        LOGGER.debug('End Index: {}'.format(end_index))
+
+        row_data = cursor.execute(
+            sql_query, values + page_where_values + (limit, startindex)
+        ).fetchall()
 
         feature_collection = {
             'type': 'FeatureCollection',
@@ -345,7 +924,30 @@ class SQLiteGPKGProvider(BaseProvider):
 
         for rd in row_data:
             feature_collection['features'].append(
-                self.__response_feature(rd))
+                self.__response_feature(rd, decode, hidden))
+
+        returned = len(feature_collection['features'])
+        if after is not None:
+            # rows before the cursor unknown: only the cheap count of
+            # all the rows, counting each page would make crawling
+            # quadratic
+            if not where_clause:
+                feature_collection['numberMatched'] = self.__get_count(
+                    cursor)
+        elif returned < limit and (returned or not startindex):
+            # last page: no need to count
+            feature_collection['numberMatched'] = startindex + returned
+        else:
+            feature_collection['numberMatched'] = self.__get_hits(
+                cursor, where_clause, where_values)
+
+        feature_collection['numberReturned'] = returned
+
+        if self.pagination == 'keyset' and returned == limit:
+            last = row_data[-1]
+            feature_collection['next_cursor'] = base64.urlsafe_b64encode(
+                json.dumps([last[key] for key in hidden],
+                           default=str).encode()).decode()
 
         return feature_collection
 
@@ -368,9 +970,10 @@ class SQLiteGPKGProvider(BaseProvider):
         LOGGER.debug('SQL Query: {}'.format(sql_query))
         LOGGER.debug('Identifier: {}'.format(identifier))
 
-        row_data = self.cursor.execute(sql_query, (identifier,)).fetchone()
+        with self.__get_connection() as conn:
+            row_data = conn.execute(sql_query, (identifier,)).fetchone()
 
-        feature = self.__response_feature(row_data)
+        feature = self.__response_feature(row_data, self.decode)
         if feature:
             return feature
         else:
@@ -286,8 +286,43 @@ Spatial_Operator = {
 }
 
 
+#: operations implying that the envelopes of the geometries intersect
+Envelope_Operations = ['INTERSECTS', 'WITHIN', 'CONTAINS', 'TOUCHES',
+                       'CROSSES', 'EQUALS', 'OVERLAPS']
+
+
+def index_filter(spatial_index, bbox):
+    """
+    Create an R-tree index pre-filter of the rows whose envelope
+    intersects a bounding box, i.e. whose upper bounds are not below
+    the lower bounds of the bounding box and whose lower bounds are not
+    above its upper bounds.
+
+    :param spatial_index: the R-tree table name and the names of its id,
+                          minx, maxx, miny and maxy columns
+    :type spatial_index: tuple
+    :param bbox: the bounding box as minx, miny, maxx, maxy (SQL
+                 expressions, appearing in that order in the clause)
+    :type bbox: list
+
+    :return: sql where clause
+    :rtype: str
+    """
+
+    table, id_, minx_, maxx_, miny_, maxy_ = spatial_index
+    minx, miny, maxx, maxy = bbox
+
+    where_clause = \
+        'ROWID IN (SELECT "{id}" FROM "{table}" WHERE ' \
+        '"{maxx_}">={minx} AND "{maxy_}">={miny} AND ' \
+        '"{minx_}"<={maxx} AND "{miny_}"<={maxy})'.format(
+            id=id_, table=table, minx_=minx_, maxx_=maxx_, miny_=miny_,
+            maxy_=maxy_, minx=minx, miny=miny, maxx=maxx, maxy=maxy)
+    return where_clause
+
+
 def spatial(feature_list, field_list, lhs, rhs, op,
-            pattern=None, distance=None, units=None):
+            pattern=None, distance=None, units=None, spatial_index=None):
     """
     Create a spatial filter for the given spatial attribute.
 
@@ -312,6 +347,9 @@ def spatial(feature_list, field_list, lhs, rhs, op,
     :type distance: float
     :param units: the units the distance is expressed in
     :type units: str
+    :param spatial_index: the R-tree index of the geometries, if any
+                          (see `index_filter`)
+    :type spatial_index: tuple
 
     :return: sql where clause
     :rtype: str
@@ -360,6 +398,15 @@ def spatial(feature_list, field_list, lhs, rhs, op,
                            geometry=field_list[lhs],
                            parameter=rhs)
 
+            if spatial_index and op in Envelope_Operations:
+                # indexed pre-filter before the exact predicate
+                geometry = "ST_GeomFromText('{}')".format(rhs)
+                where_clause = "({} AND {})".format(index_filter(
+                    spatial_index,
+                    ["{}({})".format(function, geometry) for function in
+                     ['MbrMinX', 'MbrMinY', 'MbrMaxX', 'MbrMaxY']]),
+                    where_clause)
+
         return where_clause
 
     except KeyError:
@@ -372,7 +419,7 @@ def spatial(feature_list, field_list, lhs, rhs, op,
 
 
 def bbox(feature_list, field_list, lhs, minx, miny, maxx, maxy,
-         crs=None, bboverlaps=True):
+         crs=None, bboverlaps=True, spatial_index=None):
     """
     Create a bounding box filter for the given spatial attribute.
 
@@ -393,6 +440,9 @@ def bbox(feature_list, field_list, lhs, minx, miny, maxx, maxy,
     :type maxy: float
     :param crs: the CRS the bbox is expressed in
     :type crs: str
+    :param spatial_index: the R-tree index of the geometries, if any
+                          (see `index_filter`)
+    :type spatial_index: tuple
 
     :return: sql where clause
     :rtype: str
@@ -411,6 +461,13 @@ def bbox(feature_list, field_list, lhs, minx, miny, maxx, maxy,
 
         where_clause = "ST_Intersects({geometry},ST_ENVELOPE('{bbox}')" \
                        ")".format(geometry=field_list[lhs], bbox=bbox)
+
+        if spatial_index:
+            # indexed pre-filter before the exact predicate
+            where_clause = "({} AND {})".format(index_filter(
+                spatial_index, [float(v) for v in (minx, miny, maxx, maxy)]),
+                where_clause)
+
         return where_clause
 
     except Exception as err:
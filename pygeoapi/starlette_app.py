@@ -37,7 +37,7 @@ import click
 from starlette.staticfiles import StaticFiles
 from starlette.applications import Starlette
 from starlette.requests import Request
-from starlette.responses import Response
+from starlette.responses import Response, StreamingResponse
 import uvicorn
 
 from pygeoapi.api import API
@@ -69,6 +69,7 @@ if (OGC_SCHEMAS_LOCATION is not None and
     app.mount('/schemas', StaticFiles(directory=OGC_SCHEMAS_LOCATION))
 
 api_ = API(CONFIG)
+api_.warmup()
 
 
 @app.route('/')
@@ -196,15 +197,20 @@ async def collection_items(request: Request, collection_id=None, item_id=None):
         collection_id = request.path_params['collection_id']
     if 'item_id' in request.path_params:
         item_id = request.path_params['item_id']
+    # providers are queried without blocking the event loop
     if item_id is None:
-        headers, status_code, content = api_.get_collection_items(
+        headers, status_code, content = await api_.get_collection_items_async(
             request.headers, request.query_params,
             collection_id, pathinfo=request.scope['path'])
     else:
-        headers, status_code, content = api_.get_collection_item(
+        headers, status_code, content = await api_.get_collection_item_async(
             request.headers, request.query_params, collection_id, item_id)
 
-    response = Response(content=content, status_code=status_code)
+    if isinstance(content, (str, bytes)):
+        response = Response(content=content, status_code=status_code)
+    else:
+        # JSON written incrementally
+        response = StreamingResponse(content, status_code=status_code)
 
     if headers:
         response.headers.update(headers)
@@ -30,8 +30,9 @@
 """Generic util functions used in the code"""
 
 import base64
-from datetime import date, datetime, time
+from datetime import date, datetime, time, timezone
 from decimal import Decimal
+from functools import cmp_to_key
 import json
 import logging
 import mimetypes
@@ -39,11 +40,13 @@ import os
 import re
 from urllib.parse import urlparse
 
+from dateutil.parser import isoparse, parse as dateparse
 from jinja2 import Environment, FileSystemLoader
 import yaml
 
 from pygeoapi import __version__
-from pygeoapi.provider.base import ProviderTypeError
+from pygeoapi.provider.base import (ProviderInvalidQueryError,
+                                    ProviderTypeError)
 
 LOGGER = logging.getLogger(__name__)
 
@@ -161,6 +164,51 @@ def to_json(dict_, pretty=False):
     return json.dumps(dict_, default=json_serial, indent=indent)
 
 
+class RawJSONList(list):
+    """
+    List of already serialized JSON values (e.g. GeoJSON features built
+    by a database), written as is by `to_json_stream`
+    """
+
+    def decode(self):
+        """
+        Deserialize the values
+
+        :returns: `list` of values
+        """
+
+        return [json.loads(value) for value in self]
+
+
+def to_json_stream(dict_, pretty=False, chunk_size=1000):
+    """
+    Serialize dict to json incrementally, writing its `features` as is
+    when they are already serialized (`RawJSONList`)
+
+    :param dict_: `dict` of JSON representation
+    :param pretty: `bool` of whether to prettify JSON (default is `False`)
+    :param chunk_size: number of features per chunk
+
+    :returns: generator of JSON string chunks
+    """
+
+    features = dict_.get('features')
+    if not isinstance(features, RawJSONList):
+        yield to_json(dict_, pretty)
+        return
+
+    # features last, so the last "features" key is the top-level one
+    head = {key: value for key, value in dict_.items() if key != 'features'}
+    head['features'] = []
+    before, after = to_json(head, pretty).rsplit('"features": []', 1)
+
+    yield before + '"features": ['
+    for i in range(0, len(features), chunk_size):
+        yield '{}{}'.format(',' if i else '',
+                            ','.join(features[i:i + chunk_size]))
+    yield ']' + after
+
+
 def get_path_basename(urlpath):
     """
     Helper function to derive file basename
@@ -242,6 +290,174 @@ def render_j2_template(config, template, data):
     return template.render(config=config, data=data, version=__version__)
 
 
+def get_envelope(geometry):
+    """
+    helper function to compute the envelope of a GeoJSON geometry
+
+    :param geometry: `dict` of GeoJSON geometry
+
+    :returns: `tuple` of minx, miny, maxx, maxy (`None` if empty/null)
+    """
+
+    if not geometry:
+        return None
+
+    if geometry.get('type') == 'GeometryCollection':
+        envelopes = [e for e in map(get_envelope,
+                                    geometry.get('geometries', [])) if e]
+        if not envelopes:
+            return None
+        return (min(e[0] for e in envelopes), min(e[1] for e in envelopes),
+                max(e[2] for e in envelopes), max(e[3] for e in envelopes))
+
+    coords = geometry.get('coordinates')
+    if not coords:
+        return None
+
+    if isinstance(coords[0], (int, float)):  # Point
+        coords = [coords]
+
+    # flatten nested coordinate arrays down to positions
+    while coords and coords[0] and isinstance(coords[0][0], list):
+        coords = [c for part in coords for c in part]
+
+    coords = [c for c in coords if c]
+    if not coords:
+        return None
+
+    xs = [c[0] for c in coords]
+    ys = [c[1] for c in coords]
+
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def get_bbox_2d(bbox):
+    """
+    helper function to get the 2D part of a bbox query parameter
+
+    :param bbox: `list` of minx, miny, maxx, maxy (or minx, miny, minz,
+                 maxx, maxy, maxz)
+
+    :returns: `tuple` of minx, miny, maxx, maxy
+    """
+
+    if len(bbox) == 6:
+        return bbox[0], bbox[1], bbox[3], bbox[4]
+    return tuple(bbox[:4])
+
+
+def get_timestamp(value):
+    """
+    helper function to get the POSIX timestamp of a date/datetime value
+    (naive datetimes are assumed to be UTC)
+
+    :param value: `str` (ISO8601), `datetime.date` or `datetime.datetime`
+
+    :returns: `float` POSIX timestamp (`None` if not a valid datetime)
+    """
+
+    if isinstance(value, str):
+        try:
+            value = isoparse(value)
+        except ValueError:
+            try:
+                value = dateparse(value)
+            except (ValueError, OverflowError):
+                return None
+
+    if not isinstance(value, datetime):
+        if not isinstance(value, date):
+            return None
+        value = datetime.combine(value, time.min)
+
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+
+    return value.timestamp()
+
+
+def get_datetime_interval(datetime_):
+    """
+    helper function to parse a datetime query parameter
+
+    :param datetime_: `str` of datetime instant or interval
+                      (`begin/end`, `..` for an open end)
+
+    :returns: `tuple` of begin and end POSIX timestamps
+              (`None` for an open end)
+    """
+
+    bounds = datetime_.split('/')
+    if len(bounds) == 1:
+        bounds *= 2
+    elif len(bounds) != 2:
+        msg = 'Invalid datetime interval: {}'.format(datetime_)
+        LOGGER.error(msg)
+        raise ProviderInvalidQueryError(msg)
+
+    interval = []
+    for bound in bounds:
+        if bound in ['..', '']:
+            interval.append(None)
+            continue
+        timestamp = get_timestamp(bound)
+        if timestamp is None:
+            msg = 'Invalid datetime: {}'.format(bound)
+            LOGGER.error(msg)
+            raise ProviderInvalidQueryError(msg)
+        interval.append(timestamp)
+
+    return tuple(interval)
+
+
+def _sortable(value):
+    """
+    helper function to make values of different types comparable
+    (nulls first, then numbers, then strings)
+
+    :param value: value
+
+    :returns: `tuple` of type rank and value
+    """
+
+    if isinstance(value, str):
+        value = get_typed_value(value)
+
+    if value is None:
+        return 0, 0
+    elif isinstance(value, (int, float)):
+        return 1, value
+    return 2, str(value)
+
+
+def get_sort_key(sortby):
+    """
+    helper function to get a key function ordering records according to
+    a sortby query parameter
+
+    :param sortby: `list` of dicts (property, order)
+
+    :returns: function taking a `dict` of record properties and returning
+              its sort key
+    """
+
+    names = [sort['property'] for sort in sortby]
+    orders = [-1 if sort['order'] == 'D' else 1 for sort in sortby]
+
+    def compare(a, b):
+        for x, y, order in zip(a, b, orders):
+            if x != y:
+                return order if x > y else -order
+        return 0
+
+    wrapper = cmp_to_key(compare)
+
+    def key(properties):
+        return wrapper([_sortable(properties.get(name)) for name in names])
+
+    return key
+
+
 def get_mimetype(filename):
     """
     helper function to return MIME type of a given file
@@ -27,6 +27,7 @@
 #
 # =================================================================
 
+import asyncio
 import json
 import os
 import logging
@@ -38,6 +39,7 @@ from werkzeug.wrappers import Request
 from werkzeug.datastructures import ImmutableMultiDict
 
 from pygeoapi.api import API, check_format
+from pygeoapi.plugin import ProviderRegistry
 from pygeoapi.util import yaml_load
 
 LOGGER = logging.getLogger(__name__)
@@ -397,7 +399,7 @@ def test_get_collection_items(config, api_):
         req_headers, {
             'startindex': 1,
             'limit': 1,
-            'bbox': '-180,90,180,90'
+            'bbox': '-180,-90,180,90'
         }, 'obs')
     features = json.loads(response)
 
@@ -405,19 +407,19 @@ def test_get_collection_items(config, api_):
 
     links = features['links']
     assert len(links) == 6
-    assert '/collections/obs/items?f=json&limit=1&bbox=-180,90,180,90' in \
+    assert '/collections/obs/items?f=json&limit=1&bbox=-180,-90,180,90' in \
         links[0]['href']
     assert links[0]['rel'] == 'self'
-    assert '/collections/obs/items?f=jsonld&limit=1&bbox=-180,90,180,90' in \
+    assert '/collections/obs/items?f=jsonld&limit=1&bbox=-180,-90,180,90' in \
         links[1]['href']
     assert links[1]['rel'] == 'alternate'
-    assert '/collections/obs/items?f=html&limit=1&bbox=-180,90,180,90' in \
+    assert '/collections/obs/items?f=html&limit=1&bbox=-180,-90,180,90' in \
         links[2]['href']
     assert links[2]['rel'] == 'alternate'
-    assert '/collections/obs/items?startindex=0&limit=1&bbox=-180,90,180,90' \
+    assert '/collections/obs/items?startindex=0&limit=1&bbox=-180,-90,180,90' \
         in links[3]['href']
     assert links[3]['rel'] == 'prev'
-    assert '/collections/obs/items?startindex=2&limit=1&bbox=-180,90,180,90' \
+    assert '/collections/obs/items?startindex=2&limit=1&bbox=-180,-90,180,90' \
         in links[4]['href']
     assert links[4]['rel'] == 'next'
     assert '/collections/obs' in links[5]['href']
@@ -446,6 +448,11 @@ def test_get_collection_items(config, api_):
     # FIXME? this test errors out currently
     assert code == 200
 
+    rsp_headers, code, response = api_.get_collection_items(
+        req_headers, {'cursor': 'foo'}, 'obs')
+
+    assert code == 400
+
     rsp_headers, code, response = api_.get_collection_items(
         req_headers, {'f': 'csv'}, 'obs')
 
@@ -719,6 +726,63 @@ def test_get_collection_item(config, api_):
     assert feature['properties']['stn_id'] == '35'
 
 
+def test_get_collection_items_properties(config, api_):
+    req_headers = make_req_headers()
+    rsp_headers, code, response = api_.get_collection_items(
+        req_headers, {'properties': 'value,stn_id'}, 'obs')
+    features = json.loads(response)
+
+    assert code == 200
+    for feature in features['features']:
+        assert set(feature['properties']) == {'value', 'stn_id'}
+
+    rsp_headers, code, response = api_.get_collection_items(
+        req_headers, {'properties': 'value,foo'}, 'obs')
+
+    assert code == 400
+
+    rsp_headers, code, response = api_.get_collection_items(
+        req_headers, {'properties': ''}, 'obs')
+
+    assert code == 400
+
+
+def test_get_collection_items_simplify_precision(config, api_):
+    req_headers = make_req_headers()
+
+    # not supported by the CSV provider
+    for args in [{'simplify': '0.1'}, {'precision': '2'}]:
+        rsp_headers, code, response = api_.get_collection_items(
+            req_headers, args, 'obs')
+
+        assert code == 400
+        assert 'not supported' in json.loads(response)['description']
+
+
+def test_get_collection_items_async(config, api_):
+    req_headers = make_req_headers()
+    loop = asyncio.new_event_loop()
+
+    for args in [{}, {'limit': '2', 'stn_id': '35'}, {'limit': '0'}]:
+        rsp_headers, code, response = loop.run_until_complete(
+            api_.get_collection_items_async(req_headers, args, 'obs'))
+        rsp_headers_, code_, response_ = api_.get_collection_items(
+            req_headers, args, 'obs')
+        assert (rsp_headers, code) == (rsp_headers_, code_)
+        features = json.loads(response)
+        features_ = json.loads(response_)
+        features.pop('timeStamp', None)
+        features_.pop('timeStamp', None)
+        assert features == features_
+
+    for identifier in ['371', 'notfound']:
+        assert loop.run_until_complete(api_.get_collection_item_async(
+            req_headers, {}, 'obs', identifier)) == \
+            api_.get_collection_item(req_headers, {}, 'obs', identifier)
+
+    loop.close()
+
+
 def test_get_collection_item_json_ld(config, api_):
     req_headers = make_req_headers()
     rsp_headers, code, response = api_.get_collection_item(
@@ -922,6 +986,49 @@ def test_execute_process(config, api_):
     assert response['code'] == 'NotFound'
 
 
+def test_provider_registry(config, api_):
+    req_headers = make_req_headers()
+    rsp_headers, code, response = api_.get_collection_items(
+        req_headers, {}, 'obs')
+    assert code == 200
+    assert ('obs', 'feature') in api_.providers
+
+    p = api_.providers.get('obs', 'feature')
+    rsp_headers, code, response = api_.get_collection_item(
+        req_headers, {}, 'obs', '371')
+    assert code == 200
+    assert api_.providers.get('obs', 'feature') is p
+
+    api_.providers.invalidate('obs')
+    assert ('obs', 'feature') not in api_.providers
+    assert api_.providers.get('obs', 'feature') is not p
+
+
+def test_provider_registry_warmup(config):
+    resources = {
+        'obs': config['resources']['obs'],
+        'broken': {
+            'providers': [{
+                'type': 'feature',
+                'name': 'CSV',
+                'data': 'tests/data/missing.csv',
+                'id_field': 'id',
+                'geometry': {'x_field': 'long', 'y_field': 'lat'}
+            }]
+        }
+    }
+
+    registry = ProviderRegistry(resources)
+    timings = registry.warmup(max_workers=2, preload=True)
+    assert list(timings) == [('obs', 'feature')]
+    assert ('obs', 'feature') in registry
+    assert ('broken', 'feature') in registry.errors
+
+    registry = ProviderRegistry(resources)
+    with pytest.raises(Exception):
+        registry.warmup(fail_fast=True)
+
+
 def test_check_format():
     args = {'f': 'html'}
 
@@ -89,6 +89,11 @@ def test_query(config):
     results = p.query(limit=1)
     assert len(results['features']) == 1
     assert results['features'][0]['id'] == '371'
+    # reading stops after the page
+    assert 'numberMatched' not in results
+
+    results = p.query(startindex=4, limit=2)
+    assert results['numberMatched'] == 5
 
     results = p.query(startindex=2, limit=1)
     assert len(results['features']) == 1
@@ -102,6 +107,53 @@ def test_query(config):
     assert len(results['features'][0]['properties']) == 2
 
 
+def test_query_filters(config):
+    """Testing query filters"""
+
+    config['time_field'] = 'datetime'
+
+    for columnar in [False, True]:
+        config['columnar'] = columnar
+        p = CSVProvider(config)
+
+        results = p.query(bbox=[-80, 40, -70, 44])
+        assert results['numberMatched'] == 2
+        assert [f['id'] for f in results['features']] == ['238', '297']
+
+        results = p.query(datetime='2002-01-01/..')
+        assert results['numberMatched'] == 3
+
+        results = p.query(datetime='../2002-01-01T00:00:00Z',
+                          resulttype='hits')
+        assert results['numberMatched'] == 2
+        assert len(results['features']) == 0
+
+        results = p.query(datetime='2001-10-30T14:24:55Z')
+        assert results['numberMatched'] == 1
+        assert results['features'][0]['id'] == '371'
+
+        results = p.query(properties=[('stn_id', '35'), ('value', '93.90')])
+        assert results['numberMatched'] == 1
+        assert results['features'][0]['id'] == '377'
+
+        results = p.query(sortby=[{'property': 'value', 'order': 'D'}],
+                          limit=2)
+        assert results['numberMatched'] == 5
+        assert [f['id'] for f in results['features']] == ['238', '964']
+
+        results = p.query(sortby=[{'property': 'stn_id', 'order': 'A'},
+                                  {'property': 'datetime', 'order': 'D'}],
+                          startindex=1, limit=2)
+        assert [f['id'] for f in results['features']] == ['371', '964']
+
+        results = p.query(bbox=[-80, 40, -70, 46],
+                          sortby=[{'property': 'value', 'order': 'A'}],
+                          cql_expression='value > 90')
+        assert results['numberMatched'] == 3
+        assert [f['id'] for f in results['features']] == ['297', '377',
+                                                          '238']
+
+
 def test_get(config):
     """Testing get method"""
 
@@ -119,6 +171,54 @@ def test_get_not_existing_item_raise_exception(config):
         p.get('404')
 
 
+def test_index(config, tmp_path):
+    """Testing query and get with the sidecar byte offset index"""
+
+    data = tmp_path / 'obs.csv'
+    data.write_bytes(open(path, 'rb').read())
+    config['data'] = str(data)
+    p = CSVProvider(config)
+    config['index'] = True
+    p_index = CSVProvider(config)
+
+    assert p_index.query() == p.query()
+    assert p_index.query(startindex=2, limit=2)['features'] == \
+        p.query(startindex=2, limit=2)['features']
+    assert p_index.query(resulttype='hits')['numberMatched'] == 5
+    assert (tmp_path / 'obs.csv.idx').exists()
+
+    assert p_index.get('964') == p.get('964')
+    with pytest.raises(ProviderItemNotFoundError):
+        p_index.get('404')
+
+
+def test_columnar(config):
+    """Testing query and get on the in-memory columnar copy"""
+
+    p = CSVProvider(config)
+    config['columnar'] = True
+    p_columnar = CSVProvider(config)
+
+    assert p_columnar.query() == p.query()
+    assert p_columnar.query(startindex=2, limit=2)['features'] == \
+        p.query(startindex=2, limit=2)['features']
+    assert p_columnar.get('964') == p.get('964')
+    with pytest.raises(ProviderItemNotFoundError):
+        p_columnar.get('404')
+
+    results = p_columnar.query(bbox=[-80, 40, -70, 44])
+    assert results['numberMatched'] == 2
+    assert results['features'][0]['id'] == '238'
+
+    results = p_columnar.query(properties=[('stn_id', '35')])
+    assert results['numberMatched'] == 2
+
+    cql_expression = 'stn_id = 2147 AND value > 100'
+    results = p_columnar.query(cql_expression=cql_expression)
+    assert results == p.query(cql_expression=cql_expression)
+    assert results['numberMatched'] == 1
+
+
 # test on common comparisons operations
 def test_cql_eq(config):
     """Testing query for equals `=` CQL filter expression"""
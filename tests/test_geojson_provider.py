@@ -34,7 +34,8 @@ import logging
 import pytest
 
 from pygeoapi.provider.base import ProviderItemNotFoundError
-from pygeoapi.provider.geojson import GeoJSONProvider
+from pygeoapi.provider.geojson import GeoJSONProvider, iter_feature_spans
+from pygeoapi.provider.packed_features import PackedFeatureList
 
 LOGGER = logging.getLogger(__name__)
 
@@ -144,6 +145,212 @@ def test_update(fixture, config):
     assert 'Null' in results['properties']['name']
 
 
+@pytest.mark.parametrize('cache', [True, 'packed'])
+def test_cache(fixture, config, cache):
+    config['cache'] = cache
+    p = GeoJSONProvider(config)
+
+    results = p.query()
+    assert len(results['features']) == 1
+    assert results['numberMatched'] == 1
+
+    result = p.get('123-456')
+    assert 'Dinagat' in result['properties']['name']
+
+    # returned features must not alter the cache
+    result['id'] = 'foo'
+    assert p.get('123-456')['id'] == '123-456'
+
+    with pytest.raises(ProviderItemNotFoundError):
+        p.get('foo')
+
+    # modifying the file invalidates the cache
+    with open(path) as fh:
+        data = json.load(fh)
+    data['features'].append({
+        'type': 'Feature',
+        'id': '789',
+        'geometry': {
+            'type': 'Point',
+            'coordinates': [0.0, 0.0]},
+        'properties': {
+            'name': 'Null Island'}})
+    with open(path, 'w') as fh:
+        fh.write(json.dumps(data))
+
+    results = p.query()
+    assert results['numberMatched'] == 2
+    assert 'Null' in p.get('789')['properties']['name']
+
+    p.delete('789')
+    with pytest.raises(ProviderItemNotFoundError):
+        p.get('789')
+
+
+def test_packed_features():
+    with open(os.path.join(os.path.dirname(__file__), 'data',
+                           'ne_110m_lakes.geojson')) as fh:
+        features = json.load(fh)['features']
+    features[0]['geometry'] = {
+        'type': 'GeometryCollection',
+        'geometries': [{'type': 'Point', 'coordinates': [1, 2]}]}
+    features[1]['bbox'] = [0.0, 0.0, 1.0, 1.0]
+
+    packed = PackedFeatureList(features)
+    assert len(packed) == len(features)
+    assert list(packed) == features
+    assert packed[-1] == features[-1]
+    assert packed[2:4] == features[2:4]
+
+    # returned features are copies
+    packed[2]['properties']['name'] = 'foo'
+    assert packed[2] == features[2]
+
+
+def test_preload(fixture, config):
+    config['cache'] = 'packed'
+    p = GeoJSONProvider(config)
+    p._cache = None
+    p.preload()
+    assert isinstance(p._cache['features'], PackedFeatureList)
+
+
+def test_stream(fixture, config):
+    config['stream'] = True
+    p = GeoJSONProvider(config)
+
+    fields = p.get_fields()
+    assert fields['name'] == 'string'
+
+    results = p.query()
+    assert len(results['features']) == 1
+    assert results['numberReturned'] == 1
+    assert results['features'][0]['id'] == '123-456'
+
+    results = p.query(resulttype='hits')
+    assert results['numberMatched'] == 1
+    assert len(results['features']) == 0
+
+    results = p.get('123-456')
+    assert 'Dinagat' in results['properties']['name']
+
+    with pytest.raises(ProviderItemNotFoundError):
+        p.get('123')
+
+
+def test_stream_empty(config):
+    """Testing streaming of an empty FeatureCollection"""
+
+    with open(path, 'w') as fh:
+        fh.write(json.dumps({'type': 'FeatureCollection', 'features': []}))
+
+    config['stream'] = True
+    p = GeoJSONProvider(config)
+    assert p.get_fields() == {}
+    assert p.query()['features'] == []
+
+
+def test_index(fixture, config):
+    config['index'] = True
+    p = GeoJSONProvider(config)
+    assert p.stream
+
+    results = p.query()
+    assert len(results['features']) == 1
+    assert results['numberMatched'] == 1
+    assert os.path.exists('{}.idx'.format(path))
+
+    results = p.get('123-456')
+    assert 'Dinagat' in results['properties']['name']
+
+    with pytest.raises(ProviderItemNotFoundError):
+        p.get('123')
+
+    # the index is rebuilt when the file changes
+    p.create({
+        'type': 'Feature',
+        'id': '789',
+        'geometry': {
+            'type': 'Point',
+            'coordinates': [0.0, 0.0]},
+        'properties': {
+            'name': 'Null Island'}})
+
+    p = GeoJSONProvider(config)
+    results = p.query(startindex=1)
+    assert results['numberMatched'] == 2
+    assert results['features'][0]['id'] == '789'
+
+    os.remove('{}.idx'.format(path))
+
+
+def test_query_filters(config):
+    data = {
+        'type': 'FeatureCollection',
+        'features': [{
+            'type': 'Feature',
+            'id': str(i),
+            'geometry': {
+                'type': 'Point',
+                'coordinates': [i * 10.0, i * 5.0]},
+            'properties': {
+                'name': name,
+                'value': i % 2,
+                'datetime': '200{}-01-01T00:00:00Z'.format(i)}
+        } for i, name in enumerate(['a', 'b', 'c', 'd', 'e'])]}
+
+    with open(path, 'w') as fh:
+        fh.write(json.dumps(data))
+
+    config['time_field'] = 'datetime'
+
+    for mode in [{}, {'cache': True}, {'cache': 'packed'}, {'stream': True},
+                 {'index': True}]:
+        p = GeoJSONProvider(dict(config, **mode))
+
+        results = p.query(bbox=[5, 0, 25, 10])
+        assert [f['id'] for f in results['features']] == ['1', '2']
+
+        results = p.query(bbox=[5, 0, 25, 10], resulttype='hits')
+        assert results['numberMatched'] == 2
+
+        results = p.query(datetime='2002-01-01T00:00:00Z/..')
+        assert [f['id'] for f in results['features']] == ['2', '3', '4']
+
+        results = p.query(datetime='2001-01-01T00:00:00Z')
+        assert [f['id'] for f in results['features']] == ['1']
+
+        results = p.query(properties=[('value', '1')])
+        assert [f['id'] for f in results['features']] == ['1', '3']
+
+        results = p.query(sortby=[{'property': 'value', 'order': 'D'},
+                                  {'property': 'name', 'order': 'D'}],
+                          startindex=1, limit=3)
+        assert results['numberMatched'] == 5
+        assert [f['id'] for f in results['features']] == ['1', '4', '2']
+
+        results = p.query(bbox=[5, 0, 45, 25],
+                          datetime='../2003-06-01T00:00:00Z',
+                          sortby=[{'property': 'name', 'order': 'D'}])
+        assert [f['id'] for f in results['features']] == ['3', '2', '1']
+
+    os.remove('{}.idx'.format(path))
+
+
+def test_iter_feature_spans():
+    data = (b'{"type": "FeatureCollection", "name": "features", '
+            b'"features": [{"id": 1, "properties": {"a": "}{"}}, '
+            b'{"id": 2, "properties": {}}\n]}')
+
+    spans = list(iter_feature_spans(data))
+    assert len(spans) == 2
+    assert json.loads(data[slice(*spans[0])])['properties']['a'] == '}{'
+    assert json.loads(data[slice(*spans[1])])['id'] == 2
+
+    assert list(iter_feature_spans(b'{"features": []}')) == []
+    assert list(iter_feature_spans(b'')) == []
+
+
 """
     def __init__(self, definition):
         BaseProvider.__init__(self, definition)
@@ -194,6 +401,30 @@ def test_cql_eq(cql_config):
     assert results['numberReturned'] == 1
 
 
+def test_cql_stream(cql_config):
+    """Testing CQL filter expressions in streaming mode"""
+
+    p = GeoJSONProvider(cql_config)
+    cql_config['stream'] = True
+    p2 = GeoJSONProvider(cql_config)
+
+    for cql_expression in ['id > 5', 'NOT id > 5', 'name="Lake Baikal"']:
+        results = p.query(cql_expression=cql_expression, limit=100)
+        results2 = p2.query(cql_expression=cql_expression, limit=100)
+        assert results2['features'] == results['features']
+
+        results2 = p2.query(cql_expression=cql_expression,
+                            resulttype='hits')
+        assert results2['numberMatched'] == results['numberMatched']
+
+    results = p.query(cql_expression='id > 5', startindex=3, limit=4)
+    results2 = p2.query(cql_expression='id > 5', startindex=3, limit=4)
+    assert len(results2['features']) == 4
+    assert results2['features'] == results['features']
+
+    assert p2.get('24') == p.get('24')
+
+
 def test_cql_ne(cql_config):
     """Testing query for not-equals `<>`  CQL filter expression"""
 
@@ -0,0 +1,122 @@
+# =================================================================
+#
+# Authors: Tom Kralidis <tomkralidis@gmail.com>
+#
+# Copyright (c) 2020 Tom Kralidis
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# =================================================================
+
+
+import json
+import sqlite3
+import struct
+
+import pytest
+import shapely.wkb
+from shapely.geometry import mapping, shape
+
+from pygeoapi.provider.gpkg_geometry import decode_gpkg_geometry, decode_wkb
+
+GEOMETRIES = [{
+    'type': 'Point',
+    'coordinates': [-9.391943, 39.369447]
+}, {
+    'type': 'LineString',
+    'coordinates': [[0, 0, 1], [1, 0, 2], [1, 1, 3]]
+}, {
+    'type': 'Polygon',
+    'coordinates': [[[0, 0], [4, 0], [4, 4], [0, 0]],
+                    [[1, 1], [2, 1], [2, 2], [1, 1]]]
+}, {
+    'type': 'MultiPoint',
+    'coordinates': [[0, 1], [2, 3]]
+}, {
+    'type': 'MultiLineString',
+    'coordinates': [[[0, 0], [1, 1]], [[2, 2], [3, 3]]]
+}, {
+    'type': 'MultiPolygon',
+    'coordinates': [[[[0, 0], [1, 0], [1, 1], [0, 0]]],
+                    [[[2, 2], [3, 2], [3, 3], [2, 2]]]]
+}, {
+    'type': 'GeometryCollection',
+    'geometries': [{
+        'type': 'Point',
+        'coordinates': [1, 2]
+    }, {
+        'type': 'LineString',
+        'coordinates': [[0, 0], [1, 1]]
+    }]
+}]
+
+
+def gpkg_blob(wkb, byte_order=1, envelope=b''):
+    """GeoPackage binary geometry of a WKB geometry"""
+
+    flags = byte_order | {0: 0, 32: 2, 48: 4, 64: 8}[len(envelope)]
+    return b'GP\x00' + bytes([flags]) + \
+        struct.pack('<i' if byte_order else '>i', 4326) + envelope + wkb
+
+
+@pytest.mark.parametrize('geometry', GEOMETRIES)
+@pytest.mark.parametrize('byte_order', [0, 1])
+@pytest.mark.parametrize('flavor', ['iso', 'extended'])
+def test_decode_gpkg_geometry(geometry, byte_order, flavor):
+    wkb = shapely.wkb.dumps(shape(geometry), byte_order=byte_order,
+                            flavor=flavor)
+
+    for envelope in [b'', bytes(32), bytes(48)]:
+        blob = gpkg_blob(wkb, byte_order, envelope)
+        assert decode_gpkg_geometry(blob) == geometry
+
+    decoded, offset = decode_wkb(b'xx' + wkb, 2)
+    assert decoded == geometry
+    assert offset == len(wkb) + 2
+
+
+def test_decode_gpkg_geometry_precision():
+    wkb = shapely.wkb.dumps(shape(GEOMETRIES[0]))
+
+    assert decode_gpkg_geometry(gpkg_blob(wkb), precision=2) == {
+        'type': 'Point',
+        'coordinates': [-9.39, 39.37]
+    }
+
+
+def test_decode_gpkg_geometry_empty():
+    assert decode_gpkg_geometry(None) is None
+    assert decode_gpkg_geometry(b'GP\x00\x11' + bytes(4)) is None
+
+    with pytest.raises(ValueError):
+        decode_gpkg_geometry(b'XX\x00\x01' + bytes(4))
+    with pytest.raises(ValueError):
+        decode_gpkg_geometry(b'GP\x00\x21' + bytes(4))
+
+
+def test_decode_gpkg_geometry_file():
+    conn = sqlite3.connect('tests/data/poi_portugal.gpkg')
+    for blob, in conn.execute('SELECT geom FROM poi_portugal LIMIT 100'):
+        geometry = shapely.wkb.loads(bytes(blob[8:]))
+        assert decode_gpkg_geometry(blob) == \
+            json.loads(json.dumps(mapping(geometry)))
+    conn.close()
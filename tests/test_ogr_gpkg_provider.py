@@ -29,12 +29,13 @@
 
 # Needs to be run like: python3 -m pytest
 
+from concurrent.futures import ThreadPoolExecutor
 import logging
 
 import pytest
 
 from pygeoapi.provider.base import ProviderItemNotFoundError
-from pygeoapi.provider.ogr import OGRProvider
+from pygeoapi.provider.ogr import OGRProvider, get_dataset_cache
 
 
 LOGGER = logging.getLogger(__name__)
@@ -90,6 +91,40 @@ def test_get_not_existing_feature_raise_exception(
         p.get(-1)
 
 
+def test_dataset_handle_cache(config_poi_portugal, config_gpkg_4326):
+    """Testing reuse of the open datasets"""
+
+    source = config_poi_portugal['data']['source']
+    p = OGRProvider(config_poi_portugal)
+    hits = p.query(resulttype='hits')['numberMatched']
+    dataset = get_dataset_cache().datasets(source)
+    assert len(dataset) == 1
+
+    # filters of the reused layer are reset between requests
+    assert p.query(bbox=[-9.2, 38.7, -9.1, 38.8],
+                   resulttype='hits')['numberMatched'] < hits
+    assert p.get(536678593)['id'] == 536678593
+    assert p.query(resulttype='hits')['numberMatched'] == hits
+    assert len(p.query(startindex=10, limit=5)['features']) == 5
+    assert get_dataset_cache().datasets(source) == dataset
+
+    # datasets are shared by threads
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(lambda _: p.query(limit=1), range(8)))
+    assert all(result == results[0] for result in results)
+    assert get_dataset_cache().datasets(source) == dataset
+
+    # least recently used datasets are closed
+    config_gpkg_4326['handle_cache'] = {'max_handles': 1}
+    OGRProvider(config_gpkg_4326)
+    assert get_dataset_cache().datasets(source) == []
+
+    config_poi_portugal['handle_cache'] = False
+    p = OGRProvider(config_poi_portugal)
+    assert p.query(resulttype='hits')['numberMatched'] == hits
+    assert get_dataset_cache().datasets(source) == []
+
+
 # Testing with GeoPackage files with identical features
 # (all 2481 addresses in Otterlo Netherlands)
 # in different projections.
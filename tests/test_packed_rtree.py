@@ -0,0 +1,98 @@
+# =================================================================
+#
+# Authors: Tom Kralidis <tomkralidis@gmail.com>
+#
+# Copyright (c) 2020 Tom Kralidis
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# =================================================================
+
+
+from array import array
+import random
+
+from pygeoapi.plugin import load_plugin
+from pygeoapi.provider.packed_rtree import IndexedFeatureList, PackedRTree
+
+NaN = float('nan')
+
+
+def test_search():
+    random.seed(42)
+    x = [random.uniform(-180, 180) for i in range(1000)]
+    y = [random.uniform(-90, 90) for i in range(1000)]
+
+    tree = PackedRTree.from_points(x, y, node_size=4)
+    assert len(tree) == 1000
+
+    for bbox in [(0, 0, 10, 10), (-180, -90, 180, 90), (-50, 10, -49, 11),
+                 (200, 100, 300, 200)]:
+        expected = [i for i in range(1000)
+                    if bbox[0] <= x[i] <= bbox[2] and
+                    bbox[1] <= y[i] <= bbox[3]]
+        assert tree.search(bbox) == expected
+
+
+def test_search_envelopes():
+    bboxes = array('d', [0, 0, 10, 10,
+                         NaN, NaN, NaN, NaN,
+                         5, 5, 6, 6,
+                         20, 20, 30, 30])
+
+    tree = PackedRTree(bboxes)
+    assert len(tree) == 3
+    assert tree.search((8, 8, 22, 22)) == [0, 3]
+    assert tree.search((5.5, 5.5, 5.5, 5.5)) == [0, 2]
+    assert tree.search((11, 11, 19, 19)) == []
+
+    assert PackedRTree(array('d')).search((0, 0, 1, 1)) == []
+
+
+def test_indexed_feature_list():
+    features = [{
+        'type': 'Feature',
+        'id': i,
+        'geometry': {
+            'type': 'Point',
+            'coordinates': [i, i]
+        },
+        'properties': {}
+    } for i in range(100)]
+
+    tree = PackedRTree.from_points(range(100), range(100))
+    feature_list = IndexedFeatureList(features, tree)
+    assert len(feature_list) == 100
+
+    for cql_expression in ['BBOX(geometry, 10, 10, 12.5, 20)',
+                           'INTERSECTS(geometry, POINT(42 42))',
+                           'DWITHIN(geometry, POINT(50 50), 2, kilometers)']:
+        results = []
+        for feature_list_ in [features, feature_list]:
+            cql_handler = load_plugin('extensions', {
+                'name': 'CQL',
+                'cql_expression': cql_expression,
+                'feature_list': feature_list_
+            })
+            results.append(cql_handler.cql_filter())
+        assert results[0] == results[1]
+        assert len(results[0]) > 0
@@ -31,11 +31,22 @@
 
 # Needs to be run like: python3 -m pytest
 
+import asyncio
 import pytest
 import logging
 
-from pygeoapi.provider.base import ProviderItemNotFoundError
-from pygeoapi.provider.postgresql import PostgreSQLProvider
+import psycopg2
+from psycopg2.sql import Composed
+
+from pygeoapi.postgres_where_clauses import (Parameter, combine, contains,
+                                             get_parameters, like, negate)
+from pygeoapi.provider.base import (ProviderConnectionError,
+                                    ProviderInvalidQueryError,
+                                    ProviderItemNotFoundError)
+from pygeoapi.provider.postgresql import (PostgreSQLProvider, get_columns,
+                                          get_async_pool, get_pool,
+                                          invalidate_columns)
+from pygeoapi.util import RawJSONList
 
 LOGGER = logging.getLogger(__name__)
 
@@ -108,6 +119,38 @@ def test_query_hits(config):
     assert results["numberMatched"] == 13930
 
 
+@pytest.mark.parametrize('count', ['estimate', 'auto'])
+def test_query_hits_count(config, count):
+    """Test query resulttype=hits with estimated counts"""
+    config['count'] = count
+    psp = PostgreSQLProvider(config)
+    results = psp.query(resulttype="hits")
+    assert results["numberMatched"] > 0
+
+    results = psp.query(properties=[("waterway", "stream")], resulttype="hits")
+    assert 0 < results["numberMatched"] <= 14776
+
+    if count == 'auto':
+        assert results["numberMatched"] == 13930
+        psp.count_timeout = 1
+        results = psp.query(resulttype="hits")
+        assert results["numberMatched"] > 0
+
+
+def test_query_number_matched(config):
+    """Test numberMatched of result pages"""
+    p = PostgreSQLProvider(config)
+    assert 'numberMatched' not in p.query(limit=5)
+
+    config['number_matched'] = True
+    p = PostgreSQLProvider(config)
+    results = p.query(limit=5, properties=[("waterway", "stream")])
+    assert results['numberMatched'] == 13930
+    results = p.query(
+        bbox=[29.3373, -3.4099, 29.3761, -3.3924], limit=10)
+    assert results['numberMatched'] == 5
+
+
 def test_query_bbox(config):
     """Test query with a specified bounding box"""
     psp = PostgreSQLProvider(config)
@@ -117,6 +160,143 @@ def test_query_bbox(config):
     assert len(boxed_feature_collection['features']) == 5
 
 
+def test_query_paging(config):
+    """Test paging with LIMIT/OFFSET and keyset cursors"""
+    p = PostgreSQLProvider(config)
+    page1 = p.query(limit=5)['features']
+    page2 = p.query(startindex=5, limit=5)['features']
+    ids = [f['id'] for f in page1 + page2]
+    assert ids == sorted(ids)
+    assert len(set(ids)) == 10
+
+    results = p.query(limit=3, sortby=[{'property': 'name', 'order': 'D'}])
+    assert len(results['features']) == 3
+    assert 'next_cursor' not in results
+
+    config['pagination'] = 'keyset'
+    p = PostgreSQLProvider(config)
+    results = p.query(limit=5)
+    assert [f['id'] for f in results['features']] == ids[:5]
+    results = p.query(limit=5, cursor=results['next_cursor'])
+    assert [f['id'] for f in results['features']] == ids[5:]
+
+    sortby = [{'property': 'waterway', 'order': 'D'}]
+    page = p.query(limit=10, sortby=sortby)['features']
+    results = p.query(limit=5, sortby=sortby)
+    results = p.query(limit=5, sortby=sortby, cursor=results['next_cursor'])
+    assert results['features'] == page[5:]
+
+    # name has nulls, sorted last (first in descending order)
+    hits = p.query(resulttype='hits')['numberMatched']
+    for order in ['A', 'D']:
+        sortby = [{'property': 'name', 'order': order}]
+        for startindex in [0, hits // 2, hits - 20]:
+            page = p.query(startindex=startindex, limit=20,
+                           sortby=sortby)['features']
+            results = p.query(startindex=startindex, limit=5, sortby=sortby)
+            results = p.query(limit=15, sortby=sortby,
+                              cursor=results['next_cursor'])
+            assert results['features'] == page[5:]
+
+    with pytest.raises(ProviderInvalidQueryError):
+        p.query(cursor='foo')
+
+
+def test_query_postgis_json(config):
+    """Test features serialized by PostGIS"""
+    p = PostgreSQLProvider(config)
+    features = p.query(limit=5)['features']
+
+    config['postgis_json'] = True
+    p = PostgreSQLProvider(config)
+    results = p.query(limit=5)
+    assert isinstance(results['features'], RawJSONList)
+    assert [f['id'] for f in results['features'].decode()] == \
+        [f['id'] for f in features]
+    assert results['features'].decode()[0]['properties'] == \
+        features[0]['properties']
+
+
+def test_query_select_properties(config):
+    """Test properties selection"""
+    p = PostgreSQLProvider(config)
+    feature = p.query(limit=1, select_properties=['name'])['features'][0]
+    assert list(feature['properties']) == ['name']
+    assert feature['id'] is not None
+
+    config['properties'] = ['waterway', 'name']
+    config['postgis_json'] = True
+    p = PostgreSQLProvider(config)
+    results = p.query(limit=1, sortby=[{'property': 'osm_id', 'order': 'D'}])
+    feature = results['features'].decode()[0]
+    assert list(feature['properties']) == ['waterway', 'name']
+    assert list(p.get(feature['id'])['properties']) == ['waterway', 'name']
+
+
+def test_query_simplify_precision(config):
+    """Test geometry simplification and coordinates precision"""
+    p = PostgreSQLProvider(config)
+    features = p.query(limit=5)['features']
+
+    simplified = p.query(limit=5, simplify=0.01, precision=2)['features']
+    assert [f['id'] for f in simplified] == [f['id'] for f in features]
+    for feature, feature_ in zip(features, simplified):
+        coordinates = feature['geometry']['coordinates']
+        coordinates_ = feature_['geometry']['coordinates']
+        assert len(coordinates_) <= len(coordinates)
+        for coordinate in coordinates_:
+            assert [round(c, 2) for c in coordinate] == coordinate
+
+
+def test_query_prepared(config):
+    """Test queries run as prepared statements"""
+    p = PostgreSQLProvider(config)
+    features = p.query(limit=5, properties=[('waterway', 'stream')])
+    hits = p.query(resulttype='hits', cql_expression='waterway = \'river\'')
+
+    config['prepare'] = True
+    p = PostgreSQLProvider(config)
+    for _ in range(2):
+        assert p.query(limit=5, properties=[('waterway', 'stream')]) == \
+            features
+        assert p.query(resulttype='hits',
+                       cql_expression='waterway = \'river\'') == hits
+        assert 'Kanyosha' in p.get(29701937)['properties']['name']
+
+
+def test_query_async(config):
+    """Test queries on asynchronous connections"""
+    p = PostgreSQLProvider(config)
+
+    async def queries():
+        results = await asyncio.gather(
+            *[p.query_async(startindex=i, limit=5) for i in range(20)])
+        hits = await p.query_async(resulttype='hits',
+                                   properties=[('waterway', 'stream')])
+        feature = await p.get_async(29701937)
+        with pytest.raises(ProviderItemNotFoundError):
+            await p.get_async(-1)
+        return results, hits, feature
+
+    loop = asyncio.new_event_loop()
+    results, hits, feature = loop.run_until_complete(queries())
+    loop.close()
+    assert results[3] == p.query(startindex=3, limit=5)
+    assert hits['numberMatched'] == 13930
+    assert feature == p.get(29701937)
+
+
+def test_where_parameters():
+    """Test values of CQL filters passed as query parameters"""
+    where_clause = combine(
+        (like(None, 'name', 'Ka%', case=False),
+         negate(None, contains(None, 'osm_id', [1, 2]))), 'OR')
+    assert len(where_clause) == 1
+    assert isinstance(where_clause[0], Composed)
+    assert get_parameters(where_clause[0]) == ['KA%', 1, 2]
+    assert get_parameters(Parameter(None)) == [None]
+
+
 def test_get(config):
     """Testing query for a specific object"""
     p = PostgreSQLProvider(config)
@@ -126,6 +306,14 @@ def test_get(config):
     assert 'properties' in result
     assert 'id' in result
     assert 'Kanyosha' in result['properties']['name']
+    assert result['prev'] < 29701937 < result['next']
+    assert '_pygeoapi_prev' not in result['properties']
+
+    config['prev_next'] = False
+    p = PostgreSQLProvider(config)
+    result = p.get(29701937)
+    assert 'prev' not in result
+    assert 'Kanyosha' in result['properties']['name']
 
 
 def test_get_not_existing_item_raise_exception(config):
@@ -339,3 +527,134 @@ def test_auxiliary_cql_expressions(config):
 
     except Exception as err:
         LOGGER.error(err)
+
+
+class FakeCursor:
+    """psycopg2 cursor stand-in returning table columns"""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+    def execute(self, query, vars=None):
+        self.conn.queries += 1
+
+    def fetchall(self):
+        return [('osm_id', 'int8', True), ('name', 'varchar', False)]
+
+
+class FakeConnection:
+    """psycopg2 connection stand-in for connection pool tests"""
+
+    def __init__(self, **kwargs):
+        self.closed = 0
+        self.queries = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def set_client_encoding(self, encoding):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.closed = 1
+
+
+def test_connection_pool(monkeypatch):
+    """Testing connection reuse, limits and recycling"""
+
+    monkeypatch.setattr(psycopg2, 'connect', FakeConnection)
+
+    conn_dic = {'host': 'localhost', 'dbname': 'test'}
+    pool = get_pool(conn_dic, {'max_size': 2, 'timeout': 0.1})
+    assert get_pool(dict(conn_dic)) is pool
+
+    conn1 = pool.getconn()
+    pool.putconn(conn1)
+    assert pool.getconn() is conn1
+
+    conn2 = pool.getconn()
+    with pytest.raises(ProviderConnectionError):
+        pool.getconn()
+
+    # broken connections are replaced
+    conn2.close()
+    pool.putconn(conn2)
+    conn3 = pool.getconn()
+    assert conn3 is not conn2
+
+    # idle connections are closed beyond min_size
+    pool.putconn(conn1)
+    pool.putconn(conn3)
+    pool.max_idle = 0
+    conn4 = pool.getconn()
+    assert len(pool._idle) == 0
+    assert pool._size == 1
+    pool.putconn(conn4)
+    pool.closeall()
+    assert pool._size == 0
+
+
+def test_connection_pool_errors(monkeypatch):
+    """Testing slots freed after connection errors"""
+
+    def connect(**kwargs):
+        raise psycopg2.ProgrammingError('invalid connection option')
+
+    monkeypatch.setattr(psycopg2, 'connect', connect)
+
+    conn_dic = {'host': 'localhost', 'dbname': 'errors'}
+    pool = get_pool(conn_dic, {'max_size': 1, 'timeout': 0.1})
+    for _ in range(3):
+        with pytest.raises(psycopg2.ProgrammingError):
+            pool.getconn()
+    assert pool._size == 0
+
+    async def getconn_async():
+        async_pool = get_async_pool(conn_dic,
+                                    {'max_size': 1, 'timeout': 0.1})
+        for _ in range(3):
+            with pytest.raises(psycopg2.ProgrammingError):
+                await async_pool.getconn()
+        return async_pool
+
+    loop = asyncio.new_event_loop()
+    assert loop.run_until_complete(getconn_async())._size == 0
+    loop.close()
+
+    monkeypatch.setattr(psycopg2, 'connect', FakeConnection)
+    assert pool.getconn() is not None
+    assert pool._size == 1
+
+
+def test_columns_cache():
+    """Testing table columns caching"""
+
+    conn = FakeConnection()
+    conn_dic = {'host': 'localhost', 'dbname': 'cache'}
+
+    columns = get_columns(conn, conn_dic, 'waterways')
+    assert columns == [('osm_id', 'int8', True), ('name', 'varchar', False)]
+    assert get_columns(conn, conn_dic, 'waterways') == columns
+    assert conn.queries == 1
+
+    # other search path, other table
+    get_columns(conn, dict(conn_dic, options='-c search_path=osm'),
+                'waterways')
+    assert conn.queries == 2
+
+    invalidate_columns('waterways')
+    get_columns(conn, conn_dic, 'waterways')
+    assert conn.queries == 3
+
+    get_columns(conn, conn_dic, 'roads', ttl=0)
+    get_columns(conn, conn_dic, 'roads', ttl=0)
+    assert conn.queries == 5
@@ -33,11 +33,20 @@
 # In eclipse we need to set PYGEOAPI_CONFIG, Run>Debug Configurations>
 # (Arguments as py.test and set external variables to the correct config path)
 
+from concurrent.futures import ThreadPoolExecutor
+import json
+import shutil
+import sqlite3
+import threading
+
 import pytest
 import logging
 
-from pygeoapi.provider.base import ProviderItemNotFoundError
-from pygeoapi.provider.sqlite import SQLiteGPKGProvider
+from pygeoapi.provider.base import (ProviderConnectionError,
+                                    ProviderInvalidQueryError,
+                                    ProviderItemNotFoundError,
+                                    ProviderQueryError)
+from pygeoapi.provider.sqlite import SQLiteGPKGProvider, get_pool
 
 LOGGER = logging.getLogger(__name__)
 
@@ -94,6 +103,191 @@ def test_query_geopackage(config_geopackage):
     assert geometry is not None
 
 
+def test_query_geopackage_geometry(config_geopackage):
+    """Testing GeoPackage geometries decoded without SpatiaLite"""
+
+    p = SQLiteGPKGProvider(config_geopackage)
+    features = p.query(limit=50)['features']
+    with get_pool(p.data, p.pool).connection() as conn:
+        for feature in features:
+            geometry = conn.execute(
+                'SELECT AsGeoJSON(geom) FROM poi_portugal WHERE osm_id=?',
+                (feature['id'],)).fetchone()[0]
+            assert feature['geometry'] == json.loads(geometry)
+
+
+def test_query_select_properties_sqlite(config_sqlite):
+    """Testing properties selection for sqlite3"""
+
+    config_sqlite['properties'] = ['name', 'continent', 'admin']
+    p = SQLiteGPKGProvider(config_sqlite)
+    feature = p.query(limit=1)['features'][0]
+    assert list(feature['properties']) == ['name', 'continent', 'admin']
+    assert feature['id'] is not None
+
+    feature = p.query(limit=1, select_properties=['admin'])['features'][0]
+    assert list(feature['properties']) == ['admin']
+    assert list(p.get(feature['id'])['properties']) == \
+        ['name', 'continent', 'admin']
+
+
+def test_query_simplify_precision_sqlite(config_sqlite):
+    """Testing geometry simplification and coordinates precision"""
+
+    p = SQLiteGPKGProvider(config_sqlite)
+    features = p.query(limit=5)['features']
+
+    simplified = p.query(limit=5, simplify=0.5, precision=1)['features']
+    assert [f['id'] for f in simplified] == [f['id'] for f in features]
+    assert [f['properties'] for f in simplified] == \
+        [f['properties'] for f in features]
+    assert simplified != features
+
+    def values(coordinates):
+        if isinstance(coordinates, list):
+            for coordinate in coordinates:
+                yield from values(coordinate)
+        else:
+            yield coordinates
+
+    for feature in simplified:
+        for value in values(feature['geometry']['coordinates']):
+            assert round(value, 1) == value
+
+
+def test_query_sortby_sqlite(config_sqlite):
+    """Testing sorted queries for sqlite3"""
+
+    p = SQLiteGPKGProvider(config_sqlite)
+    results = p.query(limit=200, sortby=[{'property': 'name', 'order': 'D'}])
+    names = [f['properties']['name'] for f in results['features']]
+    assert names == sorted(names, reverse=True)
+
+    results = p.query(limit=5, startindex=5, sortby=[
+        {'property': 'continent', 'order': 'A'},
+        {'property': 'name', 'order': 'A'}])
+    assert [f['properties']['name'] for f in results['features']] == \
+        sorted(f['properties']['name'] for f in p.query(
+            limit=200, properties=[('continent', 'Africa')])['features'])[5:10]
+
+
+def test_query_number_matched_sqlite(config_sqlite):
+    """Testing numberMatched and numberReturned of result pages"""
+
+    p = SQLiteGPKGProvider(config_sqlite)
+    results = p.query(limit=10)
+    assert results['numberMatched'] == 177
+    assert results['numberReturned'] == 10
+
+    results = p.query(limit=10, properties=[('continent', 'Europe')])
+    assert results['numberMatched'] == 39
+    assert results['numberReturned'] == 10
+
+    results = p.query(limit=10, startindex=170)
+    assert results['numberMatched'] == 177
+    assert results['numberReturned'] == 7
+
+
+def test_query_datetime_geopackage(config_geopackage, tmp_path):
+    """Testing datetime queries for geopackage"""
+
+    data = str(tmp_path / 'poi_portugal.gpkg')
+    shutil.copy(config_geopackage['data'], data)
+    conn = sqlite3.connect(data)
+    for trigger, in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type='trigger'").fetchall():
+        # R-tree triggers need SpatiaLite
+        conn.execute('DROP TRIGGER "{}"'.format(trigger))
+    conn.execute('ALTER TABLE poi_portugal ADD COLUMN updated DATETIME')
+    conn.execute("UPDATE poi_portugal SET updated = strftime("
+                 "'%Y-%m-%dT%H:%M:%fZ', '2020-01-01', '+' || fid || ' hours')")
+    # GeoPackage DATETIME values may omit the milliseconds or seconds
+    conn.execute("UPDATE poi_portugal SET updated = CASE fid "
+                 "WHEN 14 THEN '2020-01-01T14:00:00Z' "
+                 "WHEN 15 THEN '2020-01-01T15:00Z' ELSE updated END")
+    conn.commit()
+    conn.close()
+
+    config_geopackage['data'] = data
+    config_geopackage['time_field'] = 'updated'
+    p = SQLiteGPKGProvider(config_geopackage)
+
+    results = p.query(datetime='2020-01-01T14:00:00Z')
+    assert [f['properties']['updated'] for f in results['features']] == \
+        ['2020-01-01T14:00:00Z']
+
+    results = p.query(datetime='2020-01-01T15:00:00.000Z')
+    assert [f['properties']['updated'] for f in results['features']] == \
+        ['2020-01-01T15:00Z']
+
+    results = p.query(datetime='2020-01-01T10:00:00Z/2020-01-01T15:30:00Z')
+    assert results['numberMatched'] == 2
+
+    results = p.query(datetime='2020-01-01T10:00:00Z/2020-01-01T15:00:00Z')
+    assert results['numberMatched'] == 2
+
+    results = p.query(datetime='2020-01-01T14:00:00.001Z/'
+                               '2020-01-01T15:00:00.001Z')
+    assert results['numberMatched'] == 1
+
+    results = p.query(datetime='2020-01-01T00:00:00.000Z')
+    assert results['numberMatched'] == 0
+
+    results = p.query(datetime='2020-01-02T00:00:00Z/..', resulttype='hits')
+    assert results['numberMatched'] == \
+        p.query(resulttype='hits')['numberMatched'] - 2
+
+    p.time_field = None
+    with pytest.raises(ProviderQueryError):
+        p.query(datetime='2020-01-01T14:00:00Z')
+
+
+def test_query_paging_geopackage(config_geopackage):
+    """Testing paging with LIMIT/OFFSET and keyset cursors"""
+
+    p = SQLiteGPKGProvider(config_geopackage)
+    ids = [f['id'] for f in p.query(limit=10)['features']]
+    assert 'next_cursor' not in p.query(limit=5)
+
+    config_geopackage['pagination'] = 'keyset'
+    p = SQLiteGPKGProvider(config_geopackage)
+    results = p.query(limit=5)
+    assert [f['id'] for f in results['features']] == ids[:5]
+    assert '_pygeoapi_key0' not in results['features'][0]['properties']
+    results = p.query(limit=5, cursor=results['next_cursor'])
+    assert [f['id'] for f in results['features']] == ids[5:]
+    assert results['numberMatched'] == 8107
+
+    # name has nulls, sorted first
+    for sortby in ([{'property': 'name', 'order': 'D'}],
+                   [{'property': 'fclass', 'order': 'A'},
+                    {'property': 'name', 'order': 'D'}]):
+        page = p.query(limit=400, sortby=sortby)['features']
+        results = p.query(limit=200, sortby=sortby)
+        results = p.query(limit=200, sortby=sortby,
+                          cursor=results['next_cursor'])
+        assert results['features'] == page[200:]
+
+    # descending sorts page through ties and nulls, sorted last
+    for sortby in ([{'property': 'name', 'order': 'D'}],
+                   [{'property': 'fclass', 'order': 'D'},
+                    {'property': 'name', 'order': 'D'}]):
+        ids = [f['id'] for f in p.query(
+            limit=10000, sortby=sortby)['features']]
+        paged, cursor = [], None
+        while True:
+            results = p.query(limit=1000, sortby=sortby, cursor=cursor)
+            paged += [f['id'] for f in results['features']]
+            cursor = results.get('next_cursor')
+            if cursor is None:
+                break
+        assert paged == ids
+        assert len(paged) == 8107
+
+    with pytest.raises(ProviderInvalidQueryError):
+        p.query(cursor='foo')
+
+
 def test_query_hits_sqlite_geopackage(config_sqlite):
     """Testing hits results type for sqlite/geopackage"""
 
@@ -138,6 +332,61 @@ def test_query_bbox_sqlite_geopackage(config_sqlite):
            boxed_feature_collection['features'][0]['properties']['name']
 
 
+def test_query_bbox_spatial_index_sqlite_geopackage(config_geopackage):
+    """Test query with a specified bounding box using the R-tree index"""
+
+    p = SQLiteGPKGProvider(config_geopackage)
+    assert p.spatial_index is not None
+    bbox = [-9.2, 38.7, -9.1, 38.8]
+    features = p.query(bbox=bbox, limit=1000)['features']
+    hits = p.query(bbox=bbox, resulttype='hits')['numberMatched']
+    assert 0 < len(features) == hits
+
+    p.spatial_index = None
+    assert p.query(bbox=bbox, limit=1000)['features'] == features
+    assert p.query(bbox=bbox, resulttype='hits')['numberMatched'] == hits
+
+
+def test_connection_pool(config_geopackage):
+    """Testing read-only connections shared by threads"""
+
+    config_geopackage['pool'] = {'mmap_size': 0, 'cache_size': -1024,
+                                 'max_size': 1, 'timeout': 1}
+    p = SQLiteGPKGProvider(config_geopackage)
+    pool = get_pool(p.data, p.pool)
+
+    with pool.connection() as conn:
+        assert conn.execute('PRAGMA mmap_size').fetchone()[0] == 0
+        assert conn.execute('PRAGMA cache_size').fetchone()[0] == -1024
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute('CREATE TABLE pygeoapi_test (id INTEGER)')
+        # pool full
+        with pytest.raises(ProviderConnectionError):
+            pool.getconn()
+
+    def use_connection():
+        with pool.connection() as conn_:
+            conn_.execute('SELECT 1')
+            return conn_
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        connections = list(executor.map(
+            lambda _: use_connection(), range(8)))
+    assert all(conn_ is conn for conn_ in connections)
+
+    thread = threading.Thread(target=lambda: p.query(limit=1))
+    thread.start()
+    thread.join()
+    assert pool.getconn() is conn
+    pool.putconn(conn)
+
+    bboxes = [[-9.2, 38.7, -9.1, 38.8], [-8.7, 41.1, -8.5, 41.2]] * 4
+    results = [p.query(bbox=bbox) for bbox in bboxes]
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        assert list(executor.map(lambda bbox: p.query(bbox=bbox),
+                                 bboxes)) == results
+
+
 def test_get_sqlite(config_sqlite):
     p = SQLiteGPKGProvider(config_sqlite)
     result = p.get(118)
@@ -29,12 +29,14 @@
 
 from datetime import datetime, date, time
 from decimal import Decimal
+import json
 import os
 
 import pytest
 
 from pygeoapi import util
-from pygeoapi.provider.base import ProviderTypeError
+from pygeoapi.provider.base import (ProviderInvalidQueryError,
+                                    ProviderTypeError)
 
 
 def get_test_file_path(filename):
@@ -99,6 +101,23 @@ def test_json_serial():
         util.json_serial('foo')
 
 
+def test_to_json_stream():
+    d = {
+        'type': 'FeatureCollection',
+        'features': util.RawJSONList(['{"id": 1}', '{"id": 2}']),
+        'links': [{'features': []}]
+    }
+    for pretty in [False, True]:
+        result = json.loads(''.join(util.to_json_stream(d, pretty)))
+        assert result['features'] == [{'id': 1}, {'id': 2}]
+        assert result['links'] == [{'features': []}]
+
+    assert d['features'].decode() == [{'id': 1}, {'id': 2}]
+
+    d['features'] = [{'id': 1}]
+    assert ''.join(util.to_json_stream(d)) == util.to_json(d)
+
+
 def test_mimetype():
     assert util.get_mimetype('file.xml') == 'application/xml'
     assert util.get_mimetype('file.yml') == 'text/plain'
@@ -118,6 +137,19 @@ def test_path_basename():
     assert util.get_path_basename('/path/to/dir') == 'dir'
 
 
+def test_get_datetime_interval():
+    assert util.get_datetime_interval('2020-01-01') == (1577836800.0,
+                                                        1577836800.0)
+    assert util.get_datetime_interval('2020-01-01T00:00:00Z/..') == \
+        (1577836800.0, None)
+    assert util.get_datetime_interval('/2020-01-01') == (None, 1577836800.0)
+
+    for datetime_ in ['2020-13-01/..', 'foo', '2020-01-01/foo',
+                      '2020-01-01/2020-01-02/2020-01-03']:
+        with pytest.raises(ProviderInvalidQueryError):
+            util.get_datetime_interval(datetime_)
+
+
 def test_filter_dict_by_key_value():
     with open(get_test_file_path('pygeoapi-test-config.yml')) as fh:
         d = util.yaml_load(fh)